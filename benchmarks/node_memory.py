@@ -0,0 +1,74 @@
+"""Measure the memory used per node when parsing /rest/nodes.
+
+Builds a synthetic /rest/nodes response, parses it with `pyisy.nodes.Nodes`
+and reports the memory still allocated per node afterwards, as measured by
+`tracemalloc`. Run it from the root of the tree to measure:
+
+`python3 benchmarks/node_memory.py --nodes 5000 --properties 8`
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyisy.nodes import Nodes  # noqa: E402
+
+
+class _ISY:
+    """Minimal stand-in for the ISY, the nodes are only parsed."""
+
+    def __init__(self):
+        """Initialize a _ISY class."""
+        self.nodes = None
+
+
+def nodes_xml(count, properties):
+    """Return a /rest/nodes response with `count` Insteon dimmers."""
+    parts = ['<?xml version="1.0" encoding="UTF-8"?><nodes><root>Network</root>']
+    parts.append('<folder flag="12"><address>1000</address><name>Bench</name></folder>')
+    for ind in range(count):
+        address = f"{ind >> 16 & 255:X} {ind >> 8 & 255:X} {ind & 255:X} 1"
+        props = "".join(
+            f'<property id="{"ST" if prop == 0 else f"P{prop}"}" value="{prop * 10}" '
+            f'formatted="{prop * 10}%" uom="51" />'
+            for prop in range(properties)
+        )
+        parts.append(
+            f'<node flag="128" nodeDefId="DimmerLampSwitch"><address>{address}</address>'
+            f'<name>Dimmer {ind}</name><parent type="3">1000</parent>'
+            "<family>1</family><type>1.32.65.0</type><enabled>true</enabled>"
+            f"<deviceClass>0</deviceClass><wattage>0</wattage><dcPeriod>0</dcPeriod>"
+            f"<startDelay>0</startDelay><endDelay>0</endDelay><pnode>{address}</pnode>"
+            f"{props}</node>"
+        )
+    parts.append("</nodes>")
+    return "".join(parts)
+
+
+def measure(count, properties):
+    """Return the bytes allocated per node after parsing the nodes."""
+    xml = nodes_xml(count, properties)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = Nodes(_ISY(), xml=xml)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del nodes
+    return (after - before) / count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--nodes", type=int, default=5000)
+    parser.add_argument("-p", "--properties", type=int, default=8)
+    args = parser.parse_args()
+    per_node = measure(args.nodes, args.properties)
+    print(
+        f"{args.nodes} nodes, {args.properties} properties: "
+        f"{per_node:.0f} bytes per node"
+    )
@@ -27,6 +27,7 @@ from .exceptions import (
     ISYConnectionError,
     ISYInvalidAuthError,
     ISYMaxConnections,
+    ISYNotLoadedError,
     ISYResponseParseError,
     ISYStreamDataError,
     ISYStreamDisconnected,
@@ -43,6 +44,7 @@ __all__ = [
     "ISYInvalidAuthError",
     "ISYConnectionError",
     "ISYMaxConnections",
+    "ISYNotLoadedError",
     "ISYResponseParseError",
     "ISYStreamDataError",
     "ISYStreamDisconnected",
@@ -10,6 +10,7 @@ using this module.
 
 import argparse
 import asyncio
+import json
 import logging
 import time
 from urllib.parse import urlparse
@@ -21,8 +22,13 @@ from .constants import LOG_DATE_FORMAT, LOG_FORMAT, LOG_VERBOSE
 _LOGGER = logging.getLogger(__name__)
 
 
-async def main(url, username, password, tls_ver):
-    """Execute connection to ISY and load all system info."""
+async def main(url, username, password, tls_ver, startup_report=None):
+    """
+    Execute connection to ISY and load all system info.
+
+    |  startup_report: [optional] Log the per-phase startup report if "-",
+       or write it as JSON to the file with this path.
+    """
     _LOGGER.info("Starting PyISY...")
     t0 = time.time()
     host = urlparse(url)
@@ -68,6 +74,12 @@ async def main(url, username, password, tls_ver):
     # Print a representation of all the Nodes
     _LOGGER.debug(repr(isy.nodes))
     _LOGGER.info("Total Loading time: %.2fs", time.time() - t0)
+    if startup_report == "-":
+        _LOGGER.info("Startup report:\n%s", isy.startup_report.format())
+    elif startup_report:
+        with open(startup_report, "w", encoding="utf-8") as report_file:
+            json.dump(isy.startup_report.as_dict(), report_file, indent=2)
+        _LOGGER.info("Startup report written to %s", startup_report)
 
     try:
         isy.websocket.start()
@@ -86,6 +98,16 @@ if __name__ == "__main__":
     parser.add_argument("password", type=str)
     parser.add_argument("-t", "--tls-ver", dest="tls_ver", type=float)
     parser.add_argument("-v", "--verbose", action="store_true")
+    parser.add_argument(
+        "-r",
+        "--startup-report",
+        dest="startup_report",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+        help="log the time, bytes and objects of each startup phase, "
+        "or write them as JSON to FILE",
+    )
     parser.set_defaults(use_https=False, tls_ver=1.1, verbose=False)
     args = parser.parse_args()
 
@@ -108,6 +130,7 @@ if __name__ == "__main__":
                 username=args.username,
                 password=args.password,
                 tls_ver=args.tls_ver,
+                startup_report=args.startup_report,
             )
         )
     except KeyboardInterrupt:
@@ -0,0 +1,61 @@
+"""On-disk cache of the controller inventory, for faster startups."""
+from contextlib import suppress
+import json
+import os
+import tempfile
+
+from .constants import _LOGGER
+
+CACHE_VERSION = 1
+
+
+def read_cache(path, configuration):
+    """
+    Read the inventory cache for a controller.
+
+    |  path: The path of the cache file.
+    |  configuration: The Configuration of the controller, the cache is only
+       used if it was saved for the same controller and firmware.
+
+    Returns the cached data, or None if there is no usable cache.
+    """
+    try:
+        with open(path, encoding="utf-8") as cache_file:
+            data = json.load(cache_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as err:
+        _LOGGER.warning("Could not read the ISY cache %s: %s", path, err)
+        return None
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        _LOGGER.info("Ignoring the ISY cache %s: unsupported version", path)
+        return None
+    if (
+        data.get("uuid") != configuration["uuid"]
+        or data.get("firmware") != configuration["firmware"]
+    ):
+        _LOGGER.info("Ignoring the ISY cache %s: saved for another controller", path)
+        return None
+    return data
+
+
+def write_cache(path, data):
+    """
+    Write the inventory cache.
+
+    The data is written to a temporary file which then replaces the cache,
+    so a failed write does not leave a partial cache behind.
+
+    |  path: The path of the cache file.
+    |  data: The JSON serializable data to write.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as cache_file:
+            json.dump(data, cache_file, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except BaseException:
+        with suppress(OSError):
+            os.remove(temp_path)
+        raise
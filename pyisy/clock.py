@@ -1,6 +1,5 @@
 """ISY Clock/Location Information."""
 from asyncio import sleep
-from xml.dom import minidom
 
 from .constants import (
     _LOGGER,
@@ -16,7 +15,8 @@ from .constants import (
     XML_TRUE,
 )
 from .exceptions import XML_ERRORS, XML_PARSE_ERROR, ISYResponseParseError
-from .helpers import ntp_to_system_time, value_from_xml
+from .helpers import ntp_to_system_time
+from .parsing import iterparse
 
 
 class Clock:
@@ -78,21 +78,33 @@ class Clock:
 
         xml: String of the xml data
         """
+        tags = (
+            TAG_TZ_OFFSET,
+            TAG_DST,
+            TAG_LATITUDE,
+            TAG_LONGITUDE,
+            TAG_MILIATRY_TIME,
+            TAG_NTP,
+            TAG_SUNRISE,
+            TAG_SUNSET,
+        )
+        values = {}
         try:
-            xmldoc = minidom.parseString(xml)
+            for element in iterparse(xml, tags):
+                values.setdefault(element.tag, element.text)
         except XML_ERRORS:
             _LOGGER.error("%s: Clock", XML_PARSE_ERROR)
             raise ISYResponseParseError(XML_PARSE_ERROR)
 
-        tz_offset_sec = int(value_from_xml(xmldoc, TAG_TZ_OFFSET))
+        tz_offset_sec = int(values.get(TAG_TZ_OFFSET))
         self._tz_offset = tz_offset_sec / 3600
-        self._dst = value_from_xml(xmldoc, TAG_DST) == XML_TRUE
-        self._latitude = float(value_from_xml(xmldoc, TAG_LATITUDE))
-        self._longitude = float(value_from_xml(xmldoc, TAG_LONGITUDE))
-        self._military = value_from_xml(xmldoc, TAG_MILIATRY_TIME) == XML_TRUE
-        self._last_called = ntp_to_system_time(int(value_from_xml(xmldoc, TAG_NTP)))
-        self._sunrise = ntp_to_system_time(int(value_from_xml(xmldoc, TAG_SUNRISE)))
-        self._sunset = ntp_to_system_time(int(value_from_xml(xmldoc, TAG_SUNSET)))
+        self._dst = values.get(TAG_DST) == XML_TRUE
+        self._latitude = float(values.get(TAG_LATITUDE))
+        self._longitude = float(values.get(TAG_LONGITUDE))
+        self._military = values.get(TAG_MILIATRY_TIME) == XML_TRUE
+        self._last_called = ntp_to_system_time(int(values.get(TAG_NTP)))
+        self._sunrise = ntp_to_system_time(int(values.get(TAG_SUNRISE)))
+        self._sunset = ntp_to_system_time(int(values.get(TAG_SUNSET)))
 
         _LOGGER.info("ISY Loaded Clock Information")
 
@@ -1,6 +1,4 @@
 """ISY Configuration Lookup."""
-from xml.dom import minidom
-
 from .constants import (
     _LOGGER,
     ATTR_DESC,
@@ -17,7 +15,8 @@ from .constants import (
     XML_TRUE,
 )
 from .exceptions import XML_ERRORS, XML_PARSE_ERROR, ISYResponseParseError
-from .helpers import value_from_nested_xml, value_from_xml
+from .helpers import value_from_element
+from .parsing import iterparse
 
 
 class Configuration(dict):
@@ -83,26 +82,50 @@ class Configuration(dict):
 
         xml: String of the xml data
         """
+        self["firmware"] = None
+        self["uuid"] = None
+        self["name"] = None
+        self["model"] = "ISY"
+        self["variables"] = False
+        self["nodedefs"] = False
+
+        tags = (
+            TAG_FIRMWARE,
+            TAG_ROOT,
+            TAG_PRODUCT,
+            TAG_VARIABLES,
+            TAG_NODE_DEFS,
+            TAG_FEATURE,
+        )
+        seen = set()
         try:
-            xmldoc = minidom.parseString(xml)
+            for element in iterparse(xml, tags):
+                tag = element.tag
+                if tag == TAG_FEATURE:
+                    idnum = value_from_element(element, ATTR_ID)
+                    desc = value_from_element(element, ATTR_DESC)
+                    installed_raw = value_from_element(element, TAG_INSTALLED)
+                    installed = bool(installed_raw == XML_TRUE)
+                    self[idnum] = installed
+                    self[desc] = self[idnum]
+                    continue
+                # Only the first occurrence of each tag is used.
+                if tag in seen:
+                    continue
+                seen.add(tag)
+                if tag == TAG_FIRMWARE:
+                    self["firmware"] = element.text or None
+                elif tag == TAG_ROOT:
+                    self["uuid"] = value_from_element(element, ATTR_ID)
+                    self["name"] = value_from_element(element, TAG_NAME)
+                elif tag == TAG_PRODUCT:
+                    self["model"] = value_from_element(element, TAG_DESC, "ISY")
+                elif tag == TAG_VARIABLES:
+                    self["variables"] = bool(element.text == XML_TRUE)
+                elif tag == TAG_NODE_DEFS:
+                    self["nodedefs"] = bool(element.text == XML_TRUE)
         except XML_ERRORS:
             _LOGGER.error("%s: Configuration", XML_PARSE_ERROR)
             raise ISYResponseParseError(XML_PARSE_ERROR)
 
-        self["firmware"] = value_from_xml(xmldoc, TAG_FIRMWARE)
-        self["uuid"] = value_from_nested_xml(xmldoc, [TAG_ROOT, ATTR_ID])
-        self["name"] = value_from_nested_xml(xmldoc, [TAG_ROOT, TAG_NAME])
-        self["model"] = value_from_nested_xml(xmldoc, [TAG_PRODUCT, TAG_DESC], "ISY")
-        self["variables"] = bool(value_from_xml(xmldoc, TAG_VARIABLES) == XML_TRUE)
-        self["nodedefs"] = bool(value_from_xml(xmldoc, TAG_NODE_DEFS) == XML_TRUE)
-
-        features = xmldoc.getElementsByTagName(TAG_FEATURE)
-        for feature in features:
-            idnum = value_from_xml(feature, ATTR_ID)
-            desc = value_from_xml(feature, ATTR_DESC)
-            installed_raw = value_from_xml(feature, TAG_INSTALLED)
-            installed = bool(installed_raw == XML_TRUE)
-            self[idnum] = installed
-            self[desc] = self[idnum]
-
         _LOGGER.info("ISY Loaded Configuration")
@@ -1,8 +1,10 @@
 """Connection to the ISY."""
 import asyncio
+import codecs
 import logging
 import ssl
 import sys
+import time
 from urllib.parse import quote, urlencode
 
 import aiohttp
@@ -13,6 +15,9 @@ from .constants import (
     LOG_FORMAT,
     LOG_LEVEL,
     METHOD_GET,
+    PRIORITY_BACKGROUND,
+    PRIORITY_COMMAND,
+    PRIORITY_REFRESH,
     URL_CLOCK,
     URL_CONFIG,
     URL_DEFINITIONS,
@@ -31,10 +36,16 @@ from .constants import (
     XML_TRUE,
 )
 from .exceptions import ISYConnectionError, ISYInvalidAuthError
+from .scheduler import RequestScheduler
+from .singleflight import SingleFlight
+from .startup import current_phase
 
 MAX_RETRIES = 5
 MAX_HTTPS_CONNECTIONS = 2
 MAX_HTTP_CONNECTIONS = 5
+# Ceilings for the adaptive connection limit, unless set by the user.
+MAX_HTTPS_CONNECTIONS_CEILING = 4
+MAX_HTTP_CONNECTIONS_CEILING = 10
 RETRY_BACKOFF = [0.01, 0.10, 0.25, 1, 2]  # Seconds
 
 HTTP_OK = 200  # Valid request received, will run it
@@ -52,7 +63,16 @@ HTTP_HEADERS = {
 
 
 class Connection:
-    """Connection object to manage connection to and interaction with ISY."""
+    """
+    Connection object to manage connection to and interaction with ISY.
+
+    The number of concurrent requests starts at `MAX_HTTPS_CONNECTIONS` or
+    `MAX_HTTP_CONNECTIONS` and adapts to how busy the ISY is, see
+    :class:`pyisy.scheduler.RequestScheduler`.
+
+    |  min_connections: [optional] The lowest the limit can be lowered to.
+    |  max_connections: [optional] The highest the limit can be raised to.
+    """
 
     def __init__(
         self,
@@ -64,6 +84,8 @@ class Connection:
         tls_ver=1.1,
         webroot="",
         websession=None,
+        min_connections=1,
+        max_connections=None,
     ):
         """Initialize the Connection object."""
         if not len(_LOGGER.handlers):
@@ -83,9 +105,18 @@ class Connection:
         self._tls_ver = tls_ver
         self.use_https = use_https
 
-        self.semaphore = asyncio.Semaphore(
-            MAX_HTTPS_CONNECTIONS if use_https else MAX_HTTP_CONNECTIONS
+        if use_https:
+            limit = MAX_HTTPS_CONNECTIONS
+            ceiling = MAX_HTTPS_CONNECTIONS_CEILING
+        else:
+            limit = MAX_HTTP_CONNECTIONS
+            ceiling = MAX_HTTP_CONNECTIONS_CEILING
+        if max_connections is not None:
+            ceiling = max_connections
+        self.scheduler = RequestScheduler(
+            min(limit, ceiling), min_limit=min_connections, max_limit=ceiling
         )
+        self.single_flight = SingleFlight()
 
         if websession is None:
             websession = get_new_client_session(use_https, tls_ver)
@@ -104,6 +135,11 @@ class Connection:
         """Cleanup connections and prepare for exit."""
         await self.req_session.close()
 
+    @property
+    def concurrency_limit(self):
+        """Return the current maximum number of concurrent requests."""
+        return self.scheduler.limit
+
     @property
     def connection_info(self):
         """Return the connection info required to connect to the ISY."""
@@ -131,23 +167,69 @@ class Connection:
 
         return url
 
-    async def request(self, url, retries=0, ok404=False, delay=0):
-        """Execute request to ISY REST interface."""
-        _LOGGER.debug("ISY Request: %s", url)
+    async def request(
+        self,
+        url,
+        retries=0,
+        ok404=False,
+        delay=0,
+        stream_to=None,
+        priority=PRIORITY_COMMAND,
+        shared=False,
+    ):
+        """
+        Execute request to ISY REST interface.
+
+        |  url: The URL to request.
+        |  retries: [optional] The number of retries already attempted.
+        |  ok404: [optional] Treat a 404 response as a valid, empty response.
+        |  delay: [optional] Seconds to wait before sending the request.
+        |  stream_to: [optional] A consumer with `reset()` and `feed(text)`
+           methods. The response body is decoded and fed to the consumer as
+           it arrives instead of being returned; True is returned on success.
+        |  priority: [optional] The priority class of the request, one of
+           `REQUEST_PRIORITIES`. Commands are sent ahead of state refreshes,
+           which are sent ahead of background loading.
+        |  shared: [optional] Share the request with the calls for the same
+           URL made before it starts, see
+           :class:`pyisy.singleflight.SingleFlight`. Only for fetches, never
+           for commands.
+        """
         if delay:
             await asyncio.sleep(delay)
+        if shared:
+            return await self.single_flight.run(
+                (url, ok404),
+                lambda consumer: self.request(
+                    url,
+                    retries,
+                    ok404=ok404,
+                    stream_to=consumer,
+                    priority=priority,
+                ),
+                stream_to=stream_to,
+            )
+        _LOGGER.debug("ISY Request: %s", url)
         try:
-            async with self.semaphore, self.req_session.get(
+            async with self.scheduler.slot(priority), self.req_session.get(
                 url,
                 auth=self._auth,
                 headers=HTTP_HEADERS,
                 timeout=HTTP_TIMEOUT,
                 ssl=self.sslcontext,
             ) as res:
+                if res.status != HTTP_SERVICE_UNAVAILABLE:
+                    self.scheduler.record_success()
                 if res.status == HTTP_OK:
                     _LOGGER.debug("ISY Response Received.")
-                    results = await res.text(encoding="utf-8", errors="ignore")
-                    return results
+                    phase = current_phase()
+                    if stream_to is not None:
+                        await stream_response(res, stream_to, phase)
+                        return True
+                    body = await res.read()
+                    if phase is not None:
+                        phase.add_response(len(body))
+                    return body.decode("utf-8", errors="ignore")
                 if res.status == HTTP_NOT_FOUND:
                     if ok404:
                         _LOGGER.debug("ISY Response Received.")
@@ -164,10 +246,12 @@ class Connection:
                     )
                 if res.status == HTTP_SERVICE_UNAVAILABLE:
                     _LOGGER.warning("ISY too busy to process request.")
+                    self.scheduler.record_overload()
                     res.release()
 
         except asyncio.TimeoutError:
             _LOGGER.warning("Timeout while trying to connect to the ISY.")
+            self.scheduler.record_overload()
         except (
             aiohttp.ClientOSError,
             aiohttp.ServerDisconnectedError,
@@ -194,7 +278,9 @@ class Connection:
             # sleep to allow the ISY to catch up
             await asyncio.sleep(RETRY_BACKOFF[retries])
             # recurse to try again
-            retry_result = await self.request(url, retries + 1, ok404=False)
+            retry_result = await self.request(
+                url, retries + 1, ok404=False, stream_to=stream_to, priority=priority
+            )
             return retry_result
         # fail for good
         _LOGGER.error(
@@ -215,13 +301,15 @@ class Connection:
         """Fetch the services description from the ISY."""
         url = "https://" if self.use_https else "http://"
         url += f"{self._address}:{self._port}{self._webroot}/desc"
-        result = await self.request(url)
+        result = await self.request(url, priority=PRIORITY_BACKGROUND, shared=True)
         return result
 
     async def get_config(self, retries=0):
         """Fetch the configuration from the ISY."""
         req_url = self.compile_url([URL_CONFIG])
-        result = await self.request(req_url, retries=retries)
+        result = await self.request(
+            req_url, retries=retries, priority=PRIORITY_REFRESH, shared=True
+        )
         return result
 
     async def get_programs(self, address=None):
@@ -230,19 +318,31 @@ class Connection:
         if address is not None:
             addr.append(str(address))
         req_url = self.compile_url(addr, {URL_SUBFOLDERS: XML_TRUE})
-        result = await self.request(req_url)
+        result = await self.request(req_url, priority=PRIORITY_REFRESH, shared=True)
         return result
 
-    async def get_nodes(self):
-        """Fetch the list of nodes/groups/scenes from the ISY."""
+    async def get_nodes(self, stream_to=None):
+        """
+        Fetch the list of nodes/groups/scenes from the ISY.
+
+        |  stream_to: [optional] Consumer to feed the response to as it arrives.
+        """
         req_url = self.compile_url([URL_NODES], {URL_MEMBERS: XML_FALSE})
-        result = await self.request(req_url)
+        result = await self.request(
+            req_url, stream_to=stream_to, priority=PRIORITY_BACKGROUND, shared=True
+        )
         return result
 
-    async def get_status(self):
-        """Fetch the status of nodes/groups/scenes from the ISY."""
+    async def get_status(self, stream_to=None):
+        """
+        Fetch the status of nodes/groups/scenes from the ISY.
+
+        |  stream_to: [optional] Consumer to feed the response to as it arrives.
+        """
         req_url = self.compile_url([URL_STATUS])
-        result = await self.request(req_url)
+        result = await self.request(
+            req_url, stream_to=stream_to, priority=PRIORITY_REFRESH, shared=True
+        )
         return result
 
     async def get_variable_defs(self):
@@ -253,7 +353,11 @@ class Connection:
         ]
         req_urls = [self.compile_url(req) for req in req_list]
         results = await asyncio.gather(
-            *[self.request(req_url) for req_url in req_urls], return_exceptions=True
+            *[
+                self.request(req_url, priority=PRIORITY_BACKGROUND, shared=True)
+                for req_url in req_urls
+            ],
+            return_exceptions=True,
         )
         return results
 
@@ -265,7 +369,11 @@ class Connection:
         ]
         req_urls = [self.compile_url(req) for req in req_list]
         results = await asyncio.gather(
-            *[self.request(req_url) for req_url in req_urls], return_exceptions=True
+            *[
+                self.request(req_url, priority=PRIORITY_REFRESH, shared=True)
+                for req_url in req_urls
+            ],
+            return_exceptions=True,
         )
         results = [r for r in results if r is not None]  # Strip any bad requests.
         result = "".join(results)
@@ -277,16 +385,43 @@ class Connection:
     async def get_network(self):
         """Fetch the list of network resources from the ISY."""
         req_url = self.compile_url([URL_NETWORK, URL_RESOURCES])
-        result = await self.request(req_url)
+        result = await self.request(req_url, priority=PRIORITY_BACKGROUND, shared=True)
         return result
 
     async def get_time(self):
         """Fetch the system time info from the ISY."""
         req_url = self.compile_url([URL_CLOCK])
-        result = await self.request(req_url)
+        result = await self.request(req_url, priority=PRIORITY_REFRESH, shared=True)
         return result
 
 
+async def stream_response(res, consumer, phase=None):
+    """
+    Feed the body of a response to a consumer as the chunks arrive.
+
+    The consumer is reset first, so a retried request starts a new document.
+
+    |  phase: [optional] The :class:`pyisy.startup.StartupPhase` to record
+       the bytes received and the time spent in the consumer in.
+    """
+    consumer.reset()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    size = 0
+    parse_time = 0.0
+    async for chunk in res.content.iter_any():
+        size += len(chunk)
+        text = decoder.decode(chunk)
+        if text:
+            begin = time.monotonic()
+            consumer.feed(text)
+            parse_time += time.monotonic() - begin
+    text = decoder.decode(b"", final=True)
+    if text:
+        consumer.feed(text)
+    if phase is not None:
+        phase.add_response(size, parse_time)
+
+
 def get_new_client_session(use_https, tls_ver=1.1):
     """Create a new Client Session for Connecting."""
     if use_https:
@@ -9,6 +9,8 @@ LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
 LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 UPDATE_INTERVAL = 0.5
+# Number of nodes waiting for a refresh from which one /rest/status is used.
+REFRESH_BULK_THRESHOLD = 5
 
 
 # Time Constants / Strings
@@ -25,6 +27,7 @@ XML_OFF = "<off />"
 
 POLL_TIME = 10
 RECONNECT_DELAY = 60
+RESYNC_DELAY = 1.0
 SOCKET_BUFFER_SIZE = 4096
 THREAD_SLEEP_TIME = 30.0
 
@@ -40,6 +43,50 @@ ES_RECONNECTING = "reconnecting"
 ES_DISCONNECTING = "stream_disconnecting"
 ES_NOT_STARTED = "not_started"
 
+EVENT_QUEUE_SIZE = 1000
+EVENT_QUEUE_BLOCK = "block"
+EVENT_QUEUE_DROP_OLDEST = "drop_oldest"
+EVENT_QUEUE_COALESCE = "coalesce"
+EVENT_QUEUE_RESYNC = "resync"
+EVENT_QUEUE_POLICIES = [
+    EVENT_QUEUE_BLOCK,
+    EVENT_QUEUE_DROP_OLDEST,
+    EVENT_QUEUE_COALESCE,
+    EVENT_QUEUE_RESYNC,
+]
+
+SUBSYSTEM_NODES = "nodes"
+SUBSYSTEM_PROGRAMS = "programs"
+SUBSYSTEM_VARIABLES = "variables"
+SUBSYSTEM_NETWORKING = "networking"
+SUBSYSTEMS = [
+    SUBSYSTEM_NODES,
+    SUBSYSTEM_PROGRAMS,
+    SUBSYSTEM_VARIABLES,
+    SUBSYSTEM_NETWORKING,
+]
+# Subsystems which can be left to load on first use.
+LAZY_SUBSYSTEMS = [
+    SUBSYSTEM_PROGRAMS,
+    SUBSYSTEM_VARIABLES,
+    SUBSYSTEM_NETWORKING,
+]
+
+PRIORITY_COMMAND = "command"
+PRIORITY_REFRESH = "refresh"
+PRIORITY_BACKGROUND = "background"
+REQUEST_PRIORITIES = [
+    PRIORITY_COMMAND,
+    PRIORITY_REFRESH,
+    PRIORITY_BACKGROUND,
+]
+# Relative share of the connections each class gets while all are waiting.
+REQUEST_PRIORITY_WEIGHTS = {
+    PRIORITY_COMMAND: 8,
+    PRIORITY_REFRESH: 3,
+    PRIORITY_BACKGROUND: 1,
+}
+
 ISY_VALUE_UNKNOWN = -1 * float("inf")
 ISY_PROP_NOT_SET = "-1"
 
@@ -69,6 +116,7 @@ ATTR_LAST_UPDATE = "last_update"
 ATTR_NODE_DEF_ID = "nodeDefId"
 ATTR_PARENT = "parentId"
 ATTR_PRECISION = "prec"
+ATTR_SEQNUM = "seqnum"
 ATTR_SET = "set"
 ATTR_STATUS = "status"
 ATTR_STREAM_ID = "sid"
@@ -106,10 +154,13 @@ TAG_MFG = "mfg"
 TAG_MILIATRY_TIME = "IsMilitary"
 TAG_NAME = "name"
 TAG_NET_RULE = "NetRule"
+TAG_NEW_NAME = "newName"
 TAG_NODE = "node"
 TAG_NODE_DEFS = "nodedefs"
 TAG_NTP = "NTP"
 TAG_PARENT = "parent"
+TAG_PRGM_DISABLED = "off"
+TAG_PRGM_ENABLED = "on"
 TAG_PRGM_FINISH = "f"
 TAG_PRGM_RUN = "r"
 TAG_PRGM_RUNNING = "running"
@@ -673,6 +724,13 @@ UOM_TO_STATES = {
     },
 }
 
+# Reverse of UOM_TO_STATES: the command value for each state name per UOM.
+# Where a state name appears more than once, the first value is used.
+UOM_STATES_TO_VALUE = {
+    uom: {state: value for value, state in reversed(list(states.items()))}
+    for uom, states in UOM_TO_STATES.items()
+}
+
 # Translate the "RR" Property to Seconds
 INSTEON_RAMP_RATES = {
     "0": 540,
@@ -876,6 +934,8 @@ NC_CLEAR_ERROR = "CE"
 NC_NET_RENAMED = "WR"
 NC_NODE_REVISED = "RV"
 
+NC_RENAME_ACTIONS = [NC_NODE_RENAMED, NC_GROUP_RENAMED, NC_FOLDER_RENAMED]
+
 NODE_CHANGED_ACTIONS = [
     NC_NODE_RENAMED,
     NC_NODE_REMOVED,
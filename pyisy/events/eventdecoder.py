@@ -0,0 +1,113 @@
+"""Decoder for ISY Event Stream messages."""
+from xml.etree.ElementTree import fromstring
+
+from ..constants import (
+    ATTR_ACTION,
+    ATTR_CONTROL,
+    ATTR_PRECISION,
+    ATTR_SEQNUM,
+    ATTR_STREAM_ID,
+    ATTR_UNIT_OF_MEASURE,
+    TAG_EVENT_INFO,
+    TAG_FORMATTED,
+    TAG_NODE,
+)
+
+
+class EventRecord:
+    """
+    Compact representation of a single ISY Event.
+
+    |  control: The event control (e.g. "ST", "DON", "_0", "_1").
+    |  action: The text of the action tag.
+    |  node: The address of the node the event is for.
+    |  uom: The unit of measure attribute of the action tag.
+    |  prec: The precision attribute of the action tag.
+    |  formatted: The formatted value (fmtAct) of the event.
+    |  event_info: The eventInfo element, kept as-is for nested data.
+    |  seqnum: The event sequence number.
+    |  sid: The subscription (stream) id.
+    """
+
+    __slots__ = (
+        "control",
+        "action",
+        "node",
+        "uom",
+        "prec",
+        "formatted",
+        "event_info",
+        "seqnum",
+        "sid",
+    )
+
+    def __init__(
+        self,
+        control=None,
+        action=None,
+        node=None,
+        uom=None,
+        prec=None,
+        formatted=None,
+        event_info=None,
+        seqnum=None,
+        sid=None,
+    ):
+        """Initialize an EventRecord class."""
+        self.control = control
+        self.action = action
+        self.node = node
+        self.uom = uom
+        self.prec = prec
+        self.formatted = formatted
+        self.event_info = event_info
+        self.seqnum = seqnum
+        self.sid = sid
+
+    def __repr__(self):
+        """Return a string representation of the event."""
+        return (
+            f"EventRecord(seqnum={self.seqnum}, control={self.control}, "
+            f"action={self.action}, node={self.node})"
+        )
+
+    @property
+    def info_text(self):
+        """Return the text of the eventInfo tag, if there was one."""
+        if self.event_info is None:
+            return None
+        return self.event_info.text
+
+    def info(self, tag):
+        """Return the first child of eventInfo with the given tag, or None."""
+        if self.event_info is None:
+            return None
+        return self.event_info.find(tag)
+
+
+def decode_event(msg):
+    """
+    Decode an Event message from the ISY in a single pass.
+
+    Raises `xml.etree.ElementTree.ParseError` if the message is not valid XML.
+    """
+    root = fromstring(msg)
+    seqnum = root.get(ATTR_SEQNUM)
+    event = EventRecord(
+        seqnum=int(seqnum) if seqnum else None, sid=root.get(ATTR_STREAM_ID)
+    )
+    for child in root:
+        tag = child.tag
+        if tag == ATTR_CONTROL:
+            event.control = child.text
+        elif tag == ATTR_ACTION:
+            event.action = child.text
+            event.uom = child.get(ATTR_UNIT_OF_MEASURE)
+            event.prec = child.get(ATTR_PRECISION)
+        elif tag == TAG_NODE:
+            event.node = child.text
+        elif tag == TAG_FORMATTED:
+            event.formatted = child.text
+        elif tag == TAG_EVENT_INFO:
+            event.event_info = child
+    return event
@@ -0,0 +1,265 @@
+"""Bounded queue between receiving and routing event stream messages."""
+import asyncio
+from collections import deque
+import inspect
+import logging
+import time
+
+from ..constants import (
+    EVENT_PROPS_IGNORED,
+    EVENT_QUEUE_BLOCK,
+    EVENT_QUEUE_COALESCE,
+    EVENT_QUEUE_DROP_OLDEST,
+    EVENT_QUEUE_POLICIES,
+    EVENT_QUEUE_RESYNC,
+    EVENT_QUEUE_SIZE,
+    PROP_STATUS,
+)
+
+_LOGGER = logging.getLogger(__name__)  # Allows targeting pyisy.events in handlers.
+
+
+def state_event_key(event):
+    """
+    Return the (address, control) key of a node state event, or None.
+
+    Only events which replace a node's state (status and aux properties)
+    have a key; commands like DON or DOF and system events do not, since
+    each of them matters.
+    """
+    cntrl = event.control
+    if not (event.node and cntrl):
+        return None
+    if cntrl == PROP_STATUS or (cntrl[0] != "_" and cntrl not in EVENT_PROPS_IGNORED):
+        return (event.node, cntrl)
+    return None
+
+
+def coalesce_events(events):
+    """
+    Merge the state events of a batch, keeping the latest per node and control.
+
+    Each merged event takes the place of the first event with its key, so
+    the order of the other events is kept.
+
+    |  events: List of (message, EventRecord) tuples.
+
+    Returns the merged list and the number of events that were merged.
+    """
+    merged = []
+    positions = {}
+    for item in events:
+        key = state_event_key(item[1])
+        if key is None:
+            merged.append(item)
+            continue
+        position = positions.get(key)
+        if position is None:
+            positions[key] = len(merged)
+            merged.append(item)
+        else:
+            merged[position] = item
+    return merged, len(events) - len(merged)
+
+
+class EventQueue:
+    """
+    Bounded queue of received events, processed in order by a worker task.
+
+    Receiving only has to put each event in the queue, so a slow handler
+    does not hold up reading from the connection. When the queue is full,
+    the overflow policy decides what happens to a new event:
+
+    |  block: Wait until there is room (applies backpressure to the reads),
+       or with `put_nowait`, reject the new event.
+    |  drop_oldest: Discard the oldest queued event.
+    |  coalesce: Replace the queued event with the same key (e.g. the
+       same node and control) with the new one, otherwise wait for room.
+    |  resync: Reject the new event without waiting, so the owner can
+       reload the state once there is room again.
+
+    With a coalescing window, an item with the same key as one which is
+    still queued always replaces it, and the worker waits for the window
+    before it starts on a new burst of items, so only the latest state of
+    each key in the burst is handled.
+
+    |  handler: Function (or coroutine function) called with each item.
+    |  maxsize: [optional] The maximum number of queued items.
+    |  policy: [optional] The overflow policy, one of `EVENT_QUEUE_POLICIES`.
+    |  coalesce_window: [optional] Seconds to collect a burst of items
+       before handling them, 0 to disable coalescing.
+
+    :ivar high_water: The largest number of items that have been queued.
+    :ivar lag: Seconds the last processed item waited in the queue.
+    :ivar max_lag: The longest wait of an item in the queue.
+    :ivar processed: The number of items processed.
+    :ivar dropped: The number of items discarded by `drop_oldest`.
+    :ivar rejected: The number of items which were rejected.
+    :ivar coalesced: The number of items merged into a queued item.
+    """
+
+    def __init__(
+        self,
+        handler,
+        maxsize=EVENT_QUEUE_SIZE,
+        policy=EVENT_QUEUE_BLOCK,
+        coalesce_window=0,
+    ):
+        """Initialize an EventQueue class."""
+        if policy not in EVENT_QUEUE_POLICIES:
+            raise ValueError(f"Invalid event queue policy: {policy}")
+        self._handler = handler
+        self.maxsize = max(maxsize, 1)
+        self.policy = policy
+        self.coalesce_window = coalesce_window
+        self._queue = deque()
+        self._keys = {}
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._task = None
+        self.high_water = 0
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.processed = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        """Return the number of queued items."""
+        return len(self._queue)
+
+    @property
+    def depth(self):
+        """Return the number of queued items."""
+        return len(self._queue)
+
+    @property
+    def metrics(self):
+        """Return the queue depth, high-water mark, lag and counters."""
+        return {
+            "depth": len(self._queue),
+            "maxsize": self.maxsize,
+            "high_water": self.high_water,
+            "lag": self.lag,
+            "max_lag": self.max_lag,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "coalesced": self.coalesced,
+        }
+
+    @property
+    def running(self):
+        """Return if the worker task is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the worker task, if it is not running."""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._worker())
+
+    def stop(self):
+        """Stop the worker task. Queued items are kept, see `clear`."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def clear(self):
+        """Discard all of the queued items."""
+        self._queue.clear()
+        self._keys.clear()
+        self._not_full.set()
+
+    async def put(self, item, key=None):
+        """
+        Add an item to the queue, applying the overflow policy if it is full.
+
+        |  item: The item to pass to the handler.
+        |  key: [optional] Key of the item for coalescing.
+
+        Returns False if the item was rejected by the `resync` policy.
+        """
+        while not self._put(item, key):
+            if self.policy == EVENT_QUEUE_RESYNC:
+                self.rejected += 1
+                return False
+            self._not_full.clear()
+            await self._not_full.wait()
+        return True
+
+    def put_nowait(self, item, key=None):
+        """
+        Add an item to the queue without waiting for room.
+
+        The overflow policy is applied if the queue is full, but where it
+        would wait for room the item is rejected instead.
+
+        |  item: The item to pass to the handler.
+        |  key: [optional] Key of the item for coalescing.
+
+        Returns False if the item was rejected.
+        """
+        if self._put(item, key):
+            return True
+        self.rejected += 1
+        return False
+
+    def _put(self, item, key):
+        """Queue an item if there is room or the policy makes room for it."""
+        if self.coalesce_window and key in self._keys:
+            self._keys[key][0] = item
+            self.coalesced += 1
+            return True
+        if len(self._queue) >= self.maxsize:
+            if self.policy == EVENT_QUEUE_COALESCE and key in self._keys:
+                self._keys[key][0] = item
+                self.coalesced += 1
+                return True
+            if self.policy != EVENT_QUEUE_DROP_OLDEST:
+                return False
+            self._remove_key(self._queue.popleft())
+            self.dropped += 1
+
+        entry = [item, time.monotonic(), key]
+        self._queue.append(entry)
+        if key is not None:
+            self._keys[key] = entry
+        if len(self._queue) > self.high_water:
+            self.high_water = len(self._queue)
+        self._not_empty.set()
+        return True
+
+    def _remove_key(self, entry):
+        """Forget the key of an entry leaving the queue."""
+        key = entry[2]
+        if key is not None and self._keys.get(key) is entry:
+            del self._keys[key]
+
+    async def _worker(self):
+        """Process the queued items in order."""
+        queue = self._queue
+        while True:
+            if not queue:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+                if self.coalesce_window:
+                    # Let the rest of the burst arrive and merge.
+                    await asyncio.sleep(self.coalesce_window)
+                continue
+            entry = queue.popleft()
+            self._remove_key(entry)
+            self._not_full.set()
+            self.lag = time.monotonic() - entry[1]
+            if self.lag > self.max_lag:
+                self.max_lag = self.lag
+            try:
+                result = self._handler(entry[0])
+                if inspect.isawaitable(result):
+                    await result
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("PyISY encountered an error processing an event.")
+            self.processed += 1
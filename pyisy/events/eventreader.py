@@ -1,19 +1,22 @@
 """ISY TCP Socket Event Reader."""
-import errno
-import select
-import ssl
-
 from ..constants import SOCKET_BUFFER_SIZE
-from ..exceptions import (
-    ISYInvalidAuthError,
-    ISYMaxConnections,
-    ISYStreamDataError,
-    ISYStreamDisconnected,
-)
+from ..exceptions import ISYInvalidAuthError, ISYMaxConnections, ISYStreamDataError
+
+EVENT_BUFFER_SIZE = 32 * SOCKET_BUFFER_SIZE
 
 
 class ISYEventReader:
-    """Read in streams of ISY HTTP Events."""
+    """
+    Read in streams of ISY HTTP Events.
+
+    Data is received into a preallocated `bytearray` and the events are
+    framed in place with offsets into it, so a burst of events is not
+    copied again for each header and body. The unread data is only moved
+    back to the start of the buffer when more room is needed, and the
+    buffer only grows if a single event does not fit in it.
+
+    |  buffer_size: [optional] The initial size of the receive buffer.
+    """
 
     HTTP_HEADER_SEPERATOR = b"\r\n"
     HTTP_HEADER_BODY_SEPERATOR = b"\r\n\r\n"
@@ -23,87 +26,100 @@ class ISYEventReader:
     CONTENT_LENGTH_HEADER = b"content-length"
     HEADER_SEPERATOR = b":"
 
-    def __init__(self, isy_read_socket):
+    def __init__(self, buffer_size=EVENT_BUFFER_SIZE):
         """Initialize the ISYEventStream class."""
-        self._event_buffer = b""
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
         self._event_content_length = None
         self._event_count = 0
-        self._socket = isy_read_socket
 
-    def read_events(self, timeout):
-        """Read events from the socket."""
+    @property
+    def event_count(self):
+        """Return the number of events read so far."""
+        return self._event_count
+
+    @property
+    def _event_buffer(self):
+        """Return a copy of the data which has not been read yet."""
+        return bytes(self._view[self._start : self._end])
+
+    def feed(self, data):
+        """
+        Add received data to the buffer and read the completed events.
+
+        |  data: The bytes received from the event stream.
+
+        Returns a list of the event bodies completed by this data.
+        """
+        self._reserve(len(data))
+        self._view[self._end : self._end + len(data)] = data
+        self._end += len(data)
+        return self._read_buffered_events()
+
+    def _read_buffered_events(self):
+        """Frame the events in the buffer and return their bodies."""
         events = []
-        # poll socket for new data
-        if not self._receive_into_buffer(timeout):
-            return events
+        buffer = self._buffer
+        view = self._view
+        start = self._start
+        end = self._end
 
         while True:
             # Read the headers if we do not have content length yet
             if not self._event_content_length:
-                seperator_position = self._event_buffer.find(
-                    self.HTTP_HEADER_BODY_SEPERATOR
+                seperator_position = buffer.find(
+                    self.HTTP_HEADER_BODY_SEPERATOR, start, end
                 )
                 if seperator_position == -1:
-                    return events
-                self._parse_headers(seperator_position)
+                    break
+                self._parse_headers(start, seperator_position)
+                start = seperator_position + self.HTTP_HEADER_BODY_SEPERATOR_LEN
 
             # If we do not have a body yet
-            if len(self._event_buffer) < self._event_content_length:
-                return events
+            body_end = start + self._event_content_length
+            if body_end > end:
+                break
 
             # We have the body now
-            body = self._event_buffer[0 : self._event_content_length]
             self._event_count += 1
-            self._event_buffer = self._event_buffer[self._event_content_length :]
             self._event_content_length = None
-            events.append(body.decode(encoding="utf-8", errors="ignore"))
-
-    def _receive_into_buffer(self, timeout):
-        """Receive data on available on the socket.
-
-        If we get an empty read on the first read attempt
-        this means the isy has disconnected.
-
-        If we get an empty read on the first read attempt
-        and we have seen only one event, the isy has reached
-        the maximum number of event listeners.
-        """
-        inready, _, _ = select.select([self._socket], [], [], timeout)
-        if self._socket not in inready:
-            return False
-
-        try:
-            # We have data on the wire, read as much as we can
-            # up to 32 * SOCKET_BUFFER_SIZE
-            for read_count in range(0, 32):
-                new_data = self._socket.recv(SOCKET_BUFFER_SIZE)
-                print(f"read_count: {read_count} new_data: {new_data}")
-                if len(new_data) == 0:
-                    if read_count != 0:
-                        break
-                    if self._event_count <= 1:
-                        raise ISYMaxConnections(self._event_buffer)
-                    raise ISYStreamDisconnected(self._event_buffer)
-
-                self._event_buffer += new_data
-        except ssl.SSLWantReadError:
-            pass
-        except OSError as ex:
-            if ex.errno != errno.EWOULDBLOCK:
-                raise
-
-        return True
-
-    def _parse_headers(self, seperator_position):
+            events.append(str(view[start:body_end], encoding="utf-8", errors="ignore"))
+            start = body_end
+
+        if start == end:
+            start = end = 0
+        self._start = start
+        self._end = end
+        return events
+
+    def _reserve(self, size):
+        """Make room for at least `size` more bytes at the end of the buffer."""
+        if len(self._buffer) - self._end >= size:
+            return
+        pending = self._end - self._start
+        if self._start:
+            # Move the unread data back to the start of the buffer.
+            self._view[:pending] = self._view[self._start : self._end]
+            self._start = 0
+            self._end = pending
+        if len(self._buffer) - pending >= size:
+            return
+        capacity = len(self._buffer)
+        while capacity - pending < size:
+            capacity *= 2
+        self._view.release()
+        self._buffer.extend(bytes(capacity - len(self._buffer)))
+        self._view = memoryview(self._buffer)
+
+    def _parse_headers(self, start, seperator_position):
         """Find the content-length in the headers."""
-        headers = self._event_buffer[0:seperator_position]
+        headers = bytes(self._view[start:seperator_position])
         if headers.startswith(self.REACHED_MAX_CONNECTIONS_RESPONSE):
             raise ISYMaxConnections(self._event_buffer)
         if headers.startswith(self.HTTP_NOT_AUTHORIZED_RESPONSE):
             raise ISYInvalidAuthError(self._event_buffer)
-        self._event_buffer = self._event_buffer[
-            seperator_position + self.HTTP_HEADER_BODY_SEPERATOR_LEN :
-        ]
         for header in headers.split(self.HTTP_HEADER_SEPERATOR)[1:]:
             header_name, header_value = header.split(self.HEADER_SEPERATOR, 1)
             if header_name.strip().lower() != self.CONTENT_LENGTH_HEADER:
@@ -0,0 +1,93 @@
+"""Sequence number tracking for the ISY event streams."""
+import logging
+
+_LOGGER = logging.getLogger(__name__)  # Allows targeting pyisy.events in handlers.
+
+
+def resync_on_gap(isy):
+    """Return an `on_gap` callback which schedules an `ISY.resync`."""
+
+    def on_gap(missed, event):
+        """Resync the state when events were missed."""
+        _LOGGER.warning(
+            "PyISY missed %s event(s) before event %s, resyncing.", missed, event.seqnum
+        )
+        isy.resync()
+
+    return on_gap
+
+
+class SequenceTracker:
+    """
+    Track the sequence numbers of the events received on a stream.
+
+    The ISY numbers the events of each subscription in order, so a jump in
+    the sequence means events were lost and the state may be out of date.
+
+    |  on_gap: [optional] Function called with the number of missed events
+       and the event received after them when a gap is found.
+
+    :ivar sid: The subscription (stream) id being tracked.
+    :ivar last: The last sequence number received.
+    :ivar gaps: The number of gaps found.
+    :ivar missed: The total number of events missed in the gaps.
+    :ivar out_of_order: The number of events received late or twice.
+    """
+
+    def __init__(self, on_gap=None):
+        """Initialize a SequenceTracker class."""
+        self._on_gap = on_gap
+        self.sid = None
+        self.last = None
+        self.gaps = 0
+        self.missed = 0
+        self.out_of_order = 0
+
+    @property
+    def metrics(self):
+        """Return the gap and ordering counters."""
+        return {
+            "last": self.last,
+            "gaps": self.gaps,
+            "missed": self.missed,
+            "out_of_order": self.out_of_order,
+        }
+
+    def reset(self):
+        """Start tracking a new subscription."""
+        self.sid = None
+        self.last = None
+
+    def track(self, event):
+        """
+        Check the sequence number of a received event.
+
+        |  event: The EventRecord received.
+
+        Returns the number of events missed before this one.
+        """
+        seqnum = event.seqnum
+        if seqnum is None:
+            return 0
+        if event.sid is not None and event.sid != self.sid:
+            # A new subscription starts its own sequence.
+            self.sid = event.sid
+            self.last = seqnum
+            return 0
+        if self.last is None:
+            self.last = seqnum
+            return 0
+        expected = self.last + 1
+        if seqnum == expected:
+            self.last = seqnum
+            return 0
+        if seqnum < expected:
+            self.out_of_order += 1
+            return 0
+        missed = seqnum - expected
+        self.last = seqnum
+        self.gaps += 1
+        self.missed += missed
+        if self._on_gap is not None:
+            self._on_gap(missed, event)
+        return missed
@@ -1,19 +1,13 @@
 """ISY Event Stream."""
 import asyncio
 import logging
-import socket
-import ssl
-from threading import Thread, ThreadError
-import time
-import xml
-from xml.dom import minidom
+from xml.etree.ElementTree import ParseError
 
 from . import strings
+from ..connection import get_sslcontext
 from ..constants import (
     ACTION_KEY,
     ACTION_KEY_CHANGED,
-    ATTR_ACTION,
-    ATTR_CONTROL,
     ATTR_ID,
     ATTR_STREAM_ID,
     ATTR_VAR,
@@ -26,47 +20,111 @@ from ..constants import (
     POLL_TIME,
     PROP_STATUS,
     RECONNECT_DELAY,
-    TAG_EVENT_INFO,
-    TAG_NODE,
+    SUBSYSTEM_PROGRAMS,
+    SUBSYSTEM_VARIABLES,
 )
 from ..exceptions import ISYInvalidAuthError, ISYMaxConnections, ISYStreamDataError
-from ..helpers import attr_from_xml, now, value_from_xml
+from ..helpers import now
+from .eventdecoder import decode_event
+from .eventqueue import coalesce_events
 from .eventreader import ISYEventReader
+from .sequence import SequenceTracker, resync_on_gap
 
 _LOGGER = logging.getLogger(__name__)  # Allows targeting pyisy.events in handlers.
 
 
+class EventStreamProtocol(asyncio.Protocol):
+    """
+    Protocol for the ISY SOAP event stream connection.
+
+    Received data is framed into events by an `ISYEventReader` and each
+    event is routed by the `EventStream` on the event loop.
+
+    |  stream: The EventStream which owns the connection.
+    """
+
+    def __init__(self, stream):
+        """Initialize the EventStreamProtocol class."""
+        self._stream = stream
+        self._reader = ISYEventReader()
+
+    def connection_made(self, transport):
+        """Handle a new connection to the ISY."""
+        self._stream.connection_made(transport)
+
+    def data_received(self, data):
+        """Frame and route the events in the received data."""
+        try:
+            events = self._reader.feed(data)
+        except ISYMaxConnections:
+            _LOGGER.error(
+                "PyISY reached maximum connections, delaying reconnect attempt by %s seconds.",
+                RECONNECT_DELAY,
+            )
+            self._stream.lost_connection(RECONNECT_DELAY)
+            return
+        except ISYInvalidAuthError:
+            _LOGGER.error("Invalid authentication used to connect to the event stream.")
+            self._stream.disconnect()
+            return
+        except ISYStreamDataError as ex:
+            _LOGGER.warning(
+                "PyISY encountered an error while reading the event stream: %s.", ex
+            )
+            self._stream.lost_connection()
+            return
+
+        if events:
+            self._stream.route_events(self._stream.decode_messages(events))
+
+    def connection_lost(self, exc):
+        """Handle the connection to the ISY being closed."""
+        if exc is not None:
+            _LOGGER.warning(
+                "PyISY encountered a socket error while reading the event stream: %s.",
+                exc,
+            )
+        if self._reader.event_count <= 1:
+            # The ISY closes new connections once it reached its maximum.
+            self._stream.connection_lost(RECONNECT_DELAY)
+        else:
+            self._stream.connection_lost()
+
+
 class EventStream:
-    """Class to represent the Event Stream from the ISY."""
+    """
+    Class to represent the Event Stream from the ISY.
+
+    The connection is an asyncio transport on the ISY's event loop, so the
+    events are routed on the loop without any threads.
+
+    :ivar coalesce: Only route the latest state event per node and control
+                    in each batch of events read together.
+    :ivar coalesced: The number of events merged by `coalesce`.
+    :ivar sequence: SequenceTracker of the received events. Missed events
+                    schedule an `ISY.resync`.
+    """
 
     def __init__(self, isy, connection_info, on_lost_func=None):
         """Initialize the EventStream class."""
         self.isy = isy
+        self._loop = isy.loop
         self._running = False
-        self._writer = None
-        self._thread = None
+        self._transport = None
+        self._start_task = None
+        self._heartbeat_timer = None
         self._subscribed = False
         self._connected = False
         self._lasthb = None
         self._hbwait = 0
         self._loaded = None
+        self._program_key = None
         self._on_lost_function = on_lost_func
         self.cert = None
         self.data = connection_info
-
-        # create TLS encrypted socket if we're using HTTPS
-        if self.data.get("tls"):
-            if self.data["tls"] == 1.1:
-                context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_1)
-            else:
-                context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
-            context.check_hostname = False
-            self.socket = context.wrap_socket(
-                socket.socket(socket.AF_INET, socket.SOCK_STREAM),
-                server_hostname=f"https://{self.data['addr']}",
-            )
-        else:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.coalesce = False
+        self.coalesced = 0
+        self.sequence = SequenceTracker(resync_on_gap(isy))
 
     def _create_message(self, msg):
         """Prepare a message for sending."""
@@ -77,22 +135,59 @@ class EventStream:
         head = head.format(length=length, **self.data)
         return head + body
 
-    def _route_message(self, msg):
+    @staticmethod
+    def decode_messages(messages):
+        """
+        Decode a batch of messages from the event stream.
+
+        Malformed messages are logged and skipped.
+
+        |  messages: List of the event message strings.
+
+        Returns a list of (message, EventRecord) tuples.
+        """
+        decoded = []
+        for msg in messages:
+            # check xml formatting
+            try:
+                decoded.append((msg, decode_event(msg)))
+            except ParseError:
+                _LOGGER.warning("ISY Received Malformed XML:\n" + msg)
+        return decoded
+
+    def route_events(self, events):
+        """
+        Route a batch of decoded events on the event loop.
+
+        |  events: List of (message, EventRecord) tuples from `decode_messages`.
+        """
+        for _, event in events:
+            self.sequence.track(event)
+        if self.coalesce:
+            events, merged = coalesce_events(events)
+            self.coalesced += merged
+        for msg, event in events:
+            try:
+                self.route_event(msg, event)
+            except Exception as ex:  # pylint: disable=broad-except
+                _LOGGER.warning(
+                    "PyISY encountered while routing message '%s': %s", msg, ex
+                )
+
+    def route_message(self, msg):
         """Route a received message from the event stream."""
-        # check xml formatting
-        try:
-            xmldoc = minidom.parseString(msg)
-        except xml.parsers.expat.ExpatError:
-            _LOGGER.warning("ISY Received Malformed XML:\n" + msg)
-            return
+        self.route_events(self.decode_messages([msg]))
+
+    def route_event(self, msg, event):
+        """Route a decoded event from the event stream."""
         _LOGGER.log(LOG_VERBOSE, "ISY Update Received:\n" + msg)
 
         # A wild stream id appears!
-        if f"{ATTR_STREAM_ID}=" in msg and ATTR_STREAM_ID not in self.data:
-            self.update_received(xmldoc)
+        if event.sid and ATTR_STREAM_ID not in self.data:
+            self.update_received(event)
 
         # direct the event message
-        cntrl = value_from_xml(xmldoc, ATTR_CONTROL)
+        cntrl = event.control
         if not cntrl:
             return
         if cntrl == "_0":  # ISY HEARTBEAT
@@ -103,94 +198,134 @@ class EventStream:
                 self._loaded = ES_LOADED
                 self.isy.connection_events.notify(ES_LOADED)
             self._lasthb = now()
-            self._hbwait = int(value_from_xml(xmldoc, ATTR_ACTION))
+            self._hbwait = int(event.action)
+            self._reset_heartbeat_timer()
             _LOGGER.debug("ISY HEARTBEAT: %s", self._lasthb.isoformat())
         elif cntrl == PROP_STATUS:  # NODE UPDATE
-            self.isy.nodes.update_received(xmldoc)
+            self.isy.nodes.update_received(event)
         elif cntrl[0] != "_":  # NODE CONTROL EVENT
-            self.isy.nodes.control_message_received(xmldoc)
+            self.isy.nodes.control_message_received(event)
         elif cntrl == "_1":  # Trigger Update
-            if f"<{ATTR_VAR}" in msg:  # VARIABLE
-                self.isy.variables.update_received(xmldoc)
-            elif f"<{ATTR_ID}>" in msg:  # PROGRAM
-                self.isy.programs.update_received(xmldoc)
-            elif f"<{TAG_NODE}>" in msg and "[" in msg:  # Node Server Update
+            # Subsystems not loaded yet get their current state when loaded.
+            if event.info(ATTR_VAR) is not None:  # VARIABLE
+                if SUBSYSTEM_VARIABLES in self.isy.loaded:
+                    self.isy.variables.update_received(event)
+            elif event.info(ATTR_ID) is not None:  # PROGRAM
+                if SUBSYSTEM_PROGRAMS in self.isy.loaded:
+                    self.isy.programs.update_received(event)
+            elif event.node and "[" in (event.info_text or ""):  # Node Server Update
                 pass  # This is most likely a duplicate node update.
-            elif f"<{ATTR_ACTION}>" in msg:
-                action = value_from_xml(xmldoc, ATTR_ACTION)
-                if action == ACTION_KEY:
-                    self.data[ACTION_KEY] = value_from_xml(xmldoc, TAG_EVENT_INFO)
+            elif event.action is not None:
+                if event.action == ACTION_KEY:
+                    self.data[ACTION_KEY] = event.info_text
                     return
-                if action == ACTION_KEY_CHANGED:
-                    self._program_key = value_from_xml(xmldoc, TAG_NODE)
-                # Need to reload programs
-                asyncio.run_coroutine_threadsafe(
-                    self.isy.programs.update(), self.isy.loop
-                )
+                if event.action == ACTION_KEY_CHANGED:
+                    self._program_key = event.node
+                # Need to reload programs, merged with any pending reload
+                if SUBSYSTEM_PROGRAMS in self.isy.loaded:
+                    self.isy.programs.refresh()
         elif cntrl == "_3":  # Node Changed/Updated
-            self.isy.nodes.node_changed_received(xmldoc)
+            self.isy.nodes.node_changed_received(event)
 
-    def update_received(self, xmldoc):
+    def update_received(self, event):
         """Set the socket ID."""
-        self.data[ATTR_STREAM_ID] = attr_from_xml(xmldoc, "Event", ATTR_STREAM_ID)
+        self.data[ATTR_STREAM_ID] = event.sid
         _LOGGER.debug("ISY Updated Events Stream ID")
 
     @property
     def running(self):
-        """Return the running state of the thread."""
-        try:
-            return self._thread.isAlive()
-        except (AttributeError, RuntimeError, ThreadError):
-            return False
+        """Return the running state of the event stream."""
+        return self._running
 
     @running.setter
     def running(self, val):
         if val and not self.running:
-            _LOGGER.info("ISY Starting Updates")
-            if self.connect():
-                self.subscribe()
-                self._running = True
-                self._thread = Thread(target=self.watch)
-                self._thread.daemon = True
-                self._thread.start()
-        else:
-            _LOGGER.info("ISY Stopping Updates")
-            self._running = False
-            self.unsubscribe()
-            self.disconnect()
+            self._running = True
+            self._start_task = self._loop.create_task(self.start())
+        elif not val:
+            self.stop()
+
+    async def start(self):
+        """
+        Connect and subscribe to the event stream.
+
+        Returns True if the connection was made.
+        """
+        _LOGGER.info("ISY Starting Updates")
+        self._running = True
+        if await self.connect():
+            return True
+        self._running = False
+        return False
+
+    def stop(self):
+        """Unsubscribe and disconnect from the event stream."""
+        _LOGGER.info("ISY Stopping Updates")
+        self._running = False
+        if self._start_task is not None and not self._start_task.done():
+            self._start_task.cancel()
+        self._start_task = None
+        self.unsubscribe()
+        self.disconnect()
 
     def write(self, msg):
         """Write data back to the socket."""
-        if self._writer is None:
+        if self._transport is None:
             raise NotImplementedError("Function not available while socket is closed.")
-        self._writer.write(msg)
-        self._writer.flush()
+        self._transport.write(msg.encode())
 
-    def connect(self):
+    async def connect(self):
         """Connect to the event stream socket."""
-        if not self._connected:
-            try:
-                self.socket.connect((self.data["addr"], self.data["port"]))
-                if self.data.get("tls"):
-                    self.cert = self.socket.getpeercert()
-            except OSError as err:
-                _LOGGER.exception(
-                    "PyISY could not connect to ISY event stream. %s", err
-                )
-                if self._on_lost_function is not None:
-                    self._on_lost_function()
-                return False
-            self.socket.setblocking(0)
-            self._writer = self.socket.makefile("w")
-            self._connected = True
-            self.isy.connection_events.notify(ES_CONNECTED)
+        if self._connected:
             return True
+        sslcontext = get_sslcontext(bool(self.data.get("tls")), self.data.get("tls"))
+        if sslcontext is not None:
+            sslcontext.check_hostname = False
+        try:
+            await self._loop.create_connection(
+                lambda: EventStreamProtocol(self),
+                self.data["addr"],
+                self.data["port"],
+                ssl=sslcontext,
+                server_hostname=self.data["addr"] if sslcontext else None,
+            )
+        except OSError as err:
+            _LOGGER.error("PyISY could not connect to ISY event stream. %s", err)
+            if self._on_lost_function is not None:
+                self._on_lost_function()
+            return False
         return True
 
+    def connection_made(self, transport):
+        """Subscribe once the connection to the ISY is made."""
+        if not self._running:
+            # Stopped while the connection was being made.
+            transport.close()
+            return
+        self._transport = transport
+        if self.data.get("tls"):
+            ssl_object = transport.get_extra_info("ssl_object")
+            if ssl_object is not None:
+                self.cert = ssl_object.getpeercert()
+        self._connected = True
+        self.isy.connection_events.notify(ES_CONNECTED)
+        self.subscribe()
+
+    def connection_lost(self, delay=0):
+        """React when the ISY closes the connection."""
+        if self._transport is None:
+            return
+        self._transport = None
+        self.lost_connection(delay)
+
     def disconnect(self):
         """Disconnect from the Event Stream socket."""
+        self._cancel_heartbeat_timer()
         if self._connected:
-            self.socket.close()
+            transport = self._transport
+            self._transport = None
+            if transport is not None:
+                transport.close()
             self._connected = False
             self._subscribed = False
             self._running = False
@@ -209,7 +344,7 @@ class EventStream:
 
     def unsubscribe(self):
         """Unsubscribe from the Event Stream."""
-        if self._subscribed and self._connected:
+        if self._subscribed and self._connected and self._transport is not None:
             msg = self._create_message(strings.UNSUB_MSG)
             self.write(msg)
             self._subscribed = False
@@ -227,66 +362,38 @@ class EventStream:
             return (now() - self._lasthb).seconds
         return 0.0
 
-    def _lost_connection(self, delay=0):
+    def _reset_heartbeat_timer(self):
+        """Restart the timer which detects a missed heartbeat."""
+        self._cancel_heartbeat_timer()
+        if self._hbwait:
+            self._heartbeat_timer = self._loop.call_later(
+                self._hbwait + POLL_TIME, self._heartbeat_missed
+            )
+
+    def _cancel_heartbeat_timer(self):
+        """Stop the heartbeat timer."""
+        if self._heartbeat_timer is not None:
+            self._heartbeat_timer.cancel()
+            self._heartbeat_timer = None
+
+    def _heartbeat_missed(self):
+        """React when no heartbeat was received in time."""
+        self._heartbeat_timer = None
+        if self._running and self._subscribed:
+            self.lost_connection()
+
+    def lost_connection(self, delay=0):
         """React when the event stream connection is lost."""
+        if not self._running and not self._connected:
+            return
         self.disconnect()
+        self._running = False
         _LOGGER.warning("PyISY lost connection to the ISY event stream.")
         self.isy.connection_events.notify(ES_LOST_STREAM_CONNECTION)
         if self._on_lost_function is not None:
-            time.sleep(delay)
-            self._on_lost_function()
-
-    def watch(self):
-        """Watch the subscription connection and report if dead."""
-        if not self._subscribed:
-            _LOGGER.debug("PyISY watch called without a subscription.")
-            return
-
-        event_reader = ISYEventReader(self.socket)
-
-        while self._running and self._subscribed:
-            # verify connection is still alive
-            if self.heartbeat_time > self._hbwait:
-                self._lost_connection()
-                return
-
-            try:
-                events = event_reader.read_events(POLL_TIME)
-            except ISYMaxConnections:
-                _LOGGER.error(
-                    "PyISY reached maximum connections, delaying reconnect attempt by %s seconds.",
-                    RECONNECT_DELAY,
-                )
-                self._lost_connection(RECONNECT_DELAY)
-                return
-            except ISYInvalidAuthError:
-                _LOGGER.error(
-                    "Invalid authentication used to connect to the event stream."
-                )
-                return
-            except ISYStreamDataError as ex:
-                _LOGGER.warning(
-                    "PyISY encountered an error while reading the event stream: %s.", ex
-                )
-                self._lost_connection()
-                return
-            except OSError as ex:
-                _LOGGER.warning(
-                    "PyISY encountered a socket error while reading the event stream: %s.",
-                    ex,
-                )
-                self._lost_connection()
-                return
-
-            for message in events:
-                try:
-                    self._route_message(message)
-                except Exception as ex:  # pylint: disable=broad-except
-                    _LOGGER.warning(
-                        "PyISY encountered while routing message '%s': %s", message, ex
-                    )
-                    raise
+            self._loop.call_later(delay, self._on_lost_function)
 
     def __del__(self):
         """Ensure we unsubscribe on destroy."""
-        self.unsubscribe()
+        if self._transport is not None and not self._loop.is_closed():
+            self.unsubscribe()
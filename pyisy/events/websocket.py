@@ -1,8 +1,7 @@
 """ISY Websocket Event Stream."""
 import asyncio
 import logging
-import xml
-from xml.dom import minidom
+from xml.etree.ElementTree import ParseError
 
 import aiohttp
 
@@ -10,10 +9,7 @@ from ..connection import get_new_client_session, get_sslcontext
 from ..constants import (
     ACTION_KEY,
     ACTION_KEY_CHANGED,
-    ATTR_ACTION,
-    ATTR_CONTROL,
     ATTR_ID,
-    ATTR_STREAM_ID,
     ATTR_VAR,
     ES_CONNECTED,
     ES_DISCONNECTED,
@@ -22,15 +18,20 @@ from ..constants import (
     ES_NOT_STARTED,
     ES_RECONNECTING,
     ES_STOP_UPDATES,
+    EVENT_QUEUE_RESYNC,
+    EVENT_QUEUE_SIZE,
     LOG_DATE_FORMAT,
     LOG_FORMAT,
     LOG_LEVEL,
     LOG_VERBOSE,
     PROP_STATUS,
-    TAG_EVENT_INFO,
-    TAG_NODE,
+    SUBSYSTEM_PROGRAMS,
+    SUBSYSTEM_VARIABLES,
 )
-from ..helpers import attr_from_xml, now, value_from_xml
+from ..helpers import now
+from .eventdecoder import decode_event
+from .eventqueue import EventQueue, state_event_key
+from .sequence import SequenceTracker, resync_on_gap
 
 _LOGGER = logging.getLogger(__name__)  # Allows targeting pyisy.events in handlers.
 
@@ -46,7 +47,28 @@ WS_RETRY_BACKOFF = [0.01, 1, 10, 30, 60]  # Seconds
 
 
 class WebSocketClient:
-    """Class for handling web socket communications with the ISY."""
+    """
+    Class for handling web socket communications with the ISY.
+
+    Received messages are decoded and put in a bounded `EventQueue`, and
+    are routed by its worker task, so a slow listener or a program reload
+    does not hold up reading messages from the websocket. Heartbeats are
+    handled as they are received, so a backlog is not mistaken for a lost
+    connection.
+
+    |  event_queue_size: [optional] The maximum number of queued events.
+    |  event_queue_policy: [optional] What to do with a new event when the
+       queue is full, one of `EVENT_QUEUE_POLICIES`. With the default
+       `resync`, events which do not fit are discarded with a warning and
+       the state is resynced once the queue has room again. With `block`,
+       reading waits for room, which can delay heartbeats on a long stall.
+    |  event_coalesce_window: [optional] Seconds to collect a burst of events,
+       only routing the latest state event per node and control. The
+       number of merged events is in `event_queue.metrics`.
+
+    :ivar sequence: SequenceTracker of the received events. Missed events
+                    schedule an `ISY.resync`.
+    """
 
     def __init__(
         self,
@@ -59,6 +81,9 @@ class WebSocketClient:
         tls_ver=1.1,
         webroot="",
         websession=None,
+        event_queue_size=EVENT_QUEUE_SIZE,
+        event_queue_policy=EVENT_QUEUE_RESYNC,
+        event_coalesce_window=0,
     ):
         """Initialize a new Web Socket Client class."""
         if not len(_LOGGER.handlers):
@@ -83,6 +108,15 @@ class WebSocketClient:
         self._program_key = None
         self.websocket_task = None
         self.guardian_task = None
+        self.event_queue = EventQueue(
+            self._route_event,
+            event_queue_size,
+            event_queue_policy,
+            event_coalesce_window,
+        )
+        self.sequence = SequenceTracker(resync_on_gap(isy))
+        self._reconcile_on_connect = False
+        self._queue_overflow = False
 
         if websession is None:
             websession = get_new_client_session(use_https, tls_ver)
@@ -99,6 +133,7 @@ class WebSocketClient:
         if self.status != ES_CONNECTED:
             _LOGGER.debug("Starting websocket connection.")
             self.status = ES_INITIALIZING
+            self.event_queue.start()
             self.websocket_task = self._loop.create_task(self.websocket(retries))
             self.guardian_task = self._loop.create_task(self._websocket_guardian())
 
@@ -111,11 +146,16 @@ class WebSocketClient:
         if self.guardian_task is not None:
             self.guardian_task.cancel()
             self._lasthb = None
+        # Queued events are older than the state fetched after reconnecting.
+        self.event_queue.stop()
+        self.event_queue.clear()
+        self._queue_overflow = False
 
     async def reconnect(self, delay=None, retries=0):
         """Reconnect to a disconnected websocket."""
         self.stop()
         self.status = ES_RECONNECTING
+        self._reconcile_on_connect = True
         if delay is None:
             delay = WS_RETRY_BACKOFF[retries]
         _LOGGER.info("PyISY attempting stream reconnect in %ss.", delay)
@@ -162,55 +202,85 @@ class WebSocketClient:
                 self._loop.create_task(self.reconnect())
                 return
 
-    async def _route_message(self, msg):
-        """Route a received message from the event stream."""
+    async def _queue_message(self, msg):
+        """Decode a received message and queue it for routing."""
         # check xml formatting
         try:
-            xmldoc = minidom.parseString(msg)
-        except xml.parsers.expat.ExpatError:
+            event = decode_event(msg)
+        except ParseError:
             _LOGGER.warning("ISY Received Malformed XML:\n" + msg)
             return
+        self.sequence.track(event)
+        if event.control == "_0":  # ISY HEARTBEAT
+            self._heartbeat_received(event)
+            return
+        if await self.event_queue.put((msg, event), state_event_key(event)):
+            self._end_queue_overflow()
+        elif not self._queue_overflow:
+            self._queue_overflow = True
+            _LOGGER.warning(
+                "PyISY event queue is full, discarding events until there is "
+                "room, then reloading the current state."
+            )
+
+    def _end_queue_overflow(self):
+        """Resync the state once the queue has room after discarding events."""
+        if self._queue_overflow and len(self.event_queue) < self.event_queue.maxsize:
+            self._queue_overflow = False
+            self.isy.resync()
+
+    def _heartbeat_received(self, event):
+        """Record a heartbeat from the ISY."""
+        if event.sid and self._sid is None:
+            self.update_received(event)
+        self._end_queue_overflow()
+        self._lasthb = now()
+        self._hbwait = int(event.action)
+        _LOGGER.debug("ISY HEARTBEAT: %s", self._lasthb.isoformat())
+        self.isy.connection_events.notify(self._status)
+
+    async def _route_event(self, item):
+        """Route a decoded (message, event) from the event stream."""
+        msg, event = item
         _LOGGER.log(LOG_VERBOSE, "ISY Update Received:\n" + msg)
 
         # A wild stream id appears!
-        if f"{ATTR_STREAM_ID}=" in msg and self._sid is None:
-            self.update_received(xmldoc)
+        if event.sid and self._sid is None:
+            self.update_received(event)
 
         # direct the event message
-        cntrl = value_from_xml(xmldoc, ATTR_CONTROL)
+        cntrl = event.control
         if not cntrl:
             return
-        if cntrl == "_0":  # ISY HEARTBEAT
-            self._lasthb = now()
-            self._hbwait = int(value_from_xml(xmldoc, ATTR_ACTION))
-            _LOGGER.debug("ISY HEARTBEAT: %s", self._lasthb.isoformat())
-            self.isy.connection_events.notify(self._status)
-        elif cntrl == PROP_STATUS:  # NODE UPDATE
-            self.isy.nodes.update_received(xmldoc)
+        if cntrl == PROP_STATUS:  # NODE UPDATE
+            self.isy.nodes.update_received(event)
         elif cntrl[0] != "_":  # NODE CONTROL EVENT
-            self.isy.nodes.control_message_received(xmldoc)
+            self.isy.nodes.control_message_received(event)
         elif cntrl == "_1":  # Trigger Update
-            if f"<{ATTR_VAR}" in msg:  # VARIABLE (action=6 or 7)
-                self.isy.variables.update_received(xmldoc)
-            elif f"<{ATTR_ID}>" in msg:  # PROGRAM (action=0)
-                self.isy.programs.update_received(xmldoc)
-            elif f"<{TAG_NODE}>" in msg and "[" in msg:  # Node Server Update
+            # Subsystems not loaded yet get their current state when loaded.
+            if event.info(ATTR_VAR) is not None:  # VARIABLE (action=6 or 7)
+                if SUBSYSTEM_VARIABLES in self.isy.loaded:
+                    self.isy.variables.update_received(event)
+            elif event.info(ATTR_ID) is not None:  # PROGRAM (action=0)
+                if SUBSYSTEM_PROGRAMS in self.isy.loaded:
+                    self.isy.programs.update_received(event)
+            elif event.node and "[" in (event.info_text or ""):  # Node Server Update
                 pass  # This is most likely a duplicate node update.
-            elif f"<{ATTR_ACTION}>" in msg:
-                action = value_from_xml(xmldoc, ATTR_ACTION)
-                if action == ACTION_KEY:
-                    self._program_key = value_from_xml(xmldoc, TAG_EVENT_INFO)
+            elif event.action is not None:
+                if event.action == ACTION_KEY:
+                    self._program_key = event.info_text
                     return
-                if action == ACTION_KEY_CHANGED:
-                    self._program_key = value_from_xml(xmldoc, TAG_NODE)
-                # Need to reload programs
-                await self.isy.programs.update()
+                if event.action == ACTION_KEY_CHANGED:
+                    self._program_key = event.node
+                # Need to reload programs, merged with any pending reload
+                if SUBSYSTEM_PROGRAMS in self.isy.loaded:
+                    self.isy.programs.refresh()
         elif cntrl == "_3":  # Node Changed/Updated
-            self.isy.nodes.node_changed_received(xmldoc)
+            self.isy.nodes.node_changed_received(event)
 
-    def update_received(self, xmldoc):
+    def update_received(self, event):
         """Set the socket ID."""
-        self._sid = attr_from_xml(xmldoc, "Event", ATTR_STREAM_ID)
+        self._sid = event.sid
         _LOGGER.debug("ISY Updated Events Stream ID: %s", self._sid)
 
     async def websocket(self, retries=0):
@@ -226,12 +296,17 @@ class WebSocketClient:
                 ssl=self.sslcontext,
             ) as ws:
                 self.status = ES_CONNECTED
+                self.sequence.reset()
                 retries = 0
                 _LOGGER.debug("Successfully connected to websocket.")
+                if self._reconcile_on_connect:
+                    # Catch up with the changes missed while disconnected.
+                    self._reconcile_on_connect = False
+                    self.isy.resync(0)
 
                 async for msg in ws:
                     if msg.type == aiohttp.WSMsgType.TEXT:
-                        await self._route_message(msg.data)
+                        await self._queue_message(msg.data)
                     elif msg.type == aiohttp.WSMsgType.BINARY:
                         _LOGGER.warning("Unexpected binary message received.")
                     elif msg.type == aiohttp.WSMsgType.ERROR:
@@ -1,7 +1,16 @@
 """Exceptions used by the PyISY module."""
+from xml.etree.ElementTree import ParseError
 from xml.parsers.expat import ExpatError
 
-XML_ERRORS = (AttributeError, KeyError, ValueError, TypeError, IndexError, ExpatError)
+XML_ERRORS = (
+    AttributeError,
+    KeyError,
+    ValueError,
+    TypeError,
+    IndexError,
+    ExpatError,
+    ParseError,
+)
 XML_PARSE_ERROR = "ISY Could not parse response, poorly formatted XML."
 
 
@@ -17,6 +26,15 @@ class ISYResponseParseError(Exception):
     """Error parsing a response provided by the ISY."""
 
 
+class ISYNotLoadedError(AttributeError):
+    """
+    A subsystem was used before it was loaded.
+
+    Subclasses `AttributeError`, so `hasattr` and `getattr` with a default
+    treat a subsystem that is still loading as missing the attribute.
+    """
+
+
 class ISYStreamDataError(Exception):
     """Invalid data in the isy event stream."""
 
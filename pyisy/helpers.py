@@ -1,6 +1,9 @@
 """Helper functions for the PyISY Module."""
+import asyncio
+from collections.abc import Mapping
 import datetime
 import time
+from xml.etree.ElementTree import tostring
 
 from .constants import (
     ATTR_FORMATTED,
@@ -22,16 +25,17 @@ from .constants import (
     TAG_MFG,
     TAG_PROPERTY,
     UOM_SECONDS,
+    UOM_STATES_TO_VALUE,
 )
 from .exceptions import XML_ERRORS
 
 
 def parse_xml_properties(xmldoc):
     """
-    Parse the xml properties string.
+    Parse the xml properties of a node.
 
     Args:
-        xmldoc: xml document to parse
+        xmldoc: ElementTree element containing the property tags
 
     Returns:
         (state_val, state_uom, state_prec, aux_props)
@@ -41,16 +45,12 @@ def parse_xml_properties(xmldoc):
     state_set = False
     state = NodeProperty(PROP_STATUS, uom=ISY_PROP_NOT_SET)
 
-    props = xmldoc.getElementsByTagName(TAG_PROPERTY)
-    if not props:
-        return state, aux_props
-
-    for prop in props:
-        prop_id = attr_from_element(prop, ATTR_ID)
-        uom = attr_from_element(prop, ATTR_UNIT_OF_MEASURE, DEFAULT_UNIT_OF_MEASURE)
-        value = attr_from_element(prop, ATTR_VALUE, "").strip()
-        prec = attr_from_element(prop, ATTR_PRECISION, DEFAULT_PRECISION)
-        formatted = attr_from_element(prop, ATTR_FORMATTED, value)
+    for prop in xmldoc.iter(TAG_PROPERTY):
+        prop_id = prop.get(ATTR_ID)
+        uom = prop.get(ATTR_UNIT_OF_MEASURE, DEFAULT_UNIT_OF_MEASURE)
+        value = prop.get(ATTR_VALUE, "").strip()
+        prec = prop.get(ATTR_PRECISION, DEFAULT_PRECISION)
+        formatted = prop.get(ATTR_FORMATTED, value)
 
         # ISY firmwares < 5 return a list of possible units.
         # ISYv5+ returns a UOM string which is checked against the SDK.
@@ -69,7 +69,7 @@ def parse_xml_properties(xmldoc):
             state = result
         else:
             if prop_id == PROP_RAMP_RATE:
-                result.value = INSTEON_RAMP_RATES.get(value, value)
+                result.value = INSTEON_RAMP_RATES.get(str(value), value)
                 result.uom = UOM_SECONDS
             aux_props[prop_id] = result
 
@@ -86,6 +86,12 @@ def value_from_xml(xml, tag_name, default=None):
     return value
 
 
+def value_from_element(element, tag_name, default=None):
+    """Extract the text of a direct child of an ElementTree element."""
+    value = element.findtext(tag_name)
+    return value if value else default
+
+
 def attr_from_xml(xml, tag_name, attr_name, default=None):
     """Extract an attribute value from the raw XML."""
     value = default
@@ -123,6 +129,19 @@ def value_from_nested_xml(base, chain, default=None):
     return value
 
 
+def state_to_value(uom, state):
+    """
+    Return the command value for a state name of a UOM, or None.
+
+    |  uom: The unit of measure, a key of `UOM_TO_STATES`.
+    |  state: The state name, e.g. "heat" for UOM 98.
+    """
+    states = UOM_STATES_TO_VALUE.get(uom)
+    if states is None:
+        return None
+    return states.get(state)
+
+
 def ntp_to_system_time(timestamp):
     """Convert a ISY NTP time to system UTC time.
 
@@ -159,22 +178,31 @@ def now():
 class EventEmitter:
     """Event Emitter class."""
 
+    __slots__ = ("_subscribers",)
+
     def __init__(self):
         """Initialize a new Event Emitter class."""
-        self._subscribers = []
+        # The list is only created once there is a subscriber.
+        self._subscribers = None
 
     def subscribe(self, callback):
         """Subscribe to the events."""
         listener = EventListener(self, callback)
+        if self._subscribers is None:
+            self._subscribers = []
         self._subscribers.append(listener)
         return listener
 
     def unsubscribe(self, listener):
         """Unsubscribe from the events."""
+        if self._subscribers is None:
+            raise ValueError("Listener is not subscribed.")
         self._subscribers.remove(listener)
 
     def notify(self, event):
         """Notify a listener."""
+        if not self._subscribers:
+            return
         for subscriber in self._subscribers:
             subscriber.callback(event)
 
@@ -182,6 +210,8 @@ class EventEmitter:
 class EventListener:
     """Event Listener class."""
 
+    __slots__ = ("_emitter", "callback")
+
     def __init__(self, emitter, callback):
         """Initialize a new Event Listener class."""
         self._emitter = emitter
@@ -192,8 +222,69 @@ class EventListener:
         self._emitter.unsubscribe(self)
 
 
-class NodeProperty(dict):
-    """Class to hold result of a control event or node aux property."""
+class Debouncer:
+    """
+    Merge the requests made within a delay into a single call.
+
+    The first request schedules the call after the delay, and requests made
+    before the call starts are merged into it. The keys given with the
+    requests (e.g. addresses) are collected and passed to the call.
+
+    |  callback: Coroutine function called with the set of requested keys,
+       which includes None if a request was made without a key.
+
+    :ivar task: The task of the pending call, None if there is none.
+    """
+
+    __slots__ = ("_callback", "_keys", "task")
+
+    def __init__(self, callback):
+        """Initialize a Debouncer class."""
+        self._callback = callback
+        self._keys = set()
+        self.task = None
+
+    def request(self, key=None, wait_time=0):
+        """
+        Request a call, merged with the pending one.
+
+        |  key: [optional] The key to pass to the call.
+        |  wait_time: [optional] Seconds to wait for more requests to merge,
+           if no call is pending.
+
+        Returns the task performing the call.
+        """
+        self._keys.add(key)
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self._run(wait_time))
+        return self.task
+
+    def cancel(self):
+        """Cancel the pending call."""
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        self._keys = set()
+
+    async def _run(self, wait_time):
+        """Wait for the requests to merge and perform the call."""
+        await asyncio.sleep(wait_time)
+        keys = self._keys
+        self._keys = set()
+        self.task = None
+        await self._callback(keys)
+
+
+class NodeProperty(Mapping):
+    """
+    Class to hold result of a control event or node aux property.
+
+    A slotted record which can also be used as a read/write mapping with
+    the keys control, value, prec, uom, formatted and address. It is not a
+    `dict`; use `_asdict()` for a plain dict, e.g. to serialize it to JSON.
+    """
+
+    __slots__ = ("control", "value", "prec", "uom", "formatted", "address")
 
     def __init__(
         self,
@@ -205,45 +296,41 @@ class NodeProperty(dict):
         address=None,
     ):
         """Initialize an control result or aux property."""
-        super().__init__(
-            self,
-            control=control,
-            value=value,
-            prec=prec,
-            uom=uom,
-            formatted=(formatted if formatted is not None else value),
-            address=address,
-        )
-
-    @property
-    def address(self):
-        """Report the address of the node with this property."""
-        return self["address"]
-
-    @property
-    def control(self):
-        """Report the event control string."""
-        return self["control"]
-
-    @property
-    def value(self):
-        """Report the value, if there was one."""
-        return self["value"]
-
-    @property
-    def prec(self):
-        """Report the precision, if there was one."""
-        return self["prec"]
-
-    @property
-    def uom(self):
-        """Report the unit of measure, if there was one."""
-        return self["uom"]
-
-    @property
-    def formatted(self):
-        """Report the formatted value, if there was one."""
-        return self["formatted"]
+        self.control = control
+        self.value = value
+        self.prec = prec
+        self.uom = uom
+        self.formatted = formatted if formatted is not None else value
+        self.address = address
+
+    def __getitem__(self, key):
+        """Return a property by key."""
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        """Set a property by key."""
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self):
+        """Iterate through the property keys."""
+        return iter(self.__slots__)
+
+    def __len__(self):
+        """Return the number of property keys."""
+        return len(self.__slots__)
+
+    def _asdict(self):
+        """Return the property as a new dict."""
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def update(self, *args, **kwargs):
+        """Set several properties, like `dict.update`."""
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
 
     def __str__(self):
         """Return just the event title to prevent breaking changes."""
@@ -255,14 +342,6 @@ class NodeProperty(dict):
 
     __repr__ = __str__
 
-    def __getattr__(self, name):
-        """Retrieve the properties."""
-        return self[name]
-
-    def __setattr__(self, name, value):
-        """Allow setting of properties."""
-        self[name] = value
-
 
 class ZWaveProperties(dict):
     """Class to hold Z-Wave Product Details from a Z-Wave Node."""
@@ -280,11 +359,11 @@ class ZWaveProperties(dict):
         product_id = 0
         self._raw = ""
 
-        if xml:
-            category = value_from_xml(xml, TAG_CATEGORY)
-            devtype_mfg = value_from_xml(xml, TAG_MFG)
-            devtype_gen = value_from_xml(xml, TAG_GENERIC)
-            self._raw = xml.toxml()
+        if xml is not None:
+            category = value_from_element(xml, TAG_CATEGORY)
+            devtype_mfg = value_from_element(xml, TAG_MFG)
+            devtype_gen = value_from_element(xml, TAG_GENERIC)
+            self._raw = tostring(xml, encoding="unicode")
         if devtype_gen:
             (basic_type, generic_type, specific_type) = devtype_gen.split(".")
         if devtype_mfg:
@@ -348,6 +427,11 @@ class ZWaveProperties(dict):
         """Return the Z-Wave Product ID Property."""
         return self["product_id"]
 
+    @property
+    def raw(self):
+        """Return the original raw xml string from the ISY."""
+        return self._raw
+
     def __str__(self):
         """Return just the original raw xml string from the ISY."""
         return f"ZWaveProperties({self._raw})"
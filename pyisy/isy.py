@@ -1,8 +1,10 @@
 """Module for connecting to and interacting with the ISY."""
 import asyncio
+from functools import partial
 import logging
-from threading import Thread
+import time
 
+from .cache import CACHE_VERSION, read_cache, write_cache
 from .clock import Clock
 from .configuration import Configuration
 from .connection import Connection
@@ -14,20 +16,38 @@ from .constants import (
     ES_RECONNECTING,
     ES_START_UPDATES,
     ES_STOP_UPDATES,
+    LAZY_SUBSYSTEMS,
     LOG_DATE_FORMAT,
     LOG_FORMAT,
     LOG_LEVEL,
+    POLL_TIME,
+    RESYNC_DELAY,
+    SUBSYSTEM_NETWORKING,
+    SUBSYSTEM_NODES,
+    SUBSYSTEM_PROGRAMS,
+    SUBSYSTEM_VARIABLES,
+    SUBSYSTEMS,
+    TAG_NODE,
     URL_QUERY,
     X10_COMMANDS,
 )
 from .events.tcpsocket import EventStream
 from .events.websocket import WebSocketClient
-from .helpers import EventEmitter
+from .exceptions import ISYResponseParseError
+from .helpers import Debouncer, EventEmitter, now
+from .lazy import LazySubsystem
 from .networking import NetworkResources
 from .nodes import Nodes
 from .programs import Programs
+from .startup import StartupReport, parsing
 from .variables import Variables
 
+SUBSYSTEM_MANAGERS = {
+    SUBSYSTEM_PROGRAMS: Programs,
+    SUBSYSTEM_VARIABLES: Variables,
+    SUBSYSTEM_NETWORKING: NetworkResources,
+}
+
 
 class ISY:
     """
@@ -40,6 +60,15 @@ class ISY:
     |  use_https: [optional] Boolean of whether secured HTTP should be used
     |  tls_ver: [optional] Number indicating the version of TLS encryption to
        use. Valid options are 1.1 or 1.2.
+    |  min_connections: [optional] The lowest number of concurrent requests
+       the adaptive limit can be lowered to.
+    |  max_connections: [optional] The highest number of concurrent requests
+       the adaptive limit can be raised to.
+    |  cache_path: [optional] Path of a file to cache the inventory (nodes,
+       programs, variables and network resources) in. When the cache is
+       valid for the controller, `initialize` loads the inventory from it
+       and only fetches the node status; the inventory is then refreshed
+       from the controller in the background and the cache saved again.
 
     :ivar auto_reconnect: Boolean value that indicates if the class should
                           auto-reconnect to the event stream if the connection
@@ -54,6 +83,11 @@ class ISY:
     :ivar programs: Program manager that interacts with ISY programs and i
                     folders.
     :ivar variables: Variable manager that interacts with ISY variables.
+    :ivar loaded: Set of the subsystems which are loaded, the programs,
+                  variables and networking are placeholders until loaded.
+    :ivar startup_report: :class:`pyisy.startup.StartupReport` of the time,
+                          bytes received, parse time and objects loaded in
+                          each phase of the last `initialize`.
     """
 
     auto_reconnect = True
@@ -69,11 +103,20 @@ class ISY:
         webroot="",
         websession=None,
         use_websocket=False,
+        min_connections=1,
+        max_connections=None,
+        cache_path=None,
     ):
         """Initialize the primary ISY Class."""
         self._events = None  # create this JIT so no socket reuse
-        self._reconnect_thread = None
+        self._reconnect_task = None
+        self._resyncer = Debouncer(self._resync)
+        self._cache_task = None
+        self.cache_path = cache_path
         self._connected = False
+        self.reconcile_metrics = None
+        self.loaded = set()
+        self.startup_report = None
 
         if not len(_LOGGER.handlers):
             logging.basicConfig(
@@ -91,6 +134,8 @@ class ISY:
             tls_ver=tls_ver,
             webroot=webroot,
             websession=websession,
+            min_connections=min_connections,
+            max_connections=max_connections,
         )
 
         self.websocket = None
@@ -117,39 +162,260 @@ class ISY:
         self.connection_events = EventEmitter()
         self.loop = asyncio.get_running_loop()
 
-    async def initialize(self):
-        """Initialize the connection with the ISY."""
-        config_xml = await self.conn.test_connection()
-        self.configuration = Configuration(xml=config_xml)
-
-        isy_setup_tasks = [
-            self.conn.get_status(),
-            self.conn.get_time(),
-            self.conn.get_nodes(),
-            self.conn.get_programs(),
-            self.conn.get_variable_defs(),
-            self.conn.get_variables(),
+    async def initialize(self, load=None):
+        """
+        Initialize the connection with the ISY.
+
+        |  load: [optional] The subsystems to load now, from `SUBSYSTEMS`.
+           The nodes, their status and the clock are always loaded. The
+           others (`LAZY_SUBSYSTEMS`) which are not listed are left as a
+           :class:`pyisy.lazy.LazySubsystem` placeholder and loaded on first
+           use, e.g. `await isy.programs`. All are loaded if not given.
+        """
+        load = set(SUBSYSTEMS if load is None else load)
+        unknown = load.difference(SUBSYSTEMS)
+        if unknown:
+            raise ValueError(f"Invalid subsystems: {', '.join(sorted(unknown))}")
+
+        report = StartupReport()
+        self.startup_report = report
+        with report.phase("configuration"):
+            config_xml = await self.conn.test_connection()
+            with parsing():
+                self.configuration = Configuration(xml=config_xml)
+
+        self.loaded = set()
+        for name in LAZY_SUBSYSTEMS:
+            setattr(self, name, LazySubsystem(name, self._load_subsystem))
+        if not self.configuration["Networking Module"]:
+            self.networking = None
+        eager = [
+            name
+            for name in LAZY_SUBSYSTEMS
+            if name in load and getattr(self, name) is not None
         ]
-        if self.configuration["Networking Module"]:
-            isy_setup_tasks.append(asyncio.create_task(self.conn.get_network()))
-        isy_setup_results = await asyncio.gather(*isy_setup_tasks)
-
-        self.clock = Clock(self, xml=isy_setup_results[1])
-        self.nodes = Nodes(self, xml=isy_setup_results[2])
-        self.programs = Programs(self, xml=isy_setup_results[3])
-        self.variables = Variables(
-            self, def_xml=isy_setup_results[4], var_xml=isy_setup_results[5],
+
+        if self.cache_path is not None:
+            with report.phase("cache"), parsing():
+                cache = await self.loop.run_in_executor(
+                    None, read_cache, self.cache_path, self.configuration
+                )
+            if cache is not None and all(name in cache for name in eager):
+                await self._initialize_from_cache(cache, eager)
+                self._connected = True
+                self._finish_startup("cache")
+                return
+
+        # Nodes and their status are parsed while the responses arrive.
+        self.nodes = Nodes(self)
+        await asyncio.gather(
+            report.run(
+                SUBSYSTEM_NODES,
+                self.nodes.update_nodes(),
+                partial(self._startup_count, SUBSYSTEM_NODES),
+            ),
+            report.run(
+                "status", self.nodes.update(), partial(self._startup_count, "status")
+            ),
+            report.run("clock", self._load_clock()),
+            *[
+                report.run(name, self.load(name), partial(self._startup_count, name))
+                for name in eager
+            ],
         )
-        if self.configuration["Networking Module"]:
-            self.networking = NetworkResources(self, xml=isy_setup_results[6])
-        await self.nodes.update(xml=isy_setup_results[0])
+        self.loaded.add(SUBSYSTEM_NODES)
 
+        if self.cache_path is not None:
+            self._cache_task = self.loop.create_task(self.save_cache())
         self._connected = True
+        self._finish_startup("controller")
+
+    def _finish_startup(self, source):
+        """Complete the startup report."""
+        self.startup_report.finish(source)
+        _LOGGER.debug(
+            "ISY startup from the %s took %.3fs:\n%s",
+            source,
+            self.startup_report.duration,
+            self.startup_report.format(),
+        )
+
+    def _startup_count(self, name):
+        """Return the number of objects of a startup phase, for the report."""
+        if name == SUBSYSTEM_NODES:
+            return len(self.nodes.addresses)
+        if name == "status":
+            return sum(1 for ntype in self.nodes.ntypes if ntype == TAG_NODE)
+        if name == SUBSYSTEM_VARIABLES:
+            return sum(len(vids) for vids in self.variables.vids.values())
+        return len(getattr(self, name).addresses)
+
+    async def _load_clock(self):
+        """Fetch the clock of the ISY."""
+        time_xml = await self.conn.get_time()
+        with parsing():
+            self.clock = Clock(self, xml=time_xml)
+
+    async def load(self, name):
+        """
+        Load a subsystem now, if it is not loaded yet.
+
+        |  name: The subsystem to load, one of `LAZY_SUBSYSTEMS`.
+
+        Returns the subsystem.
+        """
+        subsystem = getattr(self, name)
+        if isinstance(subsystem, LazySubsystem):
+            return await subsystem
+        return subsystem
+
+    async def _load_subsystem(self, name):
+        """Fetch a subsystem from the controller and replace its placeholder."""
+        if name == SUBSYSTEM_PROGRAMS:
+            xml = await self.conn.get_programs()
+            with parsing():
+                subsystem = Programs(self, xml=xml)
+        elif name == SUBSYSTEM_VARIABLES:
+            def_xml, var_xml = await asyncio.gather(
+                self.conn.get_variable_defs(), self.conn.get_variables()
+            )
+            with parsing():
+                subsystem = Variables(self, def_xml=def_xml, var_xml=var_xml)
+        else:
+            xml = await self.conn.get_network()
+            with parsing():
+                subsystem = NetworkResources(self, xml=xml)
+        setattr(self, name, subsystem)
+        self.loaded.add(name)
+        if self._connected and self.cache_path is not None:
+            # Include the newly loaded subsystem in the cache.
+            if self._cache_task is None or self._cache_task.done():
+                self._cache_task = self.loop.create_task(self.save_cache())
+        return subsystem
+
+    async def _initialize_from_cache(self, cache, load):
+        """Load the inventory from the cache and fetch the current state."""
+        report = self.startup_report
+        with report.phase(SUBSYSTEM_NODES) as phase, parsing():
+            self.nodes = Nodes(self)
+            self.nodes.load_cache(cache[SUBSYSTEM_NODES])
+            phase.count = self._startup_count(SUBSYSTEM_NODES)
+        self.loaded.add(SUBSYSTEM_NODES)
+        for name in load:
+            with report.phase(name) as phase, parsing():
+                subsystem = SUBSYSTEM_MANAGERS[name](self)
+                subsystem.load_cache(cache[name])
+                setattr(self, name, subsystem)
+                phase.count = self._startup_count(name)
+            self.loaded.add(name)
+
+        await asyncio.gather(
+            report.run(
+                "status", self.nodes.update(), partial(self._startup_count, "status")
+            ),
+            report.run("clock", self._load_clock()),
+        )
+        _LOGGER.info("ISY loaded the inventory from the cache %s", self.cache_path)
+        self._cache_task = self.loop.create_task(self._validate_cache())
+
+    async def _validate_cache(self):
+        """
+        Refresh the inventory loaded from the cache from the controller.
+
+        Only the differences are applied. Items which no longer exist on the
+        controller are removed, and the cache is saved again.
+        """
+        loaded = self.loaded
+        tasks = {SUBSYSTEM_NODES: self.nodes.update_nodes()}
+        if SUBSYSTEM_PROGRAMS in loaded:
+            tasks[SUBSYSTEM_PROGRAMS] = self.conn.get_programs()
+        if SUBSYSTEM_VARIABLES in loaded:
+            tasks["variable_defs"] = self.conn.get_variable_defs()
+            tasks[SUBSYSTEM_VARIABLES] = self.conn.get_variables()
+        if SUBSYSTEM_NETWORKING in loaded:
+            tasks[SUBSYSTEM_NETWORKING] = self.conn.get_network()
+
+        stale = {}
+        try:
+            results = dict(zip(tasks, await asyncio.gather(*tasks.values())))
+
+            if results[SUBSYSTEM_NODES] is not None:
+                stale[SUBSYSTEM_NODES] = (
+                    set(self.nodes.addresses) - results[SUBSYSTEM_NODES]
+                )
+            if results.get(SUBSYSTEM_PROGRAMS) is not None:
+                received = self.programs.parse(results[SUBSYSTEM_PROGRAMS])
+                stale[SUBSYSTEM_PROGRAMS] = set(self.programs.addresses) - received
+            if SUBSYSTEM_VARIABLES in loaded:
+                defs = results["variable_defs"]
+                if defs is not None:
+                    defined = self.variables.parse_definitions(
+                        [xml if isinstance(xml, str) else None for xml in defs]
+                    )
+                    # Types whose definitions could not be read are kept.
+                    stale[SUBSYSTEM_VARIABLES] = {
+                        (vtype, vid)
+                        for vtype, vids in defined.items()
+                        if vids is not None
+                        for vid in self.variables.vids[vtype]
+                        if vid not in vids
+                    }
+                if results[SUBSYSTEM_VARIABLES]:
+                    self.variables.parse(results[SUBSYSTEM_VARIABLES])
+            if results.get(SUBSYSTEM_NETWORKING) is not None:
+                self.networking.parse(results[SUBSYSTEM_NETWORKING])
+        except ISYResponseParseError:
+            _LOGGER.warning("ISY could not validate the inventory from the cache")
+            return
+
+        if any(stale.values()):
+            _LOGGER.info(
+                "ISY removed %s node(s), %s program(s) and %s variable(s) "
+                "from the cache which no longer exist",
+                len(stale.get(SUBSYSTEM_NODES, ())),
+                len(stale.get(SUBSYSTEM_PROGRAMS, ())),
+                len(stale.get(SUBSYSTEM_VARIABLES, ())),
+            )
+            for name, items in stale.items():
+                getattr(self, name).remove(items)
+        _LOGGER.info("ISY validated the inventory from the cache")
+        await self.save_cache()
+
+    async def save_cache(self, exclude=None):
+        """
+        Save the inventory to the cache file, if one is set.
+
+        Only the subsystems which are loaded are saved.
+
+        |  exclude: [optional] Dict of the items of each subsystem to leave
+           out of the cache, by subsystem name.
+        """
+        if self.cache_path is None:
+            return
+        exclude = exclude or {}
+        data = {
+            "version": CACHE_VERSION,
+            "uuid": self.configuration["uuid"],
+            "firmware": self.configuration["firmware"],
+            "saved": now().isoformat(),
+        }
+        for name in SUBSYSTEMS:
+            if name in self.loaded:
+                data[name] = getattr(self, name).to_cache(exclude.get(name, ()))
+        try:
+            await self.loop.run_in_executor(None, write_cache, self.cache_path, data)
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Could not save the ISY cache %s: %s", self.cache_path, err)
 
     async def shutdown(self):
         """Cleanup connections and prepare for exit."""
         if self.websocket is not None:
             self.websocket.stop()
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        self._resyncer.cancel()
+        if self._cache_task is not None:
+            self._cache_task.cancel()
         if self._events is not None and self._events.running:
             self.connection_events.notify(ES_STOP_UPDATES)
             self._events.running = False
@@ -196,32 +462,92 @@ class ISY:
         del self._events
         self._events = None
 
-        if self.auto_reconnect and self._reconnect_thread is None:
+        if self.auto_reconnect and self._reconnect_task is None:
             # attempt to reconnect
-            self._reconnect_thread = Thread(target=self._auto_reconnecter)
-            self._reconnect_thread.daemon = True
-            self._reconnect_thread.start()
+            self._reconnect_task = self.loop.create_task(self._auto_reconnecter())
 
-    def _auto_reconnecter(self):
+    async def _auto_reconnecter(self):
         """Auto-reconnect to the event stream."""
-        while self.auto_reconnect and not self.auto_update:
-            _LOGGER.warning("PyISY attempting stream reconnect.")
-            del self._events
-            self._events = EventStream(
-                self, self.conn.connection_info, self._on_lost_event_stream
-            )
-            self._events.running = True
-            self.connection_events.notify(ES_RECONNECTING)
-
-        if not self.auto_update:
-            del self._events
-            self._events = None
-            _LOGGER.warning("PyISY could not reconnect to the event stream.")
-            self.connection_events.notify(ES_RECONNECT_FAILED)
-        else:
-            _LOGGER.warning("PyISY reconnected to the event stream.")
+        try:
+            while self.auto_reconnect and not self.auto_update:
+                _LOGGER.warning("PyISY attempting stream reconnect.")
+                events = EventStream(
+                    self, self.conn.connection_info, self._on_lost_event_stream
+                )
+                self._events = events
+                self.connection_events.notify(ES_RECONNECTING)
+                if await events.start():
+                    # Catch up with the changes missed while disconnected.
+                    self.resync(0)
+                    break
+                await asyncio.sleep(POLL_TIME)
 
-        self._reconnect_thread = None
+            if not self.auto_update:
+                self._events = None
+                _LOGGER.warning("PyISY could not reconnect to the event stream.")
+                self.connection_events.notify(ES_RECONNECT_FAILED)
+            else:
+                _LOGGER.warning("PyISY reconnected to the event stream.")
+        finally:
+            self._reconnect_task = None
+
+    def resync(self, wait_time=RESYNC_DELAY):
+        """
+        Schedule a reload of the node status and the variable values.
+
+        Used when events from the event stream were missed or after it
+        reconnects. Requests made before the reload starts are merged into
+        one.
+
+        |  wait_time: [optional] Seconds to wait for more requests to merge.
+
+        Returns the task performing the reload.
+        """
+        return self._resyncer.request(wait_time=wait_time)
+
+    async def _resync(self, _keys):
+        """Reload the node status and the variable values."""
+        await self.reconcile()
+
+    async def reconcile(self):
+        """
+        Bring the node status and the variable values up to date.
+
+        Fetches /rest/status and the variables, and applies only what
+        differs from the current state, notifying the listeners of each
+        changed node or variable once. Used after the event stream
+        reconnects or missed events.
+
+        Returns a dict of the number of changed nodes and variables and the
+        time each took, also kept in `reconcile_metrics`.
+        """
+        start = time.monotonic()
+
+        async def timed(reconcile):
+            begin = time.monotonic()
+            changed = await reconcile
+            return changed, time.monotonic() - begin
+
+        tasks = {}
+        if self.nodes is not None:
+            tasks["nodes"] = timed(self.nodes.reconcile())
+        if SUBSYSTEM_VARIABLES in self.loaded:
+            tasks["variables"] = timed(self.variables.reconcile())
+        results = await asyncio.gather(*tasks.values())
+
+        metrics = {"time": now()}
+        for name, (changed, duration) in zip(tasks, results):
+            metrics[f"{name}_changed"] = changed
+            metrics[f"{name}_duration"] = duration
+        metrics["duration"] = time.monotonic() - start
+        self.reconcile_metrics = metrics
+        _LOGGER.info(
+            "ISY reconciled %s node(s) and %s variable(s) in %.3fs",
+            metrics.get("nodes_changed"),
+            metrics.get("variables_changed"),
+            metrics["duration"],
+        )
+        return metrics
 
     async def query(self, address=None):
         """Query all the nodes (or a specific node if an address is provided)."""
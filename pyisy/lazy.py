@@ -0,0 +1,78 @@
+"""Placeholders for subsystems which are loaded on first use."""
+import asyncio
+
+from .exceptions import ISYNotLoadedError
+
+
+class LazySubsystem:
+    """
+    Placeholder for a subsystem (e.g. the programs) which is not loaded yet.
+
+    Awaiting the placeholder loads the subsystem and returns it, e.g.
+    `programs = await isy.programs`. Once loaded, the ISY attribute is the
+    subsystem itself, and the placeholder passes attribute and item access
+    on to it for any references still held.
+
+    Using the placeholder before the subsystem is loaded starts loading it
+    in the background and raises `ISYNotLoadedError` (an `AttributeError`),
+    since it cannot wait for the controller without blocking the event loop.
+
+    |  name: The name of the subsystem, one of `LAZY_SUBSYSTEMS`.
+    |  loader: Coroutine function which loads the subsystem and returns it.
+    """
+
+    __slots__ = ("_loader", "_name", "_target", "_task")
+
+    def __init__(self, name, loader):
+        """Initialize a LazySubsystem class."""
+        self._loader = loader
+        self._name = name
+        self._target = None
+        self._task = None
+
+    def __repr__(self):
+        """Return a string representation of the placeholder."""
+        if self._target is not None:
+            return repr(self._target)
+        return f"LazySubsystem({self._name}, not loaded)"
+
+    @property
+    def loaded(self):
+        """Return if the subsystem is loaded."""
+        return self._target is not None
+
+    def load(self):
+        """Start loading the subsystem, if needed. Returns the loading task."""
+        if self._task is None or (self._task.done() and self._target is None):
+            self._task = asyncio.get_running_loop().create_task(self._load())
+        return self._task
+
+    async def _load(self):
+        """Load the subsystem."""
+        self._target = await self._loader(self._name)
+        return self._target
+
+    def __await__(self):
+        """Load the subsystem and return it."""
+        return self.load().__await__()
+
+    def _require(self):
+        """Return the subsystem, or start loading it and raise."""
+        if self._target is None:
+            self.load()
+            raise ISYNotLoadedError(
+                f"The {self._name} are loading, await isy.{self._name} first."
+            )
+        return self._target
+
+    def __getattr__(self, attr):
+        """Pass attribute access on to the subsystem."""
+        return getattr(self._require(), attr)
+
+    def __getitem__(self, key):
+        """Pass item access on to the subsystem."""
+        return self._require()[key]
+
+    def __iter__(self):
+        """Iterate through the subsystem."""
+        return iter(self._require())
@@ -1,6 +1,5 @@
 """ISY Network Resources Module."""
 from asyncio import sleep
-from xml.dom import minidom
 
 from .constants import (
     _LOGGER,
@@ -11,7 +10,8 @@ from .constants import (
     URL_RESOURCES,
 )
 from .exceptions import XML_ERRORS, XML_PARSE_ERROR, ISYResponseParseError
-from .helpers import value_from_xml
+from .helpers import value_from_element
+from .parsing import iterparse
 
 
 class NetworkResources:
@@ -62,22 +62,43 @@ class NetworkResources:
         xml: String of the xml data
         """
         try:
-            xmldoc = minidom.parseString(xml)
+            for feature in iterparse(xml, (TAG_NET_RULE,)):
+                address = int(value_from_element(feature, ATTR_ID))
+                if address not in self.addresses:
+                    nname = value_from_element(feature, TAG_NAME)
+                    nobj = NetworkCommand(self, address)
+                    self.addresses.append(address)
+                    self.nnames.append(nname)
+                    self.nobjs.append(nobj)
         except XML_ERRORS:
             _LOGGER.error("%s: NetworkResources", XML_PARSE_ERROR)
             raise ISYResponseParseError(XML_PARSE_ERROR)
 
-        features = xmldoc.getElementsByTagName(TAG_NET_RULE)
-        for feature in features:
-            address = int(value_from_xml(feature, ATTR_ID))
+        _LOGGER.info("ISY Loaded Network Resources Commands")
+
+    def to_cache(self, exclude=()):
+        """
+        Return the network commands as a list of [id, name] for the cache.
+
+        |  exclude: [optional] The ids of the network commands to leave out.
+        """
+        return [
+            [address, name]
+            for address, name in zip(self.addresses, self.nnames)
+            if address not in exclude
+        ]
+
+    def load_cache(self, items):
+        """
+        Add the network commands from the inventory cache.
+
+        |  items: List of [id, name] from `to_cache`.
+        """
+        for address, nname in items:
             if address not in self.addresses:
-                nname = value_from_xml(feature, TAG_NAME)
-                nobj = NetworkCommand(self, address)
                 self.addresses.append(address)
                 self.nnames.append(nname)
-                self.nobjs.append(nobj)
-
-        _LOGGER.info("ISY Loaded Network Resources Commands")
+                self.nobjs.append(NetworkCommand(self, address))
 
     async def update(self, wait_time=0):
         """
@@ -1,17 +1,13 @@
 """Representation of ISY Nodes."""
-from asyncio import sleep
-from xml.dom import minidom
+from asyncio import gather, sleep
+from xml.etree.ElementTree import fromstring
 
 from ..constants import (
     _LOGGER,
-    ATTR_ACTION,
-    ATTR_CONTROL,
     ATTR_FLAG,
     ATTR_ID,
     ATTR_INSTANCE,
     ATTR_NODE_DEF_ID,
-    ATTR_PRECISION,
-    ATTR_UNIT_OF_MEASURE,
     DEFAULT_PRECISION,
     DEFAULT_UNIT_OF_MEASURE,
     EVENT_PROPS_IGNORED,
@@ -22,7 +18,9 @@ from ..constants import (
     INSTEON_RAMP_RATES,
     ISY_VALUE_UNKNOWN,
     NC_NODE_ERROR,
+    NC_RENAME_ACTIONS,
     NODE_CHANGED_ACTIONS,
+    NODE_FAMILY_ID,
     PROP_COMMS_ERROR,
     PROP_RAMP_RATE,
     PROP_STATUS,
@@ -30,33 +28,94 @@ from ..constants import (
     PROTO_NODE_SERVER,
     PROTO_ZIGBEE,
     PROTO_ZWAVE,
+    REFRESH_BULK_THRESHOLD,
     TAG_ADDRESS,
     TAG_DEVICE_TYPE,
     TAG_ENABLED,
     TAG_FAMILY,
     TAG_FOLDER,
-    TAG_FORMATTED,
     TAG_GROUP,
     TAG_LINK,
     TAG_NAME,
+    TAG_NEW_NAME,
     TAG_NODE,
     TAG_PARENT,
     TAG_PRIMARY_NODE,
     TAG_TYPE,
     UOM_SECONDS,
+    UPDATE_INTERVAL,
     XML_TRUE,
 )
 from ..exceptions import XML_ERRORS, XML_PARSE_ERROR, ISYResponseParseError
 from ..helpers import (
+    Debouncer,
     NodeProperty,
     ZWaveProperties,
-    attr_from_element,
-    attr_from_xml,
     parse_xml_properties,
-    value_from_xml,
+    value_from_element,
 )
+from ..parsing import ElementStream, iterparse
 from .group import Group
 from .node import Node
+from .registry import NodeRegistry
+from .statestore import StateStore
+
+NODE_TAGS = (TAG_FOLDER, TAG_NODE, TAG_GROUP)
+NODE_LEAF_TYPES = (TAG_GROUP, TAG_NODE)
+FAMILY_ID_BY_NAME = {name: family_id for family_id, name in NODE_FAMILY_ID.items()}
+
+
+def group_links(feature):
+    """Return the members and controllers of a group element from /rest/nodes."""
+    links = list(feature.iter(TAG_LINK))
+    members = [link.text for link in links]
+    controllers = [link.text for link in links if int(link.get(TAG_TYPE, 0)) == 16]
+    return members, controllers
+
+
+def node_details(feature):
+    """
+    Return the attributes of a node element from /rest/nodes.
+
+    Returns a dict of the `Node` arguments other than its name and state.
+    """
+    family = value_from_element(feature, TAG_FAMILY)
+    # Assume Insteon, update as confirmed otherwise
+    protocol = PROTO_INSTEON
+    zwave_props = None
+    node_server = None
+    if family is not None:
+        if family == FAMILY_ZWAVE:
+            protocol = PROTO_ZWAVE
+            zwave_props = ZWaveProperties(feature.find(TAG_DEVICE_TYPE))
+        elif family in (FAMILY_BRULTECH, FAMILY_RCS):
+            protocol = PROTO_ZIGBEE
+        elif family == FAMILY_NODESERVER:
+            # Node Server Slot is stored with family as text:
+            node_server = feature.find(TAG_FAMILY).get(ATTR_INSTANCE)
+            if node_server:
+                protocol = f"{PROTO_NODE_SERVER}_{node_server}"
+    return {
+        "zwave_props": zwave_props,
+        "node_def_id": feature.get(ATTR_NODE_DEF_ID),
+        "pnode": value_from_element(feature, TAG_PRIMARY_NODE),
+        "device_type": value_from_element(feature, TAG_TYPE),
+        "enabled": value_from_element(feature, TAG_ENABLED) == XML_TRUE,
+        "node_server": node_server,
+        "protocol": protocol,
+        "family_id": family,
+    }
+
+
+def property_to_cache(prop):
+    """Return a NodeProperty as a list for the inventory cache."""
+    return [prop.value, prop.prec, prop.uom, prop.formatted]
+
+
+def property_from_cache(control, data, address=None):
+    """Return a NodeProperty from its inventory cache list."""
+    value, prec, uom, formatted = data
+    return NodeProperty(control, value, prec, uom, formatted, address)
 
 
 class Nodes:
@@ -70,58 +129,95 @@ class Nodes:
 
     |  isy: ISY class
     |  root: [optional] String representing the current navigation level's ID
-    |  addresses: [optional] list of node ids
-    |  nnames: [optional] list of node names
-    |  nparents: [optional] list of node parents
-    |  nobjs: [optional] list of node objects
-    |  ntypes: [optional] list of node types
+    |  registry: [optional] NodeRegistry shared with the parent navigation level
     |  xml: [optional] String of xml data containing the configuration data
 
     :ivar all_lower_nodes: Return all nodes beneath current level
     :ivar children: A list of the object's children.
     :ivar has_children: Indicates if object has children
     :ivar name: The name of the current folder in navigation.
+    :ivar addresses: Read-only list view of the node ids.
+    :ivar nnames: Read-only list view of the node names.
+    :ivar nparents: Read-only list view of the node parents.
+    :ivar nobjs: Read-only list view of the node objects.
+    :ivar ntypes: Read-only list view of the node types.
     """
 
-    def __init__(
-        self,
-        isy,
-        root=None,
-        addresses=None,
-        nnames=None,
-        nparents=None,
-        nobjs=None,
-        ntypes=None,
-        xml=None,
-    ):
+    def __init__(self, isy, root=None, registry=None, xml=None):
         """Initialize the Nodes ISY Node Manager class."""
         self.isy = isy
         self.root = root
-
-        self.addresses = []
-        self.nnames = []
-        self.nparents = []
-        self.nobjs = []
-        self.ntypes = []
+        self._registry = registry if registry is not None else NodeRegistry()
+        self._pending_status = None
+        self._refresher = Debouncer(self._refresh)
 
         if xml is not None:
             self.parse(xml)
-            return
 
-        self.addresses = addresses
-        self.nnames = nnames
-        self.nparents = nparents
-        self.nobjs = nobjs
-        self.ntypes = ntypes
+    @property
+    def state_store(self):
+        """Return the StateStore of the node states, or None if not enabled."""
+        return self._registry.state_store
+
+    def enable_state_store(self):
+        """
+        Keep the state of every node in a columnar StateStore.
+
+        The store is shared by the whole node tree and is updated as the
+        node states change. Returns the store.
+        """
+        registry = self._registry
+        if registry.state_store is None:
+            store = StateStore(max(len(registry.entries), 1))
+            for entry in registry.entries:
+                if entry.ntype == TAG_NODE and entry.obj is not None:
+                    store.add(entry.obj)
+            registry.state_store = store
+        return registry.state_store
+
+    def snapshot(self, copy=False):
+        """
+        Return a snapshot of the state of every node from the StateStore.
+
+        See `StateStore.snapshot`. Enables the store if needed.
+
+        |  copy: [optional] Return copies of the columns instead of views.
+        """
+        return self.enable_state_store().snapshot(copy)
+
+    @property
+    def addresses(self):
+        """Return a read-only view of the node ids."""
+        return self._registry.addresses
+
+    @property
+    def nnames(self):
+        """Return a read-only view of the node names."""
+        return self._registry.names
+
+    @property
+    def nparents(self):
+        """Return a read-only view of the node parents."""
+        return self._registry.parents
+
+    @property
+    def nobjs(self):
+        """Return a read-only view of the node objects."""
+        return self._registry.objects
+
+    @property
+    def ntypes(self):
+        """Return a read-only view of the node types."""
+        return self._registry.types
 
     def __str__(self):
         """Return string representation of the nodes/folders/groups."""
         if self.root is None:
             return "Folder <root>"
-        ind = self.addresses.index(self.root)
-        if self.ntypes[ind] == TAG_FOLDER:
+        ntype = self._registry.get(self.root).ntype
+        if ntype == TAG_FOLDER:
             return f"Folder ({self.root})"
-        if self.ntypes[ind] == TAG_GROUP:
+        if ntype == TAG_GROUP:
             return f"Group ({self.root})"
         return f"Node ({self.root})"
 
@@ -176,7 +272,7 @@ class Nodes:
         """Return a representation of the nodes structure."""
         out = ""
         for node in nodes:
-            has_children = node[2] in self.nparents
+            has_children = self._registry.has_children(node[2])
             out += f"  {'+ ' if has_children else ''}{node[1]}: Node({node[2]})\n"
             if has_children:
                 for child in self.get_children(node[2]):
@@ -186,17 +282,21 @@ class Nodes:
 
     def __iter__(self):
         """Return an iterator for each node below the current nav level."""
-        iter_data = self.all_lower_nodes
-        return NodeIterator(self, iter_data, delta=1)
+        iter_data, objects = self._registry.flatten(
+            self.root, NODE_LEAF_TYPES, (TAG_NODE,)
+        )
+        return NodeIterator(self, iter_data, delta=1, objects=objects)
 
     def __reversed__(self):
         """Return the iterator in reverse order."""
-        iter_data = self.all_lower_nodes
-        return NodeIterator(self, iter_data, delta=-1)
+        iter_data, objects = self._registry.flatten(
+            self.root, NODE_LEAF_TYPES, (TAG_NODE,)
+        )
+        return NodeIterator(self, iter_data, delta=-1, objects=objects)
 
-    def update_received(self, xmldoc):
+    def update_received(self, event):
         """Update nodes from event stream message."""
-        address = value_from_xml(xmldoc, TAG_NODE)
+        address = event.node
 
         node = self.get_by_id(address)
         if not node:
@@ -207,28 +307,24 @@ class Nodes:
                 address,
             )
             return
-        value = value_from_xml(xmldoc, ATTR_ACTION, "")
-        value = int(value) if value != "" else ISY_VALUE_UNKNOWN
-        prec = attr_from_xml(xmldoc, ATTR_ACTION, ATTR_PRECISION, DEFAULT_PRECISION)
-        uom = attr_from_xml(
-            xmldoc, ATTR_ACTION, ATTR_UNIT_OF_MEASURE, DEFAULT_UNIT_OF_MEASURE
-        )
-        formatted = value_from_xml(xmldoc, TAG_FORMATTED)
+        value = int(event.action) if event.action else ISY_VALUE_UNKNOWN
+        prec = event.prec if event.prec is not None else DEFAULT_PRECISION
+        uom = event.uom if event.uom is not None else DEFAULT_UNIT_OF_MEASURE
 
         # Process the action and value if provided in event data.
         node.update_state(
-            NodeProperty(PROP_STATUS, value, prec, uom, formatted, address)
+            NodeProperty(PROP_STATUS, value, prec, uom, event.formatted, address)
         )
         _LOGGER.debug("ISY Updated Node: " + address)
 
-    def control_message_received(self, xmldoc):
+    def control_message_received(self, event):
         """
         Pass Control events from an event stream message to nodes.
 
         Used for sending out to subscribers.
         """
-        address = value_from_xml(xmldoc, TAG_NODE)
-        cntrl = value_from_xml(xmldoc, ATTR_CONTROL)
+        address = event.node
+        cntrl = event.control
         if not (address and cntrl):
             # If there is no node associated with the control message ignore it
             return
@@ -245,18 +341,14 @@ class Nodes:
 
         # Process the action and value if provided in event data.
         node.update_last_update()
-        value = value_from_xml(xmldoc, ATTR_ACTION, 0)
-        value = int(value) if value != "" else ISY_VALUE_UNKNOWN
-        prec = attr_from_xml(xmldoc, ATTR_ACTION, ATTR_PRECISION, DEFAULT_PRECISION)
-        uom = attr_from_xml(
-            xmldoc, ATTR_ACTION, ATTR_UNIT_OF_MEASURE, DEFAULT_UNIT_OF_MEASURE
-        )
-        formatted = value_from_xml(xmldoc, TAG_FORMATTED)
+        value = int(event.action) if event.action is not None else 0
+        prec = event.prec if event.prec is not None else DEFAULT_PRECISION
+        uom = event.uom if event.uom is not None else DEFAULT_UNIT_OF_MEASURE
 
         if cntrl == PROP_RAMP_RATE:
-            value = INSTEON_RAMP_RATES.get(value, value)
+            value = INSTEON_RAMP_RATES.get(str(value), value)
             uom = UOM_SECONDS
-        node_property = NodeProperty(cntrl, value, prec, uom, formatted, address)
+        node_property = NodeProperty(cntrl, value, prec, uom, event.formatted, address)
         if (
             cntrl == PROP_COMMS_ERROR
             and value == 0
@@ -269,179 +361,392 @@ class Nodes:
         node.control_events.notify(node_property)
         _LOGGER.debug("ISY Node Control Event: %s", node_property)
 
-    def node_changed_received(self, xmldoc):
+    def node_changed_received(self, event):
         """Handle Node Change/Update events from an event stream message."""
-        action = value_from_xml(xmldoc, ATTR_ACTION)
+        action = event.action
         if not action or action not in NODE_CHANGED_ACTIONS:
             return
-        node = value_from_xml(xmldoc, TAG_NODE)
+        node = event.node
         if action == NC_NODE_ERROR:
             _LOGGER.warning("ISY Could not communicate with device: %s", node)
+        elif action in NC_RENAME_ACTIONS:
+            new_name = event.info(TAG_NEW_NAME)
+            if new_name is not None and new_name.text:
+                self.rename(node, new_name.text)
         # FUTURE: Handle additional node change actions to force updates.
 
     def parse(self, xml):
         """
         Parse the xml data.
 
+        The document is parsed in a single pass. Groups are added after
+        all of the nodes, once every possible member is known.
+
         |  xml: String of the xml data
         """
+        groups = []
         try:
-            xmldoc = minidom.parseString(xml)
+            for feature in iterparse(xml, NODE_TAGS):
+                self._parse_feature(feature, groups)
         except XML_ERRORS:
             _LOGGER.error("%s: Nodes", XML_PARSE_ERROR)
             raise ISYResponseParseError(XML_PARSE_ERROR)
+        self._finish_parse(groups)
 
-        # get nodes
-        ntypes = [TAG_FOLDER, TAG_NODE, TAG_GROUP]
-        for ntype in ntypes:
-            features = xmldoc.getElementsByTagName(ntype)
-
-            for feature in features:
-                # Get Node Information
-                address = value_from_xml(feature, TAG_ADDRESS)
-                nname = value_from_xml(feature, TAG_NAME)
-                nparent = value_from_xml(feature, TAG_PARENT)
-                pnode = value_from_xml(feature, TAG_PRIMARY_NODE)
-                family = value_from_xml(feature, TAG_FAMILY)
-                device_type = value_from_xml(feature, TAG_TYPE)
-                node_def_id = attr_from_element(feature, ATTR_NODE_DEF_ID)
-                enabled = value_from_xml(feature, TAG_ENABLED) == XML_TRUE
-
-                # Assume Insteon, update as confirmed otherwise
-                protocol = PROTO_INSTEON
-                zwave_props = None
-                node_server = None
-                if family is not None:
-                    if family == FAMILY_ZWAVE:
-                        protocol = PROTO_ZWAVE
-                        zwave_props = ZWaveProperties(
-                            feature.getElementsByTagName(TAG_DEVICE_TYPE)[0]
-                        )
-                    elif family in (FAMILY_BRULTECH, FAMILY_RCS):
-                        protocol = PROTO_ZIGBEE
-                    elif family == FAMILY_NODESERVER:
-                        # Node Server Slot is stored with family as text:
-                        node_server = attr_from_xml(feature, TAG_FAMILY, ATTR_INSTANCE)
-                        if node_server:
-                            protocol = f"{PROTO_NODE_SERVER}_{node_server}"
-
-                # Process the different node types
-                if ntype == TAG_FOLDER and address not in self.addresses:
-                    self.insert(address, nname, nparent, None, ntype)
-                elif ntype == TAG_NODE:
-                    if address in self.addresses:
-                        self.get_by_id(address).update(xmldoc=feature)
-                        continue
-                    state, aux_props = parse_xml_properties(feature)
-                    self.insert(
-                        address,
-                        nname,
-                        nparent,
-                        Node(
-                            self,
-                            address=address,
-                            name=nname,
-                            state=state,
-                            aux_properties=aux_props,
-                            zwave_props=zwave_props,
-                            node_def_id=node_def_id,
-                            pnode=pnode,
-                            device_type=device_type,
-                            enabled=enabled,
-                            node_server=node_server,
-                            protocol=protocol,
-                            family_id=family,
-                        ),
-                        ntype,
-                    )
-                elif ntype == TAG_GROUP and address not in self.addresses:
-                    flag = attr_from_element(feature, ATTR_FLAG)
-                    # Ignore groups that contain 0x08 in the flag since
-                    # that is a ISY scene that contains every device/
-                    # scene so it will contain some scenes we have not
-                    # seen yet so they are not defined and it includes
-                    # the ISY MAC address in newer versions of
-                    # ISY firmwares > 5.0.6+ ..
-                    if int(flag) & 0x08:
-                        _LOGGER.debug("Skipping root group flag=%s %s", flag, address)
-                        continue
-                    mems = feature.getElementsByTagName(TAG_LINK)
-                    # Build list of members
-                    members = [mem.firstChild.nodeValue for mem in mems]
-                    # Build list of controllers
-                    controllers = []
-                    for mem in mems:
-                        if int(attr_from_element(mem, TAG_TYPE, 0)) == 16:
-                            controllers.append(mem.firstChild.nodeValue)
-                    self.insert(
-                        address,
-                        nname,
-                        nparent,
-                        Group(
-                            self,
-                            address=address,
-                            name=nname,
-                            members=members,
-                            controllers=controllers,
-                            family_id=family,
-                            pnode=pnode,
-                        ),
-                        ntype,
-                    )
-            _LOGGER.debug("ISY Loaded %s", ntype)
+    def _finish_parse(self, groups):
+        """Add the deferred groups and apply any status held for new nodes."""
+        for feature in groups:
+            self._parse_feature(feature)
+        _LOGGER.debug("ISY Loaded Nodes")
+
+        pending = self._pending_status
+        self._pending_status = None
+        if pending:
+            for feature in pending.values():
+                self._parse_status(feature)
+
+    def _parse_feature(self, feature, groups=None):
+        """
+        Add a single folder, node or group element from /rest/nodes.
+
+        |  feature: The element to add.
+        |  groups: [optional] List to defer group elements to, so they can
+           be added after all of their members.
+        """
+        ntype = feature.tag
+        if ntype == TAG_GROUP and groups is not None:
+            groups.append(feature)
+            return
+        address = value_from_element(feature, TAG_ADDRESS)
+        nname = value_from_element(feature, TAG_NAME)
+        nparent = value_from_element(feature, TAG_PARENT)
+
+        if address in self._registry:
+            # Already loaded, e.g. from the cache: apply any changes.
+            self.rename(address, nname)
+            if ntype == TAG_NODE:
+                node = self.get_by_id(address)
+                node.update_details(**node_details(feature))
+                node.update_from_xml(feature)
+            elif ntype == TAG_GROUP:
+                self._update_group(address, *group_links(feature))
+            return
+
+        if ntype == TAG_FOLDER:
+            self.insert(address, nname, nparent, None, ntype)
+            return
+
+        if ntype == TAG_GROUP:
+            flag = feature.get(ATTR_FLAG)
+            # Ignore groups that contain 0x08 in the flag since
+            # that is a ISY scene that contains every device/
+            # scene so it will contain some scenes we have not
+            # seen yet so they are not defined and it includes
+            # the ISY MAC address in newer versions of
+            # ISY firmwares > 5.0.6+ ..
+            if int(flag) & 0x08:
+                _LOGGER.debug("Skipping root group flag=%s %s", flag, address)
+                return
+            members, controllers = group_links(feature)
+            self.insert(
+                address,
+                nname,
+                nparent,
+                Group(
+                    self,
+                    address=address,
+                    name=nname,
+                    members=members,
+                    controllers=controllers,
+                    family_id=value_from_element(feature, TAG_FAMILY),
+                    pnode=value_from_element(feature, TAG_PRIMARY_NODE),
+                ),
+                ntype,
+            )
+            return
+
+        state, aux_props = parse_xml_properties(feature)
+        self.insert(
+            address,
+            nname,
+            nparent,
+            Node(
+                self,
+                address=address,
+                name=nname,
+                state=state,
+                aux_properties=aux_props,
+                **node_details(feature),
+            ),
+            ntype,
+        )
+
+    def _update_group(self, address, members, controllers):
+        """Apply the members and controllers of a loaded group."""
+        if self.get_by_id(address).set_members(members, controllers):
+            self._registry.remove_group_links(address)
+            self._registry.add_group_links(address, members, controllers)
+            _LOGGER.debug("ISY Updated the members of group %s", address)
+
+    def _parse_status(self, feature):
+        """
+        Apply a single node element from /rest/status.
+
+        Returns True if the node changed.
+        """
+        address = feature.get(ATTR_ID)
+        node = self.get_by_id(address)
+        if isinstance(node, Node):
+            return node.update_from_xml(feature)
+        if node is None and self._pending_status is not None:
+            # The node list is still loading, hold the status for later.
+            self._pending_status[address] = feature
+        return False
 
     async def update(self, wait_time=0, xml=None):
         """
         Update the status and properties of the nodes in the class.
 
-        This calls the "/rest/status" endpoint.
+        This calls the "/rest/status" endpoint. The response is applied to
+        the nodes while it is being received.
 
         |  wait_time: [optional] Amount of seconds to wait before updating
+        |  xml: [optional] String of the xml data to use instead of fetching it
+
+        Returns True if the status was updated, False if it failed.
         """
         if wait_time:
             await sleep(wait_time)
 
-        if xml is None:
-            xml = await self.isy.conn.get_status()
-
-        if xml is None:
-            _LOGGER.warning("ISY Failed to update nodes.")
-            return
-
         try:
-            xmldoc = minidom.parseString(xml)
+            if xml is not None:
+                for feature in iterparse(xml, (TAG_NODE,)):
+                    self._parse_status(feature)
+            else:
+                stream = ElementStream((TAG_NODE,), self._parse_status)
+                if not await self.isy.conn.get_status(stream_to=stream):
+                    _LOGGER.warning("ISY Failed to update nodes.")
+                    return False
+                stream.close()
         except XML_ERRORS:
             _LOGGER.error("%s: Nodes", XML_PARSE_ERROR)
             return False
 
-        for feature in xmldoc.getElementsByTagName(TAG_NODE):
-            address = feature.attributes[ATTR_ID].value
+        _LOGGER.info("ISY Updated Node Statuses.")
+        return True
 
-            if address in self.addresses:
-                await self.get_by_id(address).update(xmldoc=feature)
-                continue
+    def refresh(self, address, wait_time=UPDATE_INTERVAL):
+        """
+        Schedule a reload of the status of a node from the controller.
 
-        _LOGGER.info("ISY Updated Node Statuses.")
+        Requests made before the reload starts are merged. If at least
+        `REFRESH_BULK_THRESHOLD` nodes are waiting, they are reloaded with a
+        single "/rest/status" request, otherwise each node is queried.
+
+        |  address: The ID of the node to reload.
+        |  wait_time: [optional] Seconds to wait for more requests to merge.
+
+        Returns the task performing the reload.
+        """
+        return self._refresher.request(address, wait_time)
+
+    async def _refresh(self, addresses):
+        """Perform the pending node reloads."""
+        addresses = sorted(addresses)
+        if len(addresses) >= REFRESH_BULK_THRESHOLD:
+            try:
+                await self.update()
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.warning("ISY could not refresh the nodes: %s", err)
+            return
+        nodes = [self.get_by_id(address) for address in addresses]
+        results = await gather(
+            *[node.update() for node in nodes if node is not None],
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.warning("ISY could not refresh a node: %s", result)
+
+    async def reconcile(self):
+        """
+        Bring the node states up to date with the controller.
+
+        This calls the "/rest/status" endpoint and applies only the values
+        which differ from the current state, notifying the listeners of each
+        changed node once.
+
+        Returns the number of nodes that changed, or None if it failed.
+        """
+        changed = 0
+
+        def apply(feature):
+            nonlocal changed
+            if self._parse_status(feature):
+                changed += 1
+
+        stream = ElementStream((TAG_NODE,), apply)
+        try:
+            if not await self.isy.conn.get_status(stream_to=stream):
+                _LOGGER.warning("ISY Failed to reconcile nodes.")
+                return None
+            stream.close()
+        except XML_ERRORS:
+            _LOGGER.error("%s: Nodes", XML_PARSE_ERROR)
+            return None
+        return changed
 
     async def update_nodes(self, wait_time=0):
         """
         Update the contents of the class.
 
-        This calls the "/rest/nodes" endpoint.
+        This calls the "/rest/nodes" endpoint. Nodes and folders are added
+        while the response is being received; status received for nodes
+        that are not loaded yet is held until the list is complete.
 
         |  wait_time: [optional] Amount of seconds to wait before updating
+
+        Returns the set of addresses received, or None if it failed.
         """
         if wait_time:
             await sleep(wait_time)
-        xml = await self.isy.conn.get_nodes()
-        if xml is None:
-            _LOGGER.warning("ISY Failed to update nodes.")
+
+        groups = []
+        received = set()
+
+        def parse_feature(feature):
+            received.add(value_from_element(feature, TAG_ADDRESS))
+            self._parse_feature(feature, groups)
+
+        self._pending_status = {}
+        stream = ElementStream(NODE_TAGS, parse_feature)
+        try:
+            if not await self.isy.conn.get_nodes(stream_to=stream):
+                self._pending_status = None
+                _LOGGER.warning("ISY Failed to update nodes.")
+                return None
+            stream.close()
+        except XML_ERRORS:
+            self._pending_status = None
+            _LOGGER.error("%s: Nodes", XML_PARSE_ERROR)
+            raise ISYResponseParseError(XML_PARSE_ERROR)
+        self._finish_parse(groups)
+        return received
+
+    def to_cache(self, exclude=()):
+        """
+        Return the folders, nodes and groups for the inventory cache.
+
+        |  exclude: [optional] Addresses to leave out.
+
+        Returns a list of JSON serializable dicts.
+        """
+        items = []
+        for entry in self._registry.entries:
+            if entry.address in exclude:
+                continue
+            item = {
+                "type": entry.ntype,
+                "address": entry.address,
+                "name": entry.name,
+                "parent": entry.parent,
+            }
+            obj = entry.obj
+            if entry.ntype == TAG_GROUP:
+                item["members"] = obj.members
+                item["controllers"] = obj.controllers
+                item["family"] = FAMILY_ID_BY_NAME.get(obj.family)
+                item["pnode"] = obj.primary_node
+            elif entry.ntype == TAG_NODE:
+                item["state"] = [obj.status, obj.prec, obj.uom, obj.formatted]
+                item["aux_properties"] = {
+                    prop_id: property_to_cache(prop)
+                    for prop_id, prop in obj.aux_properties.items()
+                }
+                item["zwave_props"] = (
+                    obj.zwave_props.raw if obj.zwave_props is not None else None
+                )
+                item["node_def_id"] = obj.node_def_id
+                item["pnode"] = obj.primary_node
+                item["device_type"] = obj.type
+                item["enabled"] = obj.enabled
+                item["node_server"] = obj.node_server
+                item["protocol"] = obj.protocol
+                item["family"] = FAMILY_ID_BY_NAME.get(obj.family)
+            items.append(item)
+        return items
+
+    def load_cache(self, items):
+        """
+        Add the folders, nodes and groups from the inventory cache.
+
+        Items which are already loaded are skipped. Groups are added after
+        all of the nodes, once every possible member is known.
+
+        |  items: List of dicts from `to_cache`.
+        """
+        groups = []
+        for item in items:
+            if item["address"] in self._registry:
+                continue
+            if item["type"] == TAG_GROUP:
+                groups.append(item)
+            else:
+                self._load_cache_item(item)
+        for item in groups:
+            self._load_cache_item(item)
+        _LOGGER.debug("ISY Loaded Nodes from cache")
+
+    def _load_cache_item(self, item):
+        """Add a single folder, node or group from the inventory cache."""
+        ntype = item["type"]
+        address = item["address"]
+        nname = item["name"]
+        nparent = item["parent"]
+        if ntype == TAG_FOLDER:
+            self.insert(address, nname, nparent, None, ntype)
+            return
+        if ntype == TAG_GROUP:
+            nobj = Group(
+                self,
+                address=address,
+                name=nname,
+                members=item["members"],
+                controllers=item["controllers"],
+                family_id=item["family"],
+                pnode=item["pnode"],
+            )
+            self.insert(address, nname, nparent, nobj, ntype)
             return
-        self.parse(xml)
+
+        zwave_props = None
+        if item["zwave_props"] is not None:
+            # Rebuilt from the raw XML, as when loaded from the controller.
+            raw = item["zwave_props"]
+            zwave_props = ZWaveProperties(fromstring(raw) if raw else None)
+        nobj = Node(
+            self,
+            address=address,
+            name=nname,
+            state=property_from_cache(PROP_STATUS, item["state"]),
+            aux_properties={
+                prop_id: property_from_cache(prop_id, prop)
+                for prop_id, prop in item["aux_properties"].items()
+            },
+            zwave_props=zwave_props,
+            node_def_id=item["node_def_id"],
+            pnode=item["pnode"],
+            device_type=item["device_type"],
+            enabled=item["enabled"],
+            node_server=item["node_server"],
+            protocol=item["protocol"],
+            family_id=item["family"],
+        )
+        self.insert(address, nname, nparent, nobj, ntype)
 
     def insert(self, address, nname, nparent, nobj, ntype):
         """
-        Insert a new node into the lists.
+        Insert a new node into the registry.
 
         |  address: node id
         |  nname: node name
@@ -449,37 +754,66 @@ class Nodes:
         |  nobj: node object
         |  ntype: node type
         """
-        self.addresses.append(address)
-        self.nnames.append(nname)
-        self.nparents.append(nparent)
-        self.ntypes.append(ntype)
-        self.nobjs.append(nobj)
+        self._registry.insert(address, nname, nparent, nobj, ntype)
+        if ntype == TAG_GROUP and nobj is not None:
+            self._registry.add_group_links(address, nobj.members, nobj.controllers)
+        elif (
+            ntype == TAG_NODE
+            and nobj is not None
+            and self._registry.state_store is not None
+        ):
+            self._registry.state_store.add(nobj)
+
+    def remove(self, addresses):
+        """
+        Remove nodes, groups and folders which no longer exist.
+
+        |  addresses: The ids of the items to remove.
+        """
+        groups = {
+            group
+            for address in addresses
+            for group in self._registry.groups_of(address)
+            if group not in addresses
+        }
+        store = self._registry.state_store
+        for entry in self._registry.remove(addresses):
+            if store is not None and entry.ntype == TAG_NODE:
+                store.remove(entry.address)
+            _LOGGER.debug("ISY Removed %s %s", entry.ntype, entry.address)
+        for group in groups:
+            self.get_by_id(group).remove_members(addresses)
+
+    def rename(self, address, name):
+        """
+        Rename a node, group or folder.
+
+        |  address: node id
+        |  name: new node name
+        """
+        entry = self._registry.rename(address, name)
+        if entry is None:
+            return
+        if entry.obj is not None:
+            entry.obj.name = name
+        _LOGGER.debug("ISY Renamed %s %s to %s", entry.ntype, address, name)
 
     def __getitem__(self, val):
         """Navigate through the node tree. Can take names or IDs."""
-        try:
-            self.addresses.index(val)
-            fun = self.get_by_id
-        except ValueError:
-            try:
-                self.nnames.index(val)
-                fun = self.get_by_name
-            except ValueError:
-                try:
-                    val = int(val)
-                    fun = self.get_by_index
-                except ValueError:
-                    fun = None
-
-        if fun:
-            output = None
+        output = None
+        entry = self._registry.get(val)
+        if entry is not None:
+            output = self._get_entry_object(entry)
+        elif self._registry.has_name(val):
+            output = self.get_by_name(val)
+        else:
             try:
-                output = fun(val)
-            except ValueError:
+                output = self.get_by_index(int(val))
+            except (TypeError, ValueError, IndexError):
                 pass
 
-            if output:
-                return output
+        if output:
+            return output
         raise KeyError(f"Unrecognized Key: [{val}]")
 
     def __setitem__(self, item, value):
@@ -492,12 +826,12 @@ class Nodes:
 
         |  val: String representing name to look for.
         """
-        for i in range(len(self.addresses)):
-            if (self.root is None or self.nparents[i] == self.root) and self.nnames[
-                i
-            ] == val:
-                return self.get_by_index(i)
-        return None
+        entry = self._registry.get_by_name(
+            val, parent=self.root, any_parent=self.root is None
+        )
+        if entry is None:
+            return None
+        return self._get_entry_object(entry)
 
     def get_by_id(self, address):
         """
@@ -505,12 +839,20 @@ class Nodes:
 
         |  address: Integer representing node/group/folder id.
         """
-        try:
-            i = self.addresses.index(address)
-        except ValueError:
+        entry = self._registry.get(address)
+        if entry is None:
             return None
-        else:
-            return self.get_by_index(i)
+        return self._get_entry_object(entry)
+
+    def get_groups(self, address, controller=True, responder=True):
+        """
+        Return the IDs of the groups (scenes) a node belongs to.
+
+        |  address: The node ID.
+        |  controller: [optional] Include the groups the node controls.
+        |  responder: [optional] Include the groups the node is a member of.
+        """
+        return self._registry.groups_of(address, controller, responder)
 
     def get_by_index(self, i):
         """
@@ -518,17 +860,13 @@ class Nodes:
 
         |  i: Integer representing index of node/group/folder.
         """
-        if self.ntypes[i] in [TAG_GROUP, TAG_NODE]:
-            return self.nobjs[i]
-        return Nodes(
-            self.isy,
-            self.addresses[i],
-            self.addresses,
-            self.nnames,
-            self.nparents,
-            self.nobjs,
-            self.ntypes,
-        )
+        return self._get_entry_object(self._registry.entries[i])
+
+    def _get_entry_object(self, entry):
+        """Return the object for a registry entry or a navigation level."""
+        if entry.ntype in (TAG_GROUP, TAG_NODE):
+            return entry.obj
+        return Nodes(self.isy, entry.address, self._registry)
 
     @property
     def children(self):
@@ -539,56 +877,46 @@ class Nodes:
         """Return the children of the class."""
         if ident is None:
             ident = self.root
-        out = [
-            (self.ntypes[i], self.nnames[i], self.addresses[i])
-            for i in [
-                index for index, parent in enumerate(self.nparents) if parent == ident
-            ]
+        return [
+            (entry.ntype, entry.name, entry.address)
+            for entry in self._registry.children(ident)
         ]
-        return out
 
     @property
     def has_children(self):
         """Return if the root has children."""
-        return self.root in self.nparents
+        return self._registry.has_children(self.root)
 
     @property
     def name(self):
         """Return the name of the root."""
         if self.root is None:
             return ""
-        ind = self.addresses.index(self.root)
-        return self.nnames[ind]
+        return self._registry.get(self.root).name
 
     @property
     def all_lower_nodes(self):
         """Return all nodes below the current root."""
-        output = []
-        myname = self.name + "/"
-
-        for dtype, name, ident in self.children:
-            if dtype in [TAG_GROUP, TAG_NODE]:
-                output.append((dtype, myname + name, ident))
-                if dtype == TAG_NODE and ident in self.nparents:
-                    output += [
-                        (child[0], f"{myname}{name}/{child[1]}", child[2])
-                        for child in self.get_children(ident)
-                    ]
-            if dtype == TAG_FOLDER:
-                output += [
-                    (dtype2, myname + name2, ident2)
-                    for (dtype2, name2, ident2) in self[ident].all_lower_nodes
-                ]
-        return output
+        items, _ = self._registry.flatten(self.root, NODE_LEAF_TYPES, (TAG_NODE,))
+        return list(items)
 
 
 class NodeIterator:
-    """Iterate through a list of nodes, returning node objects."""
+    """
+    Iterate through a list of nodes, returning node objects.
 
-    def __init__(self, nodes, iter_data, delta=1):
+    |  nodes: The node (or program) manager to resolve items with.
+    |  iter_data: List of (type, path, address) tuples to iterate.
+    |  delta: [optional] 1 to iterate forwards, -1 to iterate in reverse.
+    |  objects: [optional] List of the objects for each item in iter_data,
+       used instead of looking each item up in the manager.
+    """
+
+    def __init__(self, nodes, iter_data, delta=1, objects=None):
         """Initialize a NodeIterator class."""
         self._nodes = nodes
         self._iterdata = iter_data
+        self._objects = objects
         self._len = len(iter_data)
         self._delta = delta
 
@@ -597,12 +925,19 @@ class NodeIterator:
         else:
             self._ind = self._len - 1
 
+    def __iter__(self):
+        """Return the iterator itself."""
+        return self
+
     def __next__(self):
         """Get the next element in the iteration."""
         if self._ind >= self._len or self._ind < 0:
             raise StopIteration
-        _, path, ident = self._iterdata[self._ind]
+        ind = self._ind
         self._ind += self._delta
+        _, path, ident = self._iterdata[ind]
+        if self._objects is not None:
+            return (path, self._objects[ind])
         return (path, self._nodes[ident])
 
     def __len__(self):
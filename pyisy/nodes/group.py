@@ -1,5 +1,7 @@
 """Representation of groups (scenes) from an ISY."""
-from ..constants import ISY_VALUE_UNKNOWN, PROTO_GROUP
+from collections import Counter
+
+from ..constants import ATTR_STATUS, ISY_VALUE_UNKNOWN, PROTO_GROUP, TAG_ADDRESS
 from ..helpers import now
 from .nodebase import NodeBase
 
@@ -23,6 +25,17 @@ class Group(NodeBase):
     :ivar group_all_on: Watched property indicating if all devices in group are on.
     """
 
+    __slots__ = (
+        "_all_on",
+        "_controllers",
+        "_member_count",
+        "_member_state",
+        "_members",
+        "_members_handlers",
+        "_on_count",
+        "_valid_count",
+    )
+
     def __init__(
         self,
         nodes,
@@ -37,20 +50,26 @@ class Group(NodeBase):
         self._all_on = False
         self._controllers = controllers or []
         self._members = members or []
+        # Number of times each member is listed, and its last (valid, on) state.
+        self._member_count = Counter(self._members)
+        self._member_state = {}
+        self._valid_count = 0
+        self._on_count = 0
         super().__init__(nodes, address, name, 0, family_id=family_id, pnode=pnode)
 
         # listen for changes in children
-        self._members_handlers = [
-            self._nodes[m].status_events.subscribe(self.update_callback)
-            for m in self.members
-        ]
+        self._members_handlers = {
+            m: self._nodes[m].status_events.subscribe(self.update_callback)
+            for m in self._member_count
+        }
 
         # get and update the status
-        self.isy.loop.create_task(self.update())
+        self._recount()
+        self._update_status()
 
     def __del__(self):
         """Cleanup event handlers before deleting."""
-        for handler in self._members_handlers:
+        for handler in self._members_handlers.values():
             handler.unsubscribe()
 
     @property
@@ -85,24 +104,80 @@ class Group(NodeBase):
 
     async def update(self, event=None, wait_time=0, hint=None, xmldoc=None):
         """Update the group with values from the controller."""
+        self._recount()
+        self._update_status()
+
+    def set_members(self, members, controllers):
+        """
+        Replace the members and controllers of the group.
+
+        |  members: List of the members in this group.
+        |  controllers: List of the controllers in this group.
+
+        Returns True if the group changed.
+        """
+        if members == self._members and controllers == self._controllers:
+            return False
+        self._members = members
+        self._controllers = controllers
+        self._member_count = Counter(members)
+        for address in list(self._members_handlers):
+            if address not in self._member_count:
+                self._members_handlers.pop(address).unsubscribe()
+        for address in self._member_count:
+            if address not in self._members_handlers:
+                self._members_handlers[address] = self._nodes[
+                    address
+                ].status_events.subscribe(self.update_callback)
+        self._recount()
+        self._update_status()
+        return True
+
+    def remove_members(self, addresses):
+        """
+        Remove nodes which no longer exist from the group.
+
+        |  addresses: The addresses of the removed nodes.
+        """
+        self.set_members(
+            [m for m in self._members if m not in addresses],
+            [c for c in self._controllers if c not in addresses],
+        )
+
+    def update_callback(self, event=None):
+        """Handle synchronous callbacks for subscriber events."""
+        if event is None:
+            self._recount()
+        else:
+            self._set_member_status(event[TAG_ADDRESS], event[ATTR_STATUS])
+        self._update_status()
+
+    def _recount(self):
+        """Rebuild the member counters from the current status of each member."""
+        self._member_state = {}
+        self._valid_count = 0
+        self._on_count = 0
+        for address in self._member_count:
+            self._set_member_status(address, self._nodes.get_by_id(address).status)
+
+    def _set_member_status(self, address, status):
+        """Update the member counters for a single member's new status."""
+        weight = self._member_count.get(address)
+        if not weight:
+            return
+        valid = status is not None and status != ISY_VALUE_UNKNOWN
+        state = (valid, valid and int(status) > 0)
+        old_valid, old_on = self._member_state.get(address, (False, False))
+        self._member_state[address] = state
+        self._valid_count += weight * (state[0] - old_valid)
+        self._on_count += weight * (state[1] - old_on)
+
+    def _update_status(self):
+        """Set the group status from the member counters."""
         self._last_update = now()
-        valid_nodes = [
-            node
-            for node in self.members
-            if (
-                self._nodes[node].status is not None
-                and self._nodes[node].status != ISY_VALUE_UNKNOWN
-            )
-        ]
-        on_nodes = [node for node in valid_nodes if int(self._nodes[node].status) > 0]
-
-        if on_nodes:
-            self.group_all_on = len(on_nodes) == len(valid_nodes)
+        if self._on_count:
+            self.group_all_on = self._on_count == self._valid_count
             self.status = 255
             return
         self.status = 0
         self.group_all_on = False
-
-    def update_callback(self, event=None):
-        """Handle synchronous callbacks for subscriber events."""
-        self.isy.loop.create_task(self.update(event))
@@ -1,7 +1,7 @@
 """Representation of a node from an ISY."""
 import asyncio
 from math import isnan
-from xml.dom import minidom
+from xml.etree.ElementTree import fromstring
 
 from ..constants import (
     _LOGGER,
@@ -16,6 +16,8 @@ from ..constants import (
     INSTEON_TYPE_LOCK,
     INSTEON_TYPE_THERMOSTAT,
     METHOD_GET,
+    NODE_FAMILY_ID,
+    PRIORITY_REFRESH,
     PROP_ON_LEVEL,
     PROP_RAMP_RATE,
     PROP_SETPOINT_COOL,
@@ -23,17 +25,21 @@ from ..constants import (
     PROP_STATUS,
     PROTO_INSTEON,
     PROTO_ZWAVE,
-    TAG_GROUP,
     UOM_CLIMATE_MODES,
     UOM_FAN_MODES,
-    UOM_TO_STATES,
     URL_NODES,
     ZWAVE_CAT_DIMMABLE,
     ZWAVE_CAT_LOCK,
     ZWAVE_CAT_THERMOSTAT,
 )
 from ..exceptions import XML_ERRORS, XML_PARSE_ERROR, ISYResponseParseError
-from ..helpers import EventEmitter, NodeProperty, now, parse_xml_properties
+from ..helpers import (
+    EventEmitter,
+    NodeProperty,
+    now,
+    parse_xml_properties,
+    state_to_value,
+)
 from .nodebase import NodeBase
 
 
@@ -62,6 +68,20 @@ class Node(NodeBase):
     :ivar has_children: Property indicating that there are no more children.
     """
 
+    __slots__ = (
+        "_enabled",
+        "_formatted",
+        "_node_def_id",
+        "_node_server",
+        "_parent_node",
+        "_prec",
+        "_protocol",
+        "_type",
+        "_uom",
+        "_zwave_props",
+        "control_events",
+    )
+
     def __init__(
         self,
         nodes,
@@ -217,14 +237,16 @@ class Node(NodeBase):
 
     async def update(self, event=None, wait_time=0, hint=None, xmldoc=None):
         """Update the value of the node from the controller."""
-        if not self.isy.auto_update and not xmldoc:
+        if not self.isy.auto_update and xmldoc is None:
             await asyncio.sleep(wait_time)
             req_url = self.isy.conn.compile_url(
                 [URL_NODES, self._id, METHOD_GET, PROP_STATUS]
             )
-            xml = await self.isy.conn.request(req_url)
+            xml = await self.isy.conn.request(
+                req_url, priority=PRIORITY_REFRESH, shared=True
+            )
             try:
-                xmldoc = minidom.parseString(xml)
+                xmldoc = fromstring(xml)
             except XML_ERRORS:
                 _LOGGER.error("%s: Nodes", XML_PARSE_ERROR)
                 raise ISYResponseParseError(XML_PARSE_ERROR)
@@ -238,19 +260,77 @@ class Node(NodeBase):
             _LOGGER.warning("ISY could not update node: %s", self._id)
             return
 
+        self.update_from_xml(xmldoc)
+
+    def update_details(
+        self,
+        zwave_props=None,
+        node_def_id=None,
+        pnode=None,
+        device_type=None,
+        enabled=None,
+        node_server=None,
+        protocol=None,
+        family_id=None,
+    ):
+        """
+        Apply the attributes of the node reloaded from the controller.
+
+        Takes the same arguments as the class, other than the name and state.
+        """
+        self._zwave_props = zwave_props
+        self._node_def_id = node_def_id
+        self._primary_node = pnode
+        self._parent_node = pnode if pnode != self._id else None
+        self._type = device_type
+        self._enabled = enabled if enabled is not None else True
+        self._node_server = node_server
+        self._protocol = protocol
+        self._family = NODE_FAMILY_ID.get(family_id)
+
+    def update_from_xml(self, xmldoc):
+        """
+        Update the state and properties of the node from parsed XML.
+
+        Only the values which differ are applied, and listeners are notified
+        once if anything changed.
+
+        |  xmldoc: ElementTree element containing the node's properties.
+
+        Returns True if the node changed.
+        """
         self._last_update = now()
         state, aux_props = parse_xml_properties(xmldoc)
-        self._aux_properties.update(aux_props)
-        self.update_state(state)
+        changed = False
+        for prop_id, prop in aux_props.items():
+            aux_prop = self._aux_properties.get(prop_id)
+            if aux_prop is not None:
+                if prop.uom == "" and not aux_prop.uom == "":
+                    # Guard against overwriting known UOM with blank UOM (ISYv4).
+                    prop.uom = aux_prop.uom
+                if aux_prop == prop:
+                    continue
+            self._aux_properties[prop_id] = prop
+            changed = True
+        if self._apply_state(state):
+            changed = True
+        if changed:
+            self._notify_changed()
         _LOGGER.debug("ISY updated node: %s", self._id)
+        return changed
 
     def update_state(self, state):
         """Update the various state properties when received."""
         if not isinstance(state, NodeProperty):
             _LOGGER.error("Could not update state values. Invalid type provided.")
             return
-        changed = False
         self._last_update = now()
+        if self._apply_state(state):
+            self._notify_changed()
+
+    def _apply_state(self, state):
+        """Apply the state values without notifying. Returns True if changed."""
+        changed = False
 
         if state.prec != self._prec:
             self._prec = state.prec
@@ -264,25 +344,26 @@ class Node(NodeBase):
             self._formatted = state.formatted
             changed = True
 
-        if state.value != self.status:
-            self.status = state.value
-            # Let Status setter throw event
-            return
+        if state.value != self._status:
+            self._status = state.value
+            changed = True
 
-        if changed:
-            self._last_changed = now()
-            self.status_events.notify(self.status_feedback)
+        return changed
+
+    def _notify_changed(self):
+        """Record a change of the node and notify listeners once."""
+        self._last_changed = now()
+        self._store_state()
+        self.status_events.notify(self.status_feedback)
 
     def get_command_value(self, uom, cmd):
         """Check against the list of UOM States if this is a valid command."""
-        if cmd not in UOM_TO_STATES[uom].values():
+        value = state_to_value(uom, cmd)
+        if value is None:
             _LOGGER.warning(
                 "Failed to call %s on %s, invalid command.", cmd, self.address
             )
-            return None
-        return list(UOM_TO_STATES[uom].keys())[
-            list(UOM_TO_STATES[uom].values()).index(cmd)
-        ]
+        return value
 
     def get_groups(self, controller=True, responder=True):
         """
@@ -292,16 +373,7 @@ class Node(NodeBase):
         If responder is True, then the scenes it is a responder of are added to
         the list.
         """
-        groups = []
-        for child in self._nodes.all_lower_nodes:
-            if child[0] == TAG_GROUP:
-                if responder:
-                    if self._id in self._nodes[child[2]].members:
-                        groups.append(child[2])
-                elif controller:
-                    if self._id in self._nodes[child[2]].controllers:
-                        groups.append(child[2])
-        return groups
+        return self._nodes.get_groups(self._id, controller, responder)
 
     def get_property_uom(self, prop):
         """Get the Unit of Measurement for Z-Wave Climate Settings."""
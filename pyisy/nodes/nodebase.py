@@ -1,4 +1,5 @@
 """Base object for nodes and groups."""
+from asyncio import shield
 from xml.dom import minidom
 
 from ..constants import (
@@ -21,13 +22,13 @@ from ..constants import (
     COMMAND_FRIENDLY_NAME,
     METHOD_COMMAND,
     NODE_FAMILY_ID,
+    PRIORITY_BACKGROUND,
     PROP_ON_LEVEL,
     TAG_ADDRESS,
     TAG_DESCRIPTION,
     TAG_IS_LOAD,
     TAG_LOCATION,
     TAG_SPOKEN,
-    UPDATE_INTERVAL,
     URL_NODES,
     URL_NOTES,
     XML_TRUE,
@@ -39,6 +40,21 @@ from ..helpers import EventEmitter, NodeProperty, now, value_from_xml
 class NodeBase:
     """Base Object for Nodes and Groups/Scenes."""
 
+    __slots__ = (
+        "_aux_properties",
+        "_family",
+        "_id",
+        "_last_changed",
+        "_last_update",
+        "_name",
+        "_nodes",
+        "_notes",
+        "_primary_node",
+        "_status",
+        "isy",
+        "status_events",
+    )
+
     has_children = False
 
     def __init__(
@@ -126,6 +142,13 @@ class NodeBase:
         """Return the name of the Node."""
         return self._name
 
+    @name.setter
+    def name(self, value):
+        """Set the name of the Node."""
+        if self._name != value:
+            self._name = value
+        return self._name
+
     @property
     def primary_node(self):
         """Return just the parent/primary node address.
@@ -156,9 +179,16 @@ class NodeBase:
         if self._status != value:
             self._status = value
             self._last_changed = now()
+            self._store_state()
             self.status_events.notify(self.status_feedback)
         return self._status
 
+    def _store_state(self):
+        """Write the node state to the StateStore, if one is enabled."""
+        store = self._nodes.state_store
+        if store is not None:
+            store.write(self)
+
     @property
     def status_feedback(self):
         """Return information for a status change event."""
@@ -176,7 +206,10 @@ class NodeBase:
         a call to this function.
         """
         notes_xml = await self.isy.conn.request(
-            self.isy.conn.compile_url([URL_NODES, self._id, URL_NOTES]), ok404=True
+            self.isy.conn.compile_url([URL_NODES, self._id, URL_NOTES]),
+            ok404=True,
+            priority=PRIORITY_BACKGROUND,
+            shared=True,
         )
         spoken = None
         is_load = None
@@ -268,7 +301,11 @@ class NodeBase:
             hint = 255
         elif cmd in [CMD_OFF, CMD_OFF_FAST]:
             hint = 0
-        await self.update(wait_time=UPDATE_INTERVAL, hint=hint)
+        if self.isy.auto_update:
+            await self.update(hint=hint)
+        else:
+            # Merged with the refreshes of other commands sent meanwhile.
+            await shield(self.isy.nodes.refresh(self._id))
         return True
 
     async def beep(self):
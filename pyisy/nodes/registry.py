@@ -0,0 +1,396 @@
+"""Indexed registry of the nodes, groups, programs and folders on the ISY."""
+from collections.abc import Sequence
+
+
+class RegistryEntry:
+    """
+    A single item stored in the registry.
+
+    |  address: The node/group/folder ID.
+    |  name: The name of the item.
+    |  parent: The ID of the parent item (None for the root level).
+    |  obj: The object representing the item (None for folders).
+    |  ntype: The item type (folder, node, group, program).
+    |  index: The insertion position of the item in the registry.
+    |  path: The full path of the item, e.g. "/Folder/Name".
+    """
+
+    __slots__ = ("address", "name", "parent", "obj", "ntype", "index", "path")
+
+    def __init__(self, address, name, parent, obj, ntype, index, path=None):
+        """Initialize a RegistryEntry class."""
+        self.address = address
+        self.name = name
+        self.parent = parent
+        self.obj = obj
+        self.ntype = ntype
+        self.index = index
+        self.path = path
+
+    def __repr__(self):
+        """Return a string representation of the entry."""
+        return f"RegistryEntry({self.ntype}: {self.address} '{self.name}')"
+
+
+class RegistryView(Sequence):
+    """
+    Read-only list view of a single field of the registry entries.
+
+    Provides the legacy parallel lists (e.g. `Nodes.addresses`) without
+    keeping a second copy of the data. Lookups on the address and parent
+    fields use the registry indexes instead of scanning.
+    """
+
+    __slots__ = ("_registry", "_field")
+
+    def __init__(self, registry, field):
+        """Initialize a RegistryView class."""
+        self._registry = registry
+        self._field = field
+
+    def __getitem__(self, i):
+        """Return the field value for the entry at the given index."""
+        if isinstance(i, slice):
+            return [getattr(entry, self._field) for entry in self._registry.entries[i]]
+        return getattr(self._registry.entries[i], self._field)
+
+    def __len__(self):
+        """Return the number of entries."""
+        return len(self._registry.entries)
+
+    def __contains__(self, value):
+        """Return if the value is present in this field of any entry."""
+        if self._field == "address":
+            return value in self._registry
+        if self._field == "parent":
+            return self._registry.has_children(value)
+        if self._field == "name":
+            return self._registry.has_name(value)
+        return super().__contains__(value)
+
+    def __eq__(self, other):
+        """Compare the view to another sequence."""
+        if isinstance(other, (RegistryView, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        """Return a string representation of the view."""
+        return repr(list(self))
+
+    def index(self, value, start=0, stop=None):
+        """Return the first index of a value, raising ValueError if missing."""
+        if self._field == "address" and start == 0 and stop is None:
+            entry = self._registry.get(value)
+            if entry is None:
+                raise ValueError(f"{value!r} is not in list")
+            return entry.index
+        return super().index(value, start, stop)
+
+
+class NodeRegistry:
+    """
+    Indexed storage for the items in a `Nodes` tree.
+
+    Items are kept in insertion order and indexed by address, by name
+    and by (parent, name). The parent to children adjacency is kept so
+    navigation does not have to scan the whole tree, as well as the
+    groups (scenes) each node is a member or controller of.
+
+    The full path of each item is kept up to date as items are inserted
+    and renamed, and the flattened list of the items below a folder is
+    cached until the tree changes.
+
+    :ivar state_store: The StateStore of the node states, if enabled.
+    """
+
+    def __init__(self):
+        """Initialize a NodeRegistry class."""
+        self.entries = []
+        self._by_address = {}
+        self._by_name = {}
+        self._by_parent_name = {}
+        self._children = {}
+        self._member_groups = {}
+        self._controller_groups = {}
+        self._flattened = {}
+        self.state_store = None
+
+    def __contains__(self, address):
+        """Return if an item with the given address is registered."""
+        return address in self._by_address
+
+    def __iter__(self):
+        """Iterate through the entries in insertion order."""
+        return iter(self.entries)
+
+    def __len__(self):
+        """Return the number of entries."""
+        return len(self.entries)
+
+    def insert(self, address, name, parent, obj, ntype):
+        """
+        Insert a new item into the registry.
+
+        |  address: item id
+        |  name: item name
+        |  parent: item parent
+        |  obj: item object
+        |  ntype: item type
+        """
+        parent_entry = self._by_address.get(parent)
+        parent_path = parent_entry.path if parent_entry is not None else ""
+        entry = RegistryEntry(
+            address,
+            name,
+            parent,
+            obj,
+            ntype,
+            len(self.entries),
+            f"{parent_path}/{name}",
+        )
+        self.entries.append(entry)
+        self._by_address.setdefault(address, entry)
+        self._by_name.setdefault(name, entry)
+        self._by_parent_name.setdefault((parent, name), entry)
+        self._children.setdefault(parent, []).append(entry)
+        if address in self._children:
+            # Children were inserted before their parent.
+            self._update_paths(entry)
+        self._flattened.clear()
+        return entry
+
+    def rename(self, address, name):
+        """
+        Rename an item, updating the name indexes and the paths below it.
+
+        |  address: item id
+        |  name: new item name
+
+        Returns the entry, or None if the address is not registered.
+        """
+        entry = self._by_address.get(address)
+        if entry is None or entry.name == name:
+            return entry
+        old_name = entry.name
+        entry.name = name
+
+        if self._by_name.get(old_name) is entry:
+            del self._by_name[old_name]
+            for other in self.entries:
+                if other.name == old_name:
+                    self._by_name[old_name] = other
+                    break
+        old_key = (entry.parent, old_name)
+        if self._by_parent_name.get(old_key) is entry:
+            del self._by_parent_name[old_key]
+            for other in self.children(entry.parent):
+                if other.name == old_name:
+                    self._by_parent_name[old_key] = other
+                    break
+        current = self._by_name.get(name)
+        if current is None or current.index > entry.index:
+            self._by_name[name] = entry
+        current = self._by_parent_name.get((entry.parent, name))
+        if current is None or current.index > entry.index:
+            self._by_parent_name[(entry.parent, name)] = entry
+
+        parent_entry = self._by_address.get(entry.parent)
+        parent_path = parent_entry.path if parent_entry is not None else ""
+        entry.path = f"{parent_path}/{name}"
+        self._update_paths(entry)
+        self._flattened.clear()
+        return entry
+
+    def remove(self, addresses):
+        """
+        Remove items from the registry.
+
+        The name indexes are rebuilt, so a removed item's name resolves to
+        the next item with that name. Items below a removed folder stay
+        registered under the old parent.
+
+        |  addresses: The ids of the items to remove.
+
+        Returns the list of removed entries.
+        """
+        removed = [entry for entry in self.entries if entry.address in addresses]
+        if not removed:
+            return removed
+        gone = {entry.address for entry in removed}
+        self.entries = [entry for entry in self.entries if entry.address not in gone]
+        self._by_address = {}
+        self._by_name = {}
+        self._by_parent_name = {}
+        for index, entry in enumerate(self.entries):
+            entry.index = index
+            self._by_address.setdefault(entry.address, entry)
+            self._by_name.setdefault(entry.name, entry)
+            self._by_parent_name.setdefault((entry.parent, entry.name), entry)
+        for entry in removed:
+            siblings = self._children.get(entry.parent)
+            if siblings is not None and entry in siblings:
+                siblings.remove(entry)
+        for links in (self._member_groups, self._controller_groups):
+            for address in gone.intersection(links):
+                del links[address]
+            for address, groups in links.items():
+                if not gone.isdisjoint(groups):
+                    links[address] = [group for group in groups if group not in gone]
+        self._flattened.clear()
+        return removed
+
+    def _update_paths(self, entry):
+        """Recompute the paths of all of the items below an entry."""
+        stack = [entry]
+        while stack:
+            parent = stack.pop()
+            for child in self._children.get(parent.address, []):
+                child.path = f"{parent.path}/{child.name}"
+                stack.append(child)
+
+    def add_group_links(self, group, members, controllers):
+        """
+        Index the members and controllers of a group.
+
+        |  group: The group address.
+        |  members: List of the addresses of the group's members.
+        |  controllers: List of the addresses of the group's controllers.
+        """
+        for address in dict.fromkeys(members):
+            self._member_groups.setdefault(address, []).append(group)
+        for address in dict.fromkeys(controllers):
+            self._controller_groups.setdefault(address, []).append(group)
+
+    def remove_group_links(self, group):
+        """
+        Forget the members and controllers of a group.
+
+        |  group: The group address.
+        """
+        for links in (self._member_groups, self._controller_groups):
+            for address, groups in list(links.items()):
+                if group in groups:
+                    groups = [other for other in groups if other != group]
+                    if groups:
+                        links[address] = groups
+                    else:
+                        del links[address]
+
+    def groups_of(self, address, controller=True, responder=True):
+        """
+        Return the addresses of the groups a node belongs to.
+
+        |  address: The node address.
+        |  controller: Include the groups the node is a controller of.
+        |  responder: Include the groups the node is a member of.
+        """
+        if responder and not controller:
+            return list(self._member_groups.get(address, []))
+        if controller and not responder:
+            return list(self._controller_groups.get(address, []))
+        if not controller:
+            return []
+        groups = dict.fromkeys(self._member_groups.get(address, []))
+        groups.update(dict.fromkeys(self._controller_groups.get(address, [])))
+        return list(groups)
+
+    def get(self, address):
+        """Return the entry with the given address, or None."""
+        return self._by_address.get(address)
+
+    def get_by_name(self, name, parent=None, any_parent=False):
+        """
+        Return the entry with the given name, or None.
+
+        |  name: The name to look for.
+        |  parent: The parent the item must be a child of.
+        |  any_parent: Search the whole tree instead of a single parent.
+        """
+        if any_parent:
+            return self._by_name.get(name)
+        return self._by_parent_name.get((parent, name))
+
+    def has_name(self, name):
+        """Return if any item has the given name."""
+        return name in self._by_name
+
+    def children(self, parent):
+        """Return the entries that are direct children of the given parent."""
+        return self._children.get(parent, [])
+
+    def has_children(self, parent):
+        """Return if the given parent has any children."""
+        return bool(self._children.get(parent))
+
+    def flatten(self, root, leaf_types, expand_types=()):
+        """
+        Return the items below a root in tree order.
+
+        Items of a leaf type are listed and any other item is treated as a
+        folder and descended into. Items of an expand type also list their
+        direct children.
+
+        |  root: The root address (None for the top level).
+        |  leaf_types: Tuple of the item types to list.
+        |  expand_types: [optional] Tuple of the item types to expand.
+
+        Returns a list of (type, path, address) tuples, with paths relative
+        to the root, and a parallel list of the item objects. The lists are
+        cached until the registry changes and must not be modified.
+        """
+        key = (root, leaf_types, expand_types)
+        cached = self._flattened.get(key)
+        if cached is not None:
+            return cached
+
+        offset = 0
+        if root is not None:
+            root_entry = self._by_address[root]
+            offset = len(root_entry.path) - len(root_entry.name)
+
+        items = []
+        objects = []
+        stack = [iter(self.children(root))]
+        while stack:
+            entry = next(stack[-1], None)
+            if entry is None:
+                stack.pop()
+                continue
+            if entry.ntype not in leaf_types:
+                stack.append(iter(self.children(entry.address)))
+                continue
+            items.append((entry.ntype, entry.path[offset:], entry.address))
+            objects.append(entry.obj)
+            if entry.ntype in expand_types:
+                for child in self.children(entry.address):
+                    items.append((child.ntype, child.path[offset:], child.address))
+                    objects.append(child.obj)
+
+        self._flattened[key] = (items, objects)
+        return items, objects
+
+    @property
+    def addresses(self):
+        """Return a read-only view of the item addresses."""
+        return RegistryView(self, "address")
+
+    @property
+    def names(self):
+        """Return a read-only view of the item names."""
+        return RegistryView(self, "name")
+
+    @property
+    def parents(self):
+        """Return a read-only view of the item parents."""
+        return RegistryView(self, "parent")
+
+    @property
+    def objects(self):
+        """Return a read-only view of the item objects."""
+        return RegistryView(self, "obj")
+
+    @property
+    def types(self):
+        """Return a read-only view of the item types."""
+        return RegistryView(self, "ntype")
@@ -0,0 +1,154 @@
+"""Columnar store of the node states for snapshots and bulk reads."""
+from array import array
+from math import nan
+
+INITIAL_CAPACITY = 64
+
+COLUMN_TYPES = {
+    "status": "d",
+    "prec": "b",
+    "uom": "H",
+    "last_changed": "d",
+}
+
+
+class StateStore:
+    """
+    Columnar store of the current state of every node.
+
+    Each node is given a stable slot when it is added, and its state is
+    written to that slot of each column when it changes. The columns are
+    `array.array` buffers, so they can be read without copying, e.g. with
+    `numpy.frombuffer(snapshot["status"])`.
+
+    Columns:
+    |  status: The node status as a float ('d'). Unknown is -inf, and a
+       status which is not a number is NaN.
+    |  prec: The precision of the status ('b').
+    |  uom: The unit of measure as a code into `uoms` ('H').
+    |  last_changed: The POSIX timestamp of the last change ('d').
+
+    :ivar addresses: The node address for each slot.
+    :ivar uoms: The unit of measure string for each uom code.
+    """
+
+    __slots__ = ("_capacity", "_columns", "_slots", "_uom_codes", "addresses", "uoms")
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        """Initialize a StateStore class."""
+        self._capacity = max(capacity, 1)
+        self._columns = {
+            name: array(typecode, bytes(array(typecode).itemsize * self._capacity))
+            for name, typecode in COLUMN_TYPES.items()
+        }
+        self._slots = {}
+        self._uom_codes = {}
+        self.addresses = []
+        self.uoms = []
+
+    def __len__(self):
+        """Return the number of nodes in the store."""
+        return len(self.addresses)
+
+    def __contains__(self, address):
+        """Return if a node is in the store."""
+        return address in self._slots
+
+    def slot(self, address):
+        """Return the slot of a node, or None if it is not in the store."""
+        return self._slots.get(address)
+
+    def add(self, node):
+        """
+        Add a node to the store and write its current state.
+
+        |  node: The Node to add.
+
+        Returns the slot of the node.
+        """
+        slot = self._slots.get(node.address)
+        if slot is None:
+            slot = len(self.addresses)
+            if slot >= self._capacity:
+                self._grow()
+            self._slots[node.address] = slot
+            self.addresses.append(node.address)
+        self.write(node)
+        return slot
+
+    def remove(self, address):
+        """
+        Remove a node from the store.
+
+        The node in the last slot is moved to the freed slot, so the columns
+        stay contiguous.
+
+        |  address: The address of the node to remove.
+        """
+        slot = self._slots.pop(address, None)
+        if slot is None:
+            return
+        last = len(self.addresses) - 1
+        moved = self.addresses.pop()
+        if slot != last:
+            self.addresses[slot] = moved
+            self._slots[moved] = slot
+            for column in self._columns.values():
+                column[slot] = column[last]
+
+    def write(self, node):
+        """Write the current state of a node to its slot."""
+        slot = self._slots.get(node.address)
+        if slot is None:
+            return
+        columns = self._columns
+        try:
+            columns["status"][slot] = float(node.status)
+        except (TypeError, ValueError):
+            columns["status"][slot] = nan
+        try:
+            columns["prec"][slot] = int(node.prec)
+        except (TypeError, ValueError, OverflowError):
+            columns["prec"][slot] = 0
+        columns["uom"][slot] = self._uom_code(node.uom)
+        columns["last_changed"][slot] = node.last_changed.timestamp()
+
+    def snapshot(self, copy=False):
+        """
+        Return the current state of all of the nodes.
+
+        Returns a dict with the node `addresses`, the `uoms` lookup list and
+        a `memoryview` of each column, limited to the nodes in the store.
+        The views share memory with the store and keep reflecting changes
+        until the store grows to fit more nodes.
+
+        |  copy: [optional] Return copies of the columns instead of views.
+        """
+        count = len(self.addresses)
+        result = {"addresses": self.addresses[:], "uoms": self.uoms[:]}
+        for name, column in self._columns.items():
+            view = memoryview(column)[:count]
+            result[name] = array(column.typecode, view) if copy else view
+        return result
+
+    def _grow(self):
+        """Double the capacity of the columns."""
+        # The arrays are copied rather than resized, since resizing an
+        # array is not allowed while a snapshot view of it exists.
+        capacity = self._capacity * 2
+        for name, column in self._columns.items():
+            grown = array(column.typecode, column)
+            grown.frombytes(bytes(column.itemsize * (capacity - self._capacity)))
+            self._columns[name] = grown
+        self._capacity = capacity
+
+    def _uom_code(self, uom):
+        """Return the code for a unit of measure, adding it if needed."""
+        if isinstance(uom, list):
+            uom = "/".join(uom)
+        code = self._uom_codes.get(uom)
+        if code is None:
+            code = len(self.uoms)
+            self._uom_codes[uom] = code
+            self.uoms.append(uom)
+        return code
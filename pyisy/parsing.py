@@ -0,0 +1,92 @@
+"""Incremental XML parsing for the ISY REST responses."""
+from xml.etree.ElementTree import XMLPullParser
+
+XML_CHUNK_SIZE = 65536
+
+
+class ElementStream:
+    """
+    Incremental XML parser which emits the requested elements as they complete.
+
+    Data can be fed in as many pieces as needed. Each element with one of
+    the requested tags is returned once its closing tag has been parsed and
+    is detached from its parent, so the parser does not keep the whole
+    document tree in memory.
+
+    An ElementStream can be passed as the `stream_to` consumer of
+    `Connection.request` to parse a response while it is being received.
+
+    |  tags: Iterable of the element tags to emit.
+    |  callback: [optional] Function called with each completed element
+       instead of returning the elements from `feed` and `close`.
+    """
+
+    def __init__(self, tags, callback=None):
+        """Initialize an ElementStream class."""
+        self._tags = frozenset(tags)
+        self._callback = callback
+        self._parser = None
+        self._stack = []
+        self.reset()
+
+    def reset(self):
+        """Discard any partial data and start a new document."""
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._stack = []
+
+    def feed(self, data):
+        """
+        Feed data to the parser.
+
+        Returns a list of the requested elements completed by this data
+        (always empty when a callback is used).
+        Raises `xml.etree.ElementTree.ParseError` if the data is invalid.
+        """
+        self._parser.feed(data)
+        return self._read_events()
+
+    def close(self):
+        """
+        Finish the document.
+
+        Returns a list of any remaining requested elements (always empty
+        when a callback is used).
+        Raises `xml.etree.ElementTree.ParseError` if the document is incomplete.
+        """
+        self._parser.close()
+        return self._read_events()
+
+    def _read_events(self):
+        """Collect the completed elements and release them from the tree."""
+        found = []
+        stack = self._stack
+        for event, element in self._parser.read_events():
+            if event == "start":
+                stack.append(element)
+                continue
+            stack.pop()
+            if element.tag not in self._tags:
+                continue
+            if stack:
+                stack[-1].remove(element)
+            if self._callback is not None:
+                self._callback(element)
+            else:
+                found.append(element)
+        return found
+
+
+def iterparse(xml, tags, chunk_size=XML_CHUNK_SIZE):
+    """
+    Parse an XML string and yield the requested elements in document order.
+
+    |  xml: String of the xml data
+    |  tags: Iterable of the element tags to yield.
+    |  chunk_size: [optional] Number of characters to parse at a time.
+
+    Raises `xml.etree.ElementTree.ParseError` if the data is invalid.
+    """
+    stream = ElementStream(tags)
+    for start in range(0, len(xml), chunk_size):
+        yield from stream.feed(xml[start : start + chunk_size])
+    yield from stream.close()
@@ -1,6 +1,6 @@
 """Init for management of ISY Programs."""
 import asyncio
-from xml.dom import minidom
+from datetime import datetime
 
 from dateutil import parser
 
@@ -13,23 +13,35 @@ from ..constants import (
     TAG_ENABLED,
     TAG_FOLDER,
     TAG_NAME,
+    TAG_PRGM_DISABLED,
+    TAG_PRGM_ENABLED,
     TAG_PRGM_FINISH,
     TAG_PRGM_RUN,
     TAG_PRGM_RUNNING,
     TAG_PRGM_STATUS,
     TAG_PROGRAM,
     UPDATE_INTERVAL,
-    XML_OFF,
-    XML_ON,
     XML_TRUE,
 )
 from ..exceptions import XML_ERRORS, XML_PARSE_ERROR, ISYResponseParseError
-from ..helpers import attr_from_element, now, value_from_xml
+from ..helpers import Debouncer, now, value_from_element
 from ..nodes import NodeIterator as ProgramIterator
+from ..nodes.registry import NodeRegistry
+from ..parsing import iterparse
 from .folder import Folder
 from .program import Program
 
 
+def time_to_cache(value):
+    """Return a program time for the inventory cache."""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def time_from_cache(value):
+    """Return a program time from the inventory cache."""
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
 class Programs:
     """
     This class handles the ISY programs.
@@ -41,11 +53,7 @@ class Programs:
 
     |  isy: The ISY device class
     |  root: Program/Folder ID representing the current level of navigation.
-    |  addresses: List of program and folder IDs.
-    |  pnames: List of the program and folder names.
-    |  pparents: List of the program and folder parent IDs.
-    |  pobjs: List of program and folder objects.
-    |  ptypes: List of the program and folder types.
+    |  registry: [optional] NodeRegistry shared with the parent navigation level
     |  xml: XML string from the controller detailing the programs and folders.
 
     :ivar all_lower_programs: A list of all programs below the current
@@ -55,47 +63,56 @@ class Programs:
     :ivar leaf: The child object representing the current item in navigation.
                 This is useful for getting a folder to act as a program.
     :ivar name: The name of the program at the current level of navigation.
+    :ivar addresses: Read-only list view of the program and folder IDs.
+    :ivar pnames: Read-only list view of the program and folder names.
+    :ivar pparents: Read-only list view of the program and folder parent IDs.
+    :ivar pobjs: Read-only list view of the program and folder objects.
+    :ivar ptypes: Read-only list view of the program and folder types.
     """
 
-    def __init__(
-        self,
-        isy,
-        root=None,
-        addresses=None,
-        pnames=None,
-        pparents=None,
-        pobjs=None,
-        ptypes=None,
-        xml=None,
-    ):
+    def __init__(self, isy, root=None, registry=None, xml=None):
         """Initialize the Programs ISY programs manager class."""
         self.isy = isy
         self.root = root
-
-        self.addresses = []
-        self.pnames = []
-        self.pparents = []
-        self.pobjs = []
-        self.ptypes = []
+        self._registry = registry if registry is not None else NodeRegistry()
+        self._refresher = Debouncer(self._refresh)
 
         if xml is not None:
             self.parse(xml)
-            return
 
-        self.addresses = addresses
-        self.pnames = pnames
-        self.pparents = pparents
-        self.pobjs = pobjs
-        self.ptypes = ptypes
+    @property
+    def addresses(self):
+        """Return a read-only view of the program and folder ids."""
+        return self._registry.addresses
+
+    @property
+    def pnames(self):
+        """Return a read-only view of the program and folder names."""
+        return self._registry.names
+
+    @property
+    def pparents(self):
+        """Return a read-only view of the program and folder parents."""
+        return self._registry.parents
+
+    @property
+    def pobjs(self):
+        """Return a read-only view of the program and folder objects."""
+        return self._registry.objects
+
+    @property
+    def ptypes(self):
+        """Return a read-only view of the program and folder types."""
+        return self._registry.types
 
     def __str__(self):
         """Return a string representation of the program manager."""
         if self.root is None:
             return "Folder <root>"
-        ind = self.addresses.index(self.root)
-        if self.ptypes[ind] == TAG_FOLDER:
+        ntype = self._registry.get(self.root).ntype
+        if ntype == TAG_FOLDER:
             return f"Folder ({self.root})"
-        if self.ptypes[ind] == TAG_PROGRAM:
+        if ntype == TAG_PROGRAM:
             return f"Program ({self.root})"
         return ""
 
@@ -136,43 +153,46 @@ class Programs:
         Does not iterate folders. Only Programs that are beneath the current
         folder in navigation.
         """
-        iter_data = self.all_lower_programs
-        return ProgramIterator(self, iter_data, delta=1)
+        iter_data, objects = self._registry.flatten(self.root, (TAG_PROGRAM,))
+        return ProgramIterator(self, iter_data, delta=1, objects=objects)
 
     def __reversed__(self):
         """Return an iterator that goes in reverse order."""
-        iter_data = self.all_lower_programs
-        return ProgramIterator(self, iter_data, delta=-1)
+        iter_data, objects = self._registry.flatten(self.root, (TAG_PROGRAM,))
+        return ProgramIterator(self, iter_data, delta=-1, objects=objects)
 
-    def update_received(self, xmldoc):
+    def update_received(self, event):
         """Update programs from EventStream message."""
-        xml = xmldoc.toxml()
-        address = value_from_xml(xmldoc, ATTR_ID).zfill(4)
+        address = event.info(ATTR_ID).text.zfill(4)
         try:
             pobj = self.get_by_id(address).leaf
         except ValueError:
-            pobj = None  # this is a new program that hasn't been registered
+            # this is a new program that hasn't been registered
+            self.refresh(address)
+            return
 
         if isinstance(pobj, Program):
             new_status = False
-            if f"<{TAG_PRGM_STATUS}>" in xml:
-                status = value_from_xml(xmldoc, TAG_PRGM_STATUS)
-                if status == "21":
+            status = event.info(TAG_PRGM_STATUS)
+            if status is not None:
+                if status.text == "21":
                     pobj.ran_then += 1
                     new_status = True
-                elif status == "31":
+                elif status.text == "31":
                     pobj.ran_else += 1
 
-            if f"<{TAG_PRGM_RUN}>" in xml:
-                pobj.last_run = parser.parse(value_from_xml(xmldoc, TAG_PRGM_RUN))
+            last_run = event.info(TAG_PRGM_RUN)
+            if last_run is not None:
+                pobj.last_run = parser.parse(last_run.text)
 
-            if f"<{TAG_PRGM_FINISH}>" in xml:
-                pobj.last_finished = parser.parse(
-                    value_from_xml(xmldoc, TAG_PRGM_FINISH)
-                )
+            last_finished = event.info(TAG_PRGM_FINISH)
+            if last_finished is not None:
+                pobj.last_finished = parser.parse(last_finished.text)
 
-            if XML_ON in xml or XML_OFF in xml:
-                pobj.enabled = XML_ON in xml
+            if event.info(TAG_PRGM_ENABLED) is not None:
+                pobj.enabled = True
+            elif event.info(TAG_PRGM_DISABLED) is not None:
+                pobj.enabled = False
 
             # Update Status last and make sure the change event fires, but only once.
             if pobj.status != new_status:
@@ -188,71 +208,133 @@ class Programs:
         Parse the XML from the controller and updates the state of the manager.
 
         xml: XML string from the controller.
+
+        Returns the set of program and folder IDs received.
         """
+        plastup = now()
+        received = set()
+
         try:
-            xmldoc = minidom.parseString(xml)
+            for feature in iterparse(xml, (TAG_PROGRAM,)):
+                received.add(self._parse_feature(feature, plastup))
         except XML_ERRORS:
             _LOGGER.error("%s: Programs", XML_PARSE_ERROR)
             raise ISYResponseParseError(XML_PARSE_ERROR)
 
-        plastup = now()
+        _LOGGER.info("ISY Loaded/Updated Programs")
+        return received
 
-        # get nodes
-        features = xmldoc.getElementsByTagName(TAG_PROGRAM)
-        for feature in features:
-            # id, name, and status
-            address = attr_from_element(feature, ATTR_ID)
-            pname = value_from_xml(feature, TAG_NAME)
-            pparent = attr_from_element(feature, ATTR_PARENT)
-            pstatus = attr_from_element(feature, ATTR_STATUS) == XML_TRUE
+    def _parse_feature(self, feature, plastup):
+        """Add or update a single program or folder element. Returns its ID."""
+        # id, name, and status
+        address = feature.get(ATTR_ID)
+        pname = value_from_element(feature, TAG_NAME)
+        pparent = feature.get(ATTR_PARENT)
+        pstatus = feature.get(ATTR_STATUS) == XML_TRUE
 
-            if attr_from_element(feature, TAG_FOLDER) == XML_TRUE:
-                # folder specific parsing
-                ptype = TAG_FOLDER
-                data = {"pstatus": pstatus, "plastup": plastup}
+        if feature.get(TAG_FOLDER) == XML_TRUE:
+            # folder specific parsing
+            ptype = TAG_FOLDER
+            data = {"pstatus": pstatus, "plastup": plastup}
 
+        else:
+            # program specific parsing
+            ptype = TAG_PROGRAM
+
+            # last run time
+            plastrun = value_from_element(feature, "lastRunTime", EMPTY_TIME)
+            if plastrun != EMPTY_TIME:
+                plastrun = parser.parse(plastrun)
+
+            # last finish time
+            plastfin = value_from_element(feature, "lastFinishTime", EMPTY_TIME)
+            if plastfin != EMPTY_TIME:
+                plastfin = parser.parse(plastfin)
+
+            # enabled, run at startup, running
+            penabled = bool(feature.get(TAG_ENABLED) == XML_TRUE)
+            pstartrun = bool(feature.get("runAtStartup") == XML_TRUE)
+            prunning = bool(feature.get(TAG_PRGM_RUNNING) != "idle")
+
+            # create data dictionary
+            data = {
+                "pstatus": pstatus,
+                "plastrun": plastrun,
+                "plastfin": plastfin,
+                "penabled": penabled,
+                "pstartrun": pstartrun,
+                "prunning": prunning,
+                "plastup": plastup,
+            }
+
+        # add or update object if it already exists
+        if address not in self._registry:
+            if ptype == TAG_FOLDER:
+                pobj = Folder(self, address, pname, **data)
             else:
-                # program specific parsing
-                ptype = TAG_PROGRAM
-
-                # last run time
-                plastrun = value_from_xml(feature, "lastRunTime", EMPTY_TIME)
-                if plastrun != EMPTY_TIME:
-                    plastrun = parser.parse(plastrun)
-
-                # last finish time
-                plastfin = value_from_xml(feature, "lastFinishTime", EMPTY_TIME)
-                if plastfin != EMPTY_TIME:
-                    plastfin = parser.parse(plastfin)
-
-                # enabled, run at startup, running
-                penabled = bool(attr_from_element(feature, TAG_ENABLED) == XML_TRUE)
-                pstartrun = bool(attr_from_element(feature, "runAtStartup") == XML_TRUE)
-                prunning = bool(attr_from_element(feature, TAG_PRGM_RUNNING) != "idle")
-
-                # create data dictionary
-                data = {
-                    "pstatus": pstatus,
-                    "plastrun": plastrun,
-                    "plastfin": plastfin,
-                    "penabled": penabled,
-                    "pstartrun": pstartrun,
-                    "prunning": prunning,
-                    "plastup": plastup,
+                pobj = Program(self, address, pname, **data)
+            self.insert(address, pname, pparent, pobj, ptype)
+        else:
+            self.rename(address, pname)
+            pobj = self.get_by_id(address).leaf
+            pobj.update_from_data(data)
+        return address
+
+    def to_cache(self, exclude=()):
+        """
+        Return the programs and folders for the inventory cache.
+
+        |  exclude: [optional] IDs to leave out.
+
+        Returns a list of JSON serializable dicts.
+        """
+        items = []
+        for entry in self._registry.entries:
+            if entry.address in exclude:
+                continue
+            pobj = entry.obj
+            data = {"pstatus": pobj.status}
+            if entry.ntype == TAG_PROGRAM:
+                data.update(
+                    plastrun=time_to_cache(pobj.last_run),
+                    plastfin=time_to_cache(pobj.last_finished),
+                    penabled=pobj.enabled,
+                    pstartrun=pobj.run_at_startup,
+                    prunning=pobj.running,
+                )
+            items.append(
+                {
+                    "type": entry.ntype,
+                    "address": entry.address,
+                    "name": entry.name,
+                    "parent": entry.parent,
+                    "data": data,
                 }
+            )
+        return items
 
-            # add or update object if it already exists
-            if address not in self.addresses:
-                if ptype == TAG_FOLDER:
-                    pobj = Folder(self, address, pname, **data)
-                else:
-                    pobj = Program(self, address, pname, **data)
-                self.insert(address, pname, pparent, pobj, ptype)
-            else:
-                pobj = self.get_by_id(address).leaf
-                asyncio.create_task(pobj.update(data=data))
+    def load_cache(self, items):
+        """
+        Add the programs and folders from the inventory cache.
 
-            _LOGGER.info("ISY Loaded/Updated Programs")
+        Items which are already loaded are skipped.
+
+        |  items: List of dicts from `to_cache`.
+        """
+        plastup = now()
+        for item in items:
+            address = item["address"]
+            if address in self._registry:
+                continue
+            data = dict(item["data"], plastup=plastup)
+            if item["type"] == TAG_FOLDER:
+                pobj = Folder(self, address, item["name"], **data)
+            else:
+                data["plastrun"] = time_from_cache(data["plastrun"])
+                data["plastfin"] = time_from_cache(data["plastfin"])
+                pobj = Program(self, address, item["name"], **data)
+            self.insert(address, item["name"], item["parent"], pobj, item["type"])
+        _LOGGER.debug("ISY Loaded Programs from cache")
 
     async def update(self, wait_time=UPDATE_INTERVAL, address=None):
         """
@@ -269,6 +351,30 @@ class Programs:
         else:
             _LOGGER.warning("ISY Failed to update programs.")
 
+    def refresh(self, address=None, wait_time=UPDATE_INTERVAL):
+        """
+        Schedule a reload of the programs from the controller.
+
+        Requests made before the reload starts are merged, so a burst of
+        events results in a single request. A reload of all of the programs
+        replaces any pending reloads of single programs or folders.
+
+        |  address: [optional] The program or folder ID to reload (a folder
+           is reloaded with its subfolders). All programs if not given.
+        |  wait_time: [optional] Seconds to wait for more requests to merge.
+
+        Returns the task performing the reload.
+        """
+        return self._refresher.request(address, wait_time)
+
+    async def _refresh(self, addresses):
+        """Perform the pending reloads."""
+        if None in addresses:
+            await self.update(wait_time=0)
+            return
+        for address in sorted(addresses):
+            await self.update(wait_time=0, address=address)
+
     def insert(self, address, pname, pparent, pobj, ptype):
         """
         Insert a new program or folder into the manager.
@@ -279,11 +385,27 @@ class Programs:
         |  pobj: The object representing the program or folder.
         |  ptype: The type of the item being added (program/folder).
         """
-        self.addresses.append(address)
-        self.pnames.append(pname)
-        self.pparents.append(pparent)
-        self.ptypes.append(ptype)
-        self.pobjs.append(pobj)
+        self._registry.insert(address, pname, pparent, pobj, ptype)
+
+    def remove(self, addresses):
+        """
+        Remove programs and folders which no longer exist.
+
+        |  addresses: The IDs of the programs and folders to remove.
+        """
+        for entry in self._registry.remove(addresses):
+            _LOGGER.debug("ISY Removed %s %s", entry.ntype, entry.address)
+
+    def rename(self, address, pname):
+        """
+        Rename a program or folder.
+
+        |  address: The ID of the program or folder.
+        |  pname: The new name of the program or folder.
+        """
+        entry = self._registry.rename(address, pname)
+        if entry is not None and entry.obj is not None:
+            entry.obj.name = pname
 
     def __getitem__(self, val):
         """
@@ -291,19 +413,16 @@ class Programs:
 
         |  val: Name or ID to navigate to.
         """
-        try:
-            self.addresses.index(val)
+        if val in self._registry:
             fun = self.get_by_id
-        except ValueError:
+        elif self._registry.has_name(val):
+            fun = self.get_by_name
+        else:
             try:
-                self.pnames.index(val)
-                fun = self.get_by_name
-            except ValueError:
-                try:
-                    val = int(val)
-                    fun = self.get_by_index
-                except (TypeError, ValueError) as err:
-                    raise KeyError("Unrecognized Key: " + str(val)) from err
+                val = int(val)
+                fun = self.get_by_index
+            except (TypeError, ValueError) as err:
+                raise KeyError("Unrecognized Key: " + str(val)) from err
 
         try:
             return fun(val)
@@ -320,12 +439,12 @@ class Programs:
 
         |  val: The name of the child program/folder to look for.
         """
-        for i in range(len(self.addresses)):
-            if (self.root is None or self.pparents[i] == self.root) and self.pnames[
-                i
-            ] == val:
-                return self.get_by_index(i)
-        return None
+        entry = self._registry.get_by_name(
+            val, parent=self.root, any_parent=self.root is None
+        )
+        if entry is None:
+            return None
+        return self._get_entry_object(entry)
 
     def get_by_id(self, address):
         """
@@ -333,8 +452,10 @@ class Programs:
 
         |  address: The program/folder ID to look for.
         """
-        i = self.addresses.index(address)
-        return self.get_by_index(i)
+        entry = self._registry.get(address)
+        if entry is None:
+            raise ValueError(f"{address!r} is not in list")
+        return self._get_entry_object(entry)
 
     def get_by_index(self, i):
         """
@@ -342,57 +463,40 @@ class Programs:
 
         |  i: The program/folder index.
         """
-        if self.ptypes[i] == TAG_FOLDER:
-            return Programs(
-                self.isy,
-                self.addresses[i],
-                self.addresses,
-                self.pnames,
-                self.pparents,
-                self.pobjs,
-                self.ptypes,
-            )
-        return self.pobjs[i]
+        return self._get_entry_object(self._registry.entries[i])
+
+    def _get_entry_object(self, entry):
+        """Return the object for a registry entry or a navigation level."""
+        if entry.ntype == TAG_FOLDER:
+            return Programs(self.isy, entry.address, self._registry)
+        return entry.obj
 
     @property
     def children(self):
         """Return the children of the class."""
-        out = []
-        for ind in range(len(self.pnames)):
-            if self.pparents[ind] == self.root:
-                out.append((self.ptypes[ind], self.pnames[ind], self.addresses[ind]))
-        return out
+        return [
+            (entry.ntype, entry.name, entry.address)
+            for entry in self._registry.children(self.root)
+        ]
 
     @property
     def leaf(self):
         """Return the leaf property."""
         if self.root is not None:
-            ind = self.addresses.index(self.root)
-            if self.pobjs[ind] is not None:
-                return self.pobjs[ind]
+            entry = self._registry.get(self.root)
+            if entry.obj is not None:
+                return entry.obj
         return self
 
     @property
     def name(self):
         """Return the name of the path."""
         if self.root is not None:
-            ind = self.addresses.index(self.root)
-            return self.pnames[ind]
+            return self._registry.get(self.root).name
         return ""
 
     @property
     def all_lower_programs(self):
         """Return all lower programs in a path."""
-        output = []
-        myname = self.name + "/"
-
-        for dtype, name, ident in self.children:
-            if dtype == TAG_PROGRAM:
-                output.append((dtype, myname + name, ident))
-
-            else:
-                output += [
-                    (dtype2, myname + name2, ident2)
-                    for (dtype2, name2, ident2) in self[ident].all_lower_programs
-                ]
-        return output
+        items, _ = self._registry.flatten(self.root, (TAG_PROGRAM,))
+        return list(items)
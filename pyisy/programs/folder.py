@@ -35,6 +35,17 @@ class Folder:
 
     dtype = TAG_FOLDER
 
+    __slots__ = (
+        "_id",
+        "_last_changed",
+        "_last_update",
+        "_name",
+        "_programs",
+        "_status",
+        "isy",
+        "status_events",
+    )
+
     def __init__(self, programs, address, pname, pstatus, plastup):
         """Initialize the Folder class."""
         self._id = address
@@ -89,6 +100,13 @@ class Folder:
         """Return the name of the Node."""
         return self._name
 
+    @name.setter
+    def name(self, value):
+        """Set the name of the Node."""
+        if self._name != value:
+            self._name = value
+        return self._name
+
     @property
     def protocol(self):
         """Return the protocol for this entity."""
@@ -125,11 +143,24 @@ class Folder:
         |  wait_time: [optional] Seconds to wait before updating.
         """
         if data is not None:
-            self._last_changed = now()
-            self.status = data["pstatus"]
+            self.update_from_data(data)
             return
         await self._programs.update(wait_time=wait_time, address=self._id)
 
+    def update_from_data(self, data):
+        """
+        Apply the values parsed from the controller to the folder.
+
+        |  data: The data to update the folder with.
+
+        Returns True if the folder changed (and listeners were notified).
+        """
+        if self._status == data["pstatus"]:
+            return False
+        self._last_changed = now()
+        self.status = data["pstatus"]
+        return True
+
     async def send_cmd(self, command):
         """Run the appropriate clause of the object."""
         req_url = self.isy.conn.compile_url([URL_PROGRAMS, str(self._id), command])
@@ -30,6 +30,16 @@ class Program(Folder):
 
     dtype = TAG_PROGRAM
 
+    __slots__ = (
+        "_enabled",
+        "_last_finished",
+        "_last_run",
+        "_ran_else",
+        "_ran_then",
+        "_run_at_startup",
+        "_running",
+    )
+
     def __init__(
         self,
         programs,
@@ -150,21 +160,41 @@ class Program(Folder):
         |  data: [optional] Data to update the object with.
         """
         if data is not None:
-            self._enabled = data["penabled"]
-            self._last_finished = data["plastfin"]
-            self._last_run = data["plastrun"]
-            self._last_update = data["plastup"]
-            self._run_at_startup = data["pstartrun"]
-            self._running = (data["plastrun"] >= data["plastup"]) or data["prunning"]
-            # Update Status last and make sure the change event fires, but only once.
-            if self.status != data["pstatus"]:
-                self.status = data["pstatus"]
-            else:
-                # Status didn't change, but something did, so fire the event.
-                self.status_events.notify(self.status)
+            self.update_from_data(data)
             return
         await self._programs.update(wait_time, address=self._id)
 
+    def update_from_data(self, data):
+        """
+        Apply the values parsed from the controller to the program.
+
+        |  data: The data to update the program with.
+
+        Returns True if the program changed (and listeners were notified).
+        """
+        running = (data["plastrun"] >= data["plastup"]) or data["prunning"]
+        changed = (
+            self._enabled != data["penabled"]
+            or self._last_finished != data["plastfin"]
+            or self._last_run != data["plastrun"]
+            or self._run_at_startup != data["pstartrun"]
+            or self._running != running
+        )
+        self._enabled = data["penabled"]
+        self._last_finished = data["plastfin"]
+        self._last_run = data["plastrun"]
+        self._last_update = data["plastup"]
+        self._run_at_startup = data["pstartrun"]
+        self._running = running
+        # Update Status last and make sure the change event fires, but only once.
+        if self.status != data["pstatus"]:
+            self.status = data["pstatus"]
+            return True
+        if changed:
+            # Status didn't change, but something did, so fire the event.
+            self.status_events.notify(self.status)
+        return changed
+
     async def enable_run_at_startup(self):
         """Send command to the program to enable it to run at startup."""
         return await self.send_cmd(CMD_ENABLE_RUN_AT_STARTUP)
@@ -0,0 +1,274 @@
+"""Priority scheduling of the requests sent to the ISY."""
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+import time
+
+from .constants import PRIORITY_COMMAND, REQUEST_PRIORITIES, REQUEST_PRIORITY_WEIGHTS
+
+
+class _RequestClass:
+    """The queue and the wait counters of one priority class."""
+
+    __slots__ = (
+        "name",
+        "weight",
+        "waiters",
+        "finish",
+        "granted",
+        "wait_total",
+        "wait_max",
+        "wait_last",
+    )
+
+    def __init__(self, name, weight):
+        """Initialize a _RequestClass class."""
+        self.name = name
+        self.weight = weight
+        self.waiters = deque()
+        self.finish = 0.0
+        self.granted = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_last = 0.0
+
+    @property
+    def metrics(self):
+        """Return the queue length and wait counters."""
+        return {
+            "queued": len(self.waiters),
+            "granted": self.granted,
+            "wait_last": self.wait_last,
+            "wait_max": self.wait_max,
+            "wait_avg": self.wait_total / self.granted if self.granted else 0.0,
+        }
+
+
+class RequestScheduler:
+    """
+    Limit the number of concurrent requests, serving waiting ones by priority.
+
+    Requests are grouped into priority classes (`REQUEST_PRIORITIES`):
+
+    |  command: Interactive commands, like turning a node on.
+    |  refresh: Reloading the state, like `/rest/status` or the variables.
+    |  background: Metadata, like the node list, definitions and notes.
+
+    While requests wait for a connection, each class gets a share of the
+    connections set by `REQUEST_PRIORITY_WEIGHTS`, and the requests of a
+    class are served in order. A class which was idle starts level with
+    the others, so a command sent during a large reload is served next
+    instead of waiting behind the whole reload, while a steady stream of
+    commands cannot hold up the other classes forever.
+
+    The limit adapts to how busy the ISY is (additive increase,
+    multiplicative decrease): it is halved when the ISY reports it is too
+    busy (503) or a request times out, and raised by one after a full
+    limit's worth of requests succeed, staying between `min_limit` and
+    `max_limit`. Only one decrease is made for the requests which were
+    already in flight, since they were all sent under the old limit.
+
+    |  limit: The initial maximum number of concurrent requests.
+    |  min_limit: [optional] The lowest the limit can be lowered to.
+    |  max_limit: [optional] The highest the limit can be raised to, the
+       initial limit if not given.
+
+    :ivar in_flight: The number of requests holding a connection.
+    :ivar increases: The number of times the limit was raised.
+    :ivar decreases: The number of times the limit was lowered.
+    """
+
+    def __init__(self, limit, min_limit=1, max_limit=None):
+        """Initialize a RequestScheduler class."""
+        self._min_limit = max(int(min_limit), 1)
+        self._max_limit = max(int(limit if max_limit is None else max_limit), 1)
+        if self._max_limit < self._min_limit:
+            raise ValueError(
+                f"Invalid request limits: {self._min_limit} to {self._max_limit}"
+            )
+        self._limit = self._clamp(limit)
+        self._classes = {
+            name: _RequestClass(name, REQUEST_PRIORITY_WEIGHTS[name])
+            for name in REQUEST_PRIORITIES
+        }
+        self._virtual_time = 0.0
+        self._successes = 0
+        self._hold = 0
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def limit(self):
+        """Return the maximum number of concurrent requests."""
+        return self._limit
+
+    @limit.setter
+    def limit(self, value):
+        """Set the maximum number of concurrent requests."""
+        self._limit = self._clamp(value)
+        self._successes = 0
+        self._dispatch()
+
+    @property
+    def min_limit(self):
+        """Return the lowest the limit can be lowered to."""
+        return self._min_limit
+
+    @min_limit.setter
+    def min_limit(self, value):
+        """Set the lowest the limit can be lowered to."""
+        value = max(int(value), 1)
+        if value > self._max_limit:
+            raise ValueError(f"Invalid request limits: {value} to {self._max_limit}")
+        self._min_limit = value
+        self.limit = self._limit
+
+    @property
+    def max_limit(self):
+        """Return the highest the limit can be raised to."""
+        return self._max_limit
+
+    @max_limit.setter
+    def max_limit(self, value):
+        """Set the highest the limit can be raised to."""
+        value = int(value)
+        if value < self._min_limit:
+            raise ValueError(f"Invalid request limits: {self._min_limit} to {value}")
+        self._max_limit = value
+        self.limit = self._limit
+
+    @property
+    def queued(self):
+        """Return the number of requests waiting for a connection."""
+        return sum(len(rclass.waiters) for rclass in self._classes.values())
+
+    @property
+    def metrics(self):
+        """Return the limit, the requests in flight and the wait per class."""
+        return {
+            "limit": self._limit,
+            "min_limit": self._min_limit,
+            "max_limit": self._max_limit,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "priorities": {
+                name: rclass.metrics for name, rclass in self._classes.items()
+            },
+        }
+
+    @asynccontextmanager
+    async def slot(self, priority=PRIORITY_COMMAND):
+        """
+        Hold a connection for the duration of the `async with` block.
+
+        |  priority: [optional] The priority class of the request.
+        """
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority=PRIORITY_COMMAND):
+        """
+        Wait for a connection to be available for a request.
+
+        |  priority: [optional] The priority class of the request.
+        """
+        rclass = self._classes.get(priority)
+        if rclass is None:
+            raise ValueError(f"Invalid request priority: {priority}")
+        if self.in_flight < self._limit and not self.queued:
+            self._grant(rclass, 0.0)
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (waiter, time.monotonic())
+        rclass.waiters.append(entry)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as it was cancelled, pass the connection on.
+                self.release()
+            else:
+                try:
+                    rclass.waiters.remove(entry)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self):
+        """Return a connection and start the next waiting request."""
+        self.in_flight -= 1
+        self._dispatch()
+
+    def record_success(self):
+        """Record a request the ISY handled, raising the limit over time."""
+        if self._hold:
+            self._hold -= 1
+        self._successes += 1
+        if self._successes < self._limit:
+            return
+        self._successes = 0
+        if self._limit < self._max_limit:
+            self._limit += 1
+            self.increases += 1
+            self._dispatch()
+
+    def record_overload(self):
+        """Record a request the ISY was too busy for, halving the limit."""
+        self._successes = 0
+        if self._hold:
+            # Already lowered for the requests sent under the old limit.
+            self._hold -= 1
+            return
+        limit = self._clamp(self._limit // 2)
+        if limit < self._limit:
+            self._limit = limit
+            self.decreases += 1
+        self._hold = self.in_flight
+
+    def _clamp(self, limit):
+        """Return a limit within the minimum and maximum limits."""
+        return min(max(int(limit), self._min_limit), self._max_limit)
+
+    def _grant(self, rclass, wait):
+        """Give a connection to a request of a class."""
+        start = max(rclass.finish, self._virtual_time)
+        self._virtual_time = start
+        rclass.finish = start + 1 / rclass.weight
+        rclass.granted += 1
+        rclass.wait_total += wait
+        rclass.wait_last = wait
+        if wait > rclass.wait_max:
+            rclass.wait_max = wait
+        self.in_flight += 1
+
+    def _next_class(self):
+        """Return the waiting class which is due next, or None."""
+        due = None
+        due_start = None
+        for rclass in self._classes.values():
+            if not rclass.waiters:
+                continue
+            start = max(rclass.finish, self._virtual_time)
+            if due is None or start < due_start:
+                due = rclass
+                due_start = start
+        return due
+
+    def _dispatch(self):
+        """Start waiting requests while connections are available."""
+        while self.in_flight < self._limit:
+            rclass = self._next_class()
+            if rclass is None:
+                return
+            waiter, queued_at = rclass.waiters.popleft()
+            if waiter.done():
+                continue
+            self._grant(rclass, time.monotonic() - queued_at)
+            waiter.set_result(None)
@@ -0,0 +1,133 @@
+"""Sharing of identical concurrent requests to the ISY."""
+import asyncio
+
+
+class SharedStream:
+    """
+    Consumer which passes a streamed response on to several consumers.
+
+    Consumers join before the request is sent, so the text is passed on as
+    it arrives and is not kept. An error raised by one consumer removes it
+    and is kept for its caller, so it does not interrupt the response for
+    the others.
+    """
+
+    def __init__(self):
+        """Initialize a SharedStream class."""
+        self._consumers = []
+        self.errors = {}
+
+    def join(self, consumer):
+        """Add a consumer."""
+        consumer.reset()
+        self._consumers.append(consumer)
+
+    def leave(self, consumer):
+        """Stop passing the response to a consumer."""
+        if consumer in self._consumers:
+            self._consumers.remove(consumer)
+
+    def reset(self):
+        """Start a new response, e.g. when the request is retried."""
+        for consumer in self._consumers:
+            consumer.reset()
+
+    def feed(self, text):
+        """Pass a chunk of the response on to the consumers."""
+        for consumer in list(self._consumers):
+            try:
+                consumer.feed(text)
+            except Exception as err:  # pylint: disable=broad-except
+                self.errors[consumer] = err
+                self.leave(consumer)
+
+
+class _Flight:
+    """A request in flight and what its callers share."""
+
+    __slots__ = ("departed", "stream", "task")
+
+    def __init__(self, stream):
+        """Initialize a _Flight class."""
+        self.departed = False
+        self.stream = stream
+        self.task = None
+
+
+class SingleFlight:
+    """
+    Share one in-flight request between concurrent callers of the same URL.
+
+    Callers requesting the same URL before its request starts share that
+    request and its result, instead of sending the same request again. Once
+    the request has started, the next caller starts a new one, so a result
+    always comes from a request sent after the call (e.g. a status refresh
+    after a command never gets the status from before the command).
+
+    :ivar requests: The number of requests sent.
+    :ivar hits: The number of calls which shared a request in flight.
+    """
+
+    def __init__(self):
+        """Initialize a SingleFlight class."""
+        self._flights = {}
+        self.requests = 0
+        self.hits = 0
+
+    @property
+    def in_flight(self):
+        """Return the number of shared requests in flight."""
+        return len(self._flights)
+
+    @property
+    def metrics(self):
+        """Return the request and hit counters."""
+        return {
+            "requests": self.requests,
+            "hits": self.hits,
+            "in_flight": len(self._flights),
+        }
+
+    async def run(self, key, fetch, stream_to=None):
+        """
+        Fetch a result, or join the fetch for the key if it has not started.
+
+        |  key: Key identifying identical requests, e.g. the URL.
+        |  fetch: Coroutine function performing the request, called with the
+           consumer to stream the response to (None if not streamed).
+        |  stream_to: [optional] A consumer with `reset()` and `feed(text)`
+           methods to stream the response to.
+        """
+        key = (key, stream_to is not None)
+        flight = self._flights.get(key)
+        if flight is None or flight.departed:
+            flight = _Flight(SharedStream() if stream_to is not None else None)
+            flight.task = asyncio.get_running_loop().create_task(
+                self._fly(key, flight, fetch)
+            )
+            self._flights[key] = flight
+            self.requests += 1
+        else:
+            self.hits += 1
+        if stream_to is not None:
+            flight.stream.join(stream_to)
+        try:
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if stream_to is not None:
+                flight.stream.leave(stream_to)
+            raise
+        if stream_to is not None:
+            error = flight.stream.errors.pop(stream_to, None)
+            if error is not None:
+                raise error
+        return result
+
+    async def _fly(self, key, flight, fetch):
+        """Perform the shared request."""
+        flight.departed = True
+        try:
+            return await fetch(flight.stream)
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
@@ -0,0 +1,171 @@
+"""Per-phase timing report of the ISY startup."""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+
+from .helpers import now
+
+_CURRENT_PHASE = ContextVar("pyisy_startup_phase", default=None)
+
+
+def current_phase():
+    """Return the startup phase the current task is running in, or None."""
+    return _CURRENT_PHASE.get()
+
+
+@contextmanager
+def parsing():
+    """Add the time spent in the block to the parse time of the phase."""
+    phase = _CURRENT_PHASE.get()
+    begin = time.monotonic()
+    try:
+        yield
+    finally:
+        if phase is not None:
+            phase.parse_time += time.monotonic() - begin
+
+
+class StartupPhase:
+    """
+    The counters of one phase of the startup.
+
+    :ivar name: The name of the phase, e.g. "nodes".
+    :ivar start: Seconds from the start of the startup to the phase starting.
+    :ivar duration: Wall time of the phase in seconds, None while running.
+    :ivar requests: The number of responses received from the ISY.
+    :ivar bytes: The number of bytes received from the ISY.
+    :ivar parse_time: Seconds spent parsing, included in the duration. For
+                      streamed responses this is the time spent in the
+                      parser while the response was received.
+    :ivar count: The number of objects loaded, None if not applicable.
+    """
+
+    __slots__ = (
+        "name",
+        "start",
+        "duration",
+        "requests",
+        "bytes",
+        "parse_time",
+        "count",
+    )
+
+    def __init__(self, name, start):
+        """Initialize a StartupPhase class."""
+        self.name = name
+        self.start = start
+        self.duration = None
+        self.requests = 0
+        self.bytes = 0
+        self.parse_time = 0.0
+        self.count = None
+
+    def add_response(self, size, parse_time=0.0):
+        """Record a response received from the ISY."""
+        self.requests += 1
+        self.bytes += size
+        self.parse_time += parse_time
+
+    def as_dict(self):
+        """Return the counters as a dict."""
+        return {
+            "name": self.name,
+            "start": self.start,
+            "duration": self.duration,
+            "requests": self.requests,
+            "bytes": self.bytes,
+            "parse_time": self.parse_time,
+            "count": self.count,
+        }
+
+
+class StartupReport:
+    """
+    Report of the time, traffic and objects of each phase of the startup.
+
+    Phases which are loaded concurrently overlap, so their durations add up
+    to more than the total duration; `start` shows how they overlap.
+
+    :ivar time: When the startup began.
+    :ivar source: Where the inventory was loaded from, "controller" or "cache".
+    :ivar phases: Dict of the :class:`StartupPhase` by name, in start order.
+    :ivar duration: Total wall time in seconds, None while running.
+    """
+
+    def __init__(self):
+        """Initialize a StartupReport class."""
+        self._begin = time.monotonic()
+        self.time = now()
+        self.source = None
+        self.phases = {}
+        self.duration = None
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Record the work done in the `with` block as a phase.
+
+        Requests sent by the block, including from the tasks it creates,
+        are counted in the phase. Yields the :class:`StartupPhase`.
+
+        |  name: The name of the phase.
+        """
+        begin = time.monotonic()
+        phase = StartupPhase(name, begin - self._begin)
+        self.phases[name] = phase
+        token = _CURRENT_PHASE.set(phase)
+        try:
+            yield phase
+        finally:
+            _CURRENT_PHASE.reset(token)
+            phase.duration = time.monotonic() - begin
+
+    async def run(self, name, coro, count=None):
+        """
+        Await a coroutine as a phase and return its result.
+
+        |  name: The name of the phase.
+        |  coro: The coroutine performing the phase.
+        |  count: [optional] Function returning the number of objects loaded,
+           called once the phase completes.
+        """
+        with self.phase(name) as phase:
+            result = await coro
+            if count is not None:
+                phase.count = count()
+        return result
+
+    def finish(self, source):
+        """Record the end of the startup."""
+        self.source = source
+        self.duration = time.monotonic() - self._begin
+
+    def as_dict(self):
+        """Return the report as a dict, e.g. to store it as JSON."""
+        phases = list(self.phases.values())
+        return {
+            "time": self.time.isoformat(),
+            "source": self.source,
+            "duration": self.duration,
+            "bytes": sum(phase.bytes for phase in phases),
+            "parse_time": sum(phase.parse_time for phase in phases),
+            "phases": [phase.as_dict() for phase in phases],
+        }
+
+    def format(self):
+        """Return the report as a text table."""
+        lines = [
+            f"{'phase':<14}{'start':>9}{'wall':>9}{'parse':>9}"
+            f"{'requests':>10}{'bytes':>12}{'count':>8}"
+        ]
+        for phase in self.phases.values():
+            duration = phase.duration if phase.duration is not None else 0.0
+            count = "" if phase.count is None else phase.count
+            lines.append(
+                f"{phase.name:<14}{phase.start:>8.3f}s{duration:>8.3f}s"
+                f"{phase.parse_time:>8.3f}s{phase.requests:>10}"
+                f"{phase.bytes:>12}{count:>8}"
+            )
+        duration = self.duration if self.duration is not None else 0.0
+        lines.append(f"total ({self.source}): {duration:.3f}s")
+        return "\n".join(lines)
@@ -1,6 +1,6 @@
 """ISY Variables."""
 from asyncio import sleep
-from xml.dom import minidom
+from datetime import datetime
 
 from dateutil import parser
 
@@ -17,7 +17,8 @@ from ..constants import (
     TAG_VARIABLE,
 )
 from ..exceptions import XML_ERRORS, XML_PARSE_ERROR, ISYResponseParseError
-from ..helpers import attr_from_element, attr_from_xml, now, value_from_xml
+from ..helpers import now, value_from_element
+from ..parsing import iterparse
 from .variable import Variable
 
 EMPTY_VARIABLE_RESPONSES = [
@@ -91,54 +92,73 @@ class Variables:
         return out
 
     def parse_definitions(self, xmls):
-        """Parse the XML Variable Definitions from the ISY."""
+        """
+        Parse the XML Variable Definitions from the ISY.
+
+        Returns a dict of the set of IDs defined for each variable type, or
+        None for a type whose definitions could not be read.
+        """
+        received = {}
         for ind in range(2):
+            vtype = ind + 1
             # parse definitions
-            if xmls[ind] is None or xmls[ind] in EMPTY_VARIABLE_RESPONSES:
+            if xmls[ind] is None:
+                received[vtype] = None
+                continue
+            received[vtype] = set()
+            if xmls[ind] in EMPTY_VARIABLE_RESPONSES:
                 # No variables of this type defined.
                 continue
             try:
-                xmldoc = minidom.parseString(xmls[ind])
+                for feature in iterparse(xmls[ind], (TAG_VARIABLE,)):
+                    vid = int(feature.get(ATTR_ID))
+                    self.vnames[vtype][vid] = feature.get(TAG_NAME)
+                    received[vtype].add(vid)
             except XML_ERRORS:
-                _LOGGER.error("%s: Type %s Variables", XML_PARSE_ERROR, ind + 1)
-                continue
-
-            features = xmldoc.getElementsByTagName(TAG_VARIABLE)
-            for feature in features:
-                vid = int(attr_from_element(feature, ATTR_ID))
-                self.vnames[ind + 1][vid] = attr_from_element(feature, TAG_NAME)
+                _LOGGER.error("%s: Type %s Variables", XML_PARSE_ERROR, vtype)
+                received[vtype] = None
+        return received
 
     def parse(self, xml):
-        """Parse XML from the controller with details about the variables."""
+        """
+        Parse XML from the controller with details about the variables.
+
+        Returns the number of existing variables that changed.
+        """
+        changed = 0
         try:
-            xmldoc = minidom.parseString(xml)
+            for feature in iterparse(xml, (ATTR_VAR,)):
+                if self._parse_feature(feature):
+                    changed += 1
         except XML_ERRORS:
             _LOGGER.error("%s: Variables", XML_PARSE_ERROR)
             raise ISYResponseParseError(XML_PARSE_ERROR)
 
-        features = xmldoc.getElementsByTagName(ATTR_VAR)
-        for feature in features:
-            vid = int(attr_from_element(feature, ATTR_ID))
-            vtype = int(attr_from_element(feature, TAG_TYPE))
-            init = value_from_xml(feature, ATTR_INIT)
-            prec = int(value_from_xml(feature, ATTR_PRECISION, 0))
-            val = value_from_xml(feature, ATTR_VAL)
-            ts_raw = value_from_xml(feature, ATTR_TS)
-            t_s = parser.parse(ts_raw)
-            vname = self.vnames[vtype].get(vid, "")
+        _LOGGER.info("ISY Loaded Variables")
+        return changed
 
-            vobj = self.vobjs[vtype].get(vid)
-            if vobj is None:
-                vobj = Variable(self, vid, vtype, vname, init, val, t_s, prec)
-                self.vids[vtype].append(vid)
-                self.vobjs[vtype][vid] = vobj
-            else:
-                vobj.init = init
-                vobj.status = val
-                vobj.prec = prec
-                vobj.last_edited = t_s
+    def _parse_feature(self, feature):
+        """
+        Add or update a single variable element.
 
-        _LOGGER.info("ISY Loaded Variables")
+        Returns True if an existing variable changed.
+        """
+        vid = int(feature.get(ATTR_ID))
+        vtype = int(feature.get(TAG_TYPE))
+        init = int(value_from_element(feature, ATTR_INIT, 0))
+        prec = int(value_from_element(feature, ATTR_PRECISION, 0))
+        val = int(value_from_element(feature, ATTR_VAL, 0))
+        ts_raw = value_from_element(feature, ATTR_TS)
+        t_s = parser.parse(ts_raw)
+        vname = self.vnames[vtype].get(vid, "")
+
+        vobj = self.vobjs[vtype].get(vid)
+        if vobj is None:
+            vobj = Variable(self, vid, vtype, vname, init, val, t_s, prec)
+            self.vids[vtype].append(vid)
+            self.vobjs[vtype][vid] = vobj
+            return False
+        return vobj.update_values(init, val, prec, t_s)
 
     async def update(self, wait_time=0):
         """
@@ -153,23 +173,115 @@ class Variables:
         else:
             _LOGGER.warning("ISY Failed to update variables.")
 
-    def update_received(self, xmldoc):
+    async def reconcile(self):
+        """
+        Bring the variable values up to date with the controller.
+
+        Only the values which differ from the current ones are applied, and
+        the listeners of each changed variable are notified once.
+
+        Returns the number of variables that changed, or None if it failed.
+        """
+        xml = await self.isy.conn.get_variables()
+        if xml is None:
+            _LOGGER.warning("ISY Failed to reconcile variables.")
+            return None
+        try:
+            return self.parse(xml)
+        except ISYResponseParseError:
+            return None
+
+    def to_cache(self, exclude=()):
+        """
+        Return the variable names and values for the inventory cache.
+
+        |  exclude: [optional] (type, id) of the variables to leave out.
+
+        Returns a JSON serializable dict.
+        """
+        names = {}
+        values = []
+        for vtype in (1, 2):
+            names[vtype] = {
+                vid: name
+                for vid, name in self.vnames[vtype].items()
+                if (vtype, vid) not in exclude
+            }
+            for vid in self.vids[vtype]:
+                if (vtype, vid) in exclude:
+                    continue
+                vobj = self.vobjs[vtype][vid]
+                values.append(
+                    [
+                        vtype,
+                        vid,
+                        vobj.init,
+                        vobj.status,
+                        vobj.prec,
+                        vobj.last_edited.isoformat(),
+                    ]
+                )
+        return {"names": names, "values": values}
+
+    def load_cache(self, data):
+        """
+        Add the variables from the inventory cache.
+
+        Variables which are already loaded are skipped.
+
+        |  data: Dict from `to_cache`.
+        """
+        for vtype, names in data["names"].items():
+            self.vnames[int(vtype)].update(
+                (int(vid), name) for vid, name in names.items()
+            )
+        for vtype, vid, init, val, prec, last_edited in data["values"]:
+            if vid in self.vobjs[vtype]:
+                continue
+            vname = self.vnames[vtype].get(vid, "")
+            self.vobjs[vtype][vid] = Variable(
+                self,
+                vid,
+                vtype,
+                vname,
+                init,
+                val,
+                datetime.fromisoformat(last_edited),
+                prec,
+            )
+            self.vids[vtype].append(vid)
+        _LOGGER.debug("ISY Loaded Variables from cache")
+
+    def remove(self, variables):
+        """
+        Remove variables which no longer exist.
+
+        |  variables: The (type, id) of the variables to remove.
+        """
+        for vtype, vid in variables:
+            self.vnames[vtype].pop(vid, None)
+            if self.vobjs[vtype].pop(vid, None) is not None:
+                self.vids[vtype].remove(vid)
+                _LOGGER.debug("ISY Removed Variable: %s.%s", vtype, vid)
+
+    def update_received(self, event):
         """Process an update received from the event stream."""
-        xml = xmldoc.toxml()
-        vtype = int(attr_from_xml(xmldoc, ATTR_VAR, TAG_TYPE))
-        vid = int(attr_from_xml(xmldoc, ATTR_VAR, ATTR_ID))
+        var = event.info(ATTR_VAR)
+        vtype = int(var.get(TAG_TYPE))
+        vid = int(var.get(ATTR_ID))
         try:
             vobj = self.vobjs[vtype][vid]
         except KeyError:
             return  # this is a new variable that hasn't been loaded
 
         vobj.last_update = now()
-        if f"<{ATTR_INIT}>" in xml:
-            vobj.init = int(value_from_xml(xmldoc, ATTR_INIT))
+        init = var.find(ATTR_INIT)
+        if init is not None:
+            vobj.init = int(init.text)
         else:
-            vobj.status = int(value_from_xml(xmldoc, ATTR_VAL))
-            vobj.prec = int(value_from_xml(xmldoc, ATTR_PRECISION, 0))
-            vobj.last_edited = parser.parse(value_from_xml(xmldoc, ATTR_TS))
+            vobj.status = int(var.findtext(ATTR_VAL))
+            vobj.prec = int(var.findtext(ATTR_PRECISION) or 0)
+            vobj.last_edited = parser.parse(var.findtext(ATTR_TS))
 
         _LOGGER.debug("ISY Updated Variable: %s.%s", str(vtype), str(vid))
 
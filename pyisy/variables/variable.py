@@ -36,6 +36,21 @@ class Variable:
     :ivar val: Watched property that represents the value of the variable.
     """
 
+    __slots__ = (
+        "_id",
+        "_init",
+        "_last_changed",
+        "_last_edited",
+        "_last_update",
+        "_name",
+        "_prec",
+        "_status",
+        "_type",
+        "_variables",
+        "isy",
+        "status_events",
+    )
+
     def __init__(self, variables, vid, vtype, vname, init, status, ts, prec):
         """Initialize a Variable class."""
         super().__init__()
@@ -159,6 +174,31 @@ class Variable:
             ATTR_LAST_UPDATE: self._last_update,
         }
 
+    def update_values(self, init, status, prec, last_edited):
+        """
+        Apply the values read from the controller.
+
+        Only the values which differ are applied, and listeners are notified
+        once if anything changed.
+
+        |  init: The value the variable initializes to.
+        |  status: The current value of the variable.
+        |  prec: The precision of the variable.
+        |  last_edited: The time the variable was last edited.
+
+        Returns True if the variable changed.
+        """
+        self._last_update = now()
+        self._last_edited = last_edited
+        if (self._init, self._status, self._prec) == (init, status, prec):
+            return False
+        self._init = init
+        self._status = status
+        self._prec = prec
+        self._last_changed = now()
+        self.status_events.notify(self.status_feedback)
+        return True
+
     @property
     def vid(self):
         """Return the Variable ID."""
@@ -0,0 +1,201 @@
+"""Responses of a small ISY and stand-ins for the controller serving them."""
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from pyisy.isy import ISY
+
+CONFIG_XML = (
+    '<?xml version="1.0"?><configuration><app_full_version>5.3.0'
+    "</app_full_version><root><id>00:21:b9:00:00:01</id><name>ISY</name></root>"
+    "<features><feature><id>21040</id><desc>Networking Module</desc>"
+    "<isInstalled>false</isInstalled></feature></features></configuration>"
+)
+
+NODES_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?><nodes>'
+    "<root><id>00:21:b9:00:00:01</id><name>ISY</name></root>"
+    '<folder flag="0"><address>1000</address><name>Lights</name></folder>'
+    '<node flag="128" nodeDefId="DimmerLampSwitch"><address>AA 1</address>'
+    '<name>Kitchen</name><parent type="3">1000</parent><type>1.32.65.0</type>'
+    "<enabled>true</enabled><pnode>AA 1</pnode>"
+    '<property id="ST" value="255" formatted="100%" uom="100"/>'
+    '<property id="OL" value="255" formatted="100%" uom="100"/></node>'
+    '<node flag="128" nodeDefId="RelayLampSwitch"><address>BB 1</address>'
+    "<name>Porch</name><type>2.42.67.0</type><enabled>true</enabled>"
+    '<pnode>BB 1</pnode><property id="ST" value="0" formatted="Off" uom="100"/>'
+    "</node>"
+    '<node flag="128" nodeDefId="ZY001"><address>ZW002_1</address>'
+    "<name>Thermo</name><family>4</family><type>4.16.1.0</type>"
+    "<enabled>true</enabled><pnode>ZW002_1</pnode><devtype><gen>4.8.6</gen>"
+    "<mfg>345.1.2</mfg><cat>140</cat></devtype>"
+    '<property id="ST" value="70" formatted="70" uom="17"/></node>'
+    '<group flag="132"><address>12345</address><name>Scene</name>'
+    '<family>6</family><parent type="3">1000</parent><members>'
+    '<link type="16">AA 1</link><link type="32">BB 1</link></members></group>'
+    "</nodes>"
+)
+
+STATUS_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?><nodes>'
+    '<node id="AA 1"><property id="ST" value="128" formatted="50%" uom="100"/>'
+    "</node>"
+    '<node id="BB 1"><property id="ST" value="255" formatted="On" uom="100"/>'
+    "</node>"
+    '<node id="ZW002_1"><property id="ST" value="68" formatted="68" uom="17"/>'
+    "</node></nodes>"
+)
+
+CLOCK_XML = (
+    '<?xml version="1.0"?><DT><NTP>3820000000</NTP><TMZOffset>-18000</TMZOffset>'
+    "<DST>true</DST><Lat>40.0</Lat><Long>-75.0</Long><Sunrise>3820010000</Sunrise>"
+    "<Sunset>3820050000</Sunset><IsMilitary>false</IsMilitary></DT>"
+)
+
+PROGRAMS_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?><programs>'
+    '<program id="0001" status="true" folder="true"><name>My Programs</name>'
+    "<lastRunTime /><lastFinishTime /></program>"
+    '<program id="001A" parentId="0001" status="false" folder="false" '
+    'enabled="true" runAtStartup="false" running="idle"><name>Motion</name>'
+    "<lastRunTime>2021/01/01 10:00:00 AM</lastRunTime>"
+    "<lastFinishTime>2021/01/01 10:00:01 AM</lastFinishTime></program>"
+    "</programs>"
+)
+
+VARIABLE_DEFS = [
+    '<CList type="VAR_INT"><e id="3" name="int_three"/><e id="4" name="four"/>'
+    "</CList>",
+    '<CList type="VAR_STATE"><e id="1" name="state_one"/></CList>',
+]
+
+VARIABLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?><vars>'
+    '<var type="1" id="3"><init>0</init><prec>0</prec><val>1</val>'
+    "<ts>20210101 10:00:00</ts></var>"
+    '<var type="1" id="4"><init>5</init><prec>1</prec><val>25</val>'
+    "<ts>20210101 11:00:00</ts></var>"
+    '<var type="2" id="1"><init>0</init><prec>0</prec><val>0</val>'
+    "<ts>20210101 12:00:00</ts></var></vars>"
+)
+
+
+class FakeConnection:
+    """
+    Stand-in for the Connection, serving the responses of a small ISY.
+
+    |  responses: [optional] Responses to use instead of the defaults, by
+       the name of the method returning them.
+
+    :ivar calls: The names of the methods called, in order.
+    """
+
+    def __init__(self, **responses):
+        """Initialize a FakeConnection class."""
+        self.responses = {
+            "test_connection": CONFIG_XML,
+            "get_nodes": NODES_XML,
+            "get_status": STATUS_XML,
+            "get_time": CLOCK_XML,
+            "get_programs": PROGRAMS_XML,
+            "get_variable_defs": VARIABLE_DEFS,
+            "get_variables": VARIABLES_XML,
+        }
+        self.responses.update(responses)
+        self.calls = []
+
+    def _respond(self, name, stream_to=None):
+        """Return a response, or stream it to the consumer."""
+        self.calls.append(name)
+        response = self.responses[name]
+        if stream_to is None:
+            return response
+        stream_to.reset()
+        stream_to.feed(response)
+        return True
+
+    async def test_connection(self):
+        """Return the configuration."""
+        return self._respond("test_connection")
+
+    async def get_nodes(self, stream_to=None):
+        """Return the nodes."""
+        return self._respond("get_nodes", stream_to)
+
+    async def get_status(self, stream_to=None):
+        """Return the node status."""
+        return self._respond("get_status", stream_to)
+
+    async def get_time(self):
+        """Return the clock."""
+        return self._respond("get_time")
+
+    async def get_programs(self, address=None):
+        """Return the programs."""
+        return self._respond("get_programs")
+
+    async def get_variable_defs(self):
+        """Return the variable definitions."""
+        return self._respond("get_variable_defs")
+
+    async def get_variables(self):
+        """Return the variable values."""
+        return self._respond("get_variables")
+
+    def compile_url(self, path, query=None):
+        """Return the REST path of a request, used as its response name."""
+        return "/".join(path)
+
+    async def request(self, url, **kwargs):
+        """Return the response to a request, or None if there is none."""
+        self.calls.append(url)
+        return self.responses.get(url)
+
+    async def close(self):
+        """Close the connection."""
+
+
+async def create_isy(**kwargs):
+    """Return an ISY using a FakeConnection, which is not initialized yet."""
+    connection = kwargs.pop("connection", None) or FakeConnection()
+    isy = ISY("127.0.0.1", 80, "username", "password", **kwargs)
+    await isy.conn.close()
+    isy.conn = connection
+    return isy
+
+
+def rest_paths():
+    """Return the responses of the small ISY by REST path."""
+    return {
+        "/rest/config": CONFIG_XML,
+        "/rest/nodes": NODES_XML,
+        "/rest/status": STATUS_XML,
+        "/rest/time": CLOCK_XML,
+        "/rest/programs": PROGRAMS_XML,
+        "/rest/vars/definitions/1": VARIABLE_DEFS[0],
+        "/rest/vars/definitions/2": VARIABLE_DEFS[1],
+        "/rest/vars/get/1": VARIABLES_XML,
+        "/rest/vars/get/2": '<?xml version="1.0" encoding="UTF-8"?><vars></vars>',
+    }
+
+
+async def serve_isy(paths=None):
+    """
+    Start a local HTTP server answering the REST requests of a small ISY.
+
+    |  paths: [optional] Responses by path to use instead of `rest_paths()`.
+
+    Returns the started `aiohttp.test_utils.TestServer`; close it when done.
+    """
+    paths = rest_paths() if paths is None else paths
+
+    async def respond(request):
+        body = paths.get(request.path)
+        if body is None:
+            raise web.HTTPNotFound()
+        return web.Response(text=body, content_type="text/xml")
+
+    app = web.Application()
+    app.router.add_get("/{path:.*}", respond)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    return server
@@ -0,0 +1,190 @@
+"""Tests for the on-disk inventory cache."""
+import asyncio
+import json
+
+from pyisy.cache import CACHE_VERSION, read_cache, write_cache
+from pyisy.helpers import NodeProperty
+from pyisy.nodes import Nodes
+from pyisy.variables import Variables
+
+from tests.common import NODES_XML, VARIABLE_DEFS, FakeConnection, create_isy
+
+CONFIGURATION = {"uuid": "00:21:b9:00:00:01", "firmware": "5.3.0"}
+
+
+class ISY:
+    """Stand-in for the ISY, the nodes are only parsed."""
+
+    nodes = None
+
+
+def saved(data):
+    """Return the data as it is read back from the cache file."""
+    return json.loads(json.dumps(data))
+
+
+def test_write_and_read(tmp_path):
+    """Test the cache is read back for the controller it was saved for."""
+    path = str(tmp_path / "cache.json")
+    data = dict(CONFIGURATION, version=CACHE_VERSION, nodes=[])
+    write_cache(path, data)
+    assert read_cache(path, CONFIGURATION) == data
+    assert read_cache(path, dict(CONFIGURATION, firmware="5.3.4")) is None
+    assert read_cache(path, dict(CONFIGURATION, uuid="00:21:b9:00:00:02")) is None
+    assert [item.name for item in tmp_path.iterdir()] == ["cache.json"]
+
+
+def test_unusable_cache(tmp_path):
+    """Test a missing, corrupt or outdated cache is ignored."""
+    path = tmp_path / "cache.json"
+    assert read_cache(str(path), CONFIGURATION) is None
+    path.write_text("{not json")
+    assert read_cache(str(path), CONFIGURATION) is None
+    write_cache(str(path), dict(CONFIGURATION, version=CACHE_VERSION + 1))
+    assert read_cache(str(path), CONFIGURATION) is None
+
+
+def test_nodes_round_trip():
+    """Test the nodes loaded from the cache match the ones it was saved from."""
+    nodes = Nodes(ISY(), xml=NODES_XML)
+    items = saved(nodes.to_cache())
+    cached = Nodes(ISY())
+    cached.load_cache(items)
+
+    assert saved(cached.to_cache()) == items
+    assert list(cached.addresses) == list(nodes.addresses)
+    zwave = cached.get_by_id("ZW002_1").zwave_props
+    assert zwave == nodes.get_by_id("ZW002_1").zwave_props
+    assert str(zwave) == str(nodes.get_by_id("ZW002_1").zwave_props)
+    assert zwave.category == "140"
+    assert cached.get_by_id("12345").members == ["AA 1", "BB 1"]
+    assert cached.get_by_id("12345").status == 255
+
+
+def test_nodes_to_cache_exclude():
+    """Test excluded items are left out of the cache."""
+    nodes = Nodes(ISY(), xml=NODES_XML)
+    items = nodes.to_cache(exclude={"BB 1"})
+    assert "BB 1" not in [item["address"] for item in items]
+
+
+def test_remove_nodes():
+    """Test removed nodes are dropped from the registry, groups and store."""
+    nodes = Nodes(ISY(), xml=NODES_XML)
+    nodes.enable_state_store()
+    nodes.remove({"AA 1", "1000"})
+
+    assert list(nodes.addresses) == ["BB 1", "ZW002_1", "12345"]
+    assert nodes.get_by_name("Kitchen") is None
+    group = nodes.get_by_id("12345")
+    assert group.members == ["BB 1"]
+    assert group.status == 0
+    assert nodes.get_groups("AA 1") == []
+    assert nodes.snapshot()["addresses"] == ["ZW002_1", "BB 1"]
+    assert list(nodes.snapshot()["status"]) == [70.0, 0.0]
+
+
+def test_remove_variables():
+    """Test removed variables are dropped from the variable tables."""
+    variables = Variables(ISY())
+    variables.load_cache(
+        saved(
+            {
+                "names": {1: {3: "Three", 4: "Four"}, 2: {3: "State"}},
+                "values": [
+                    [1, 3, 0, 1, 0, "2020-01-01T00:00:00"],
+                    [1, 4, 0, 2, 0, "2020-01-01T00:00:00"],
+                    [2, 3, 5, 6, 0, "2020-01-01T00:00:00"],
+                ],
+            }
+        )
+    )
+    variables.remove({(1, 3), (2, 9)})
+    assert variables.vids == {1: [4], 2: [3]}
+    assert 3 not in variables.vnames[1]
+    assert list(variables.vobjs[1]) == [4]
+    assert saved(variables.to_cache())["names"] == {
+        "1": {"4": "Four"},
+        "2": {"3": "State"},
+    }
+
+
+def test_update_nodes_applies_changes():
+    """Test reloading the nodes updates the items loaded from the cache."""
+    live_xml = (
+        NODES_XML.replace('<link type="32">BB 1</link>', "")
+        .replace(
+            "<enabled>true</enabled><pnode>AA 1</pnode>",
+            "<enabled>false</enabled><pnode>AA 1</pnode>",
+        )
+        .replace('nodeDefId="RelayLampSwitch"', 'nodeDefId="RelayLampSwitch_ADV"')
+        .replace("<type>2.42.67.0</type>", "<type>2.57.69.0</type>")
+    )
+
+    class Connection:
+        """Stand-in streaming the live /rest/nodes response."""
+
+        async def get_nodes(self, stream_to=None):
+            """Feed the live document to the parser."""
+            stream_to.reset()
+            stream_to.feed(live_xml)
+            return True
+
+    isy = ISY()
+    isy.conn = Connection()
+    nodes = Nodes(isy)
+    nodes.load_cache(saved(Nodes(ISY(), xml=NODES_XML).to_cache()))
+    group = nodes.get_by_id("12345")
+    porch = nodes.get_by_id("BB 1")
+
+    received = asyncio.run(nodes.update_nodes())
+
+    assert "BB 1" in received
+    assert group.members == ["AA 1"]
+    assert group.controllers == ["AA 1"]
+    assert nodes.get_groups("BB 1") == []
+    assert nodes.get_groups("AA 1") == ["12345"]
+    assert not nodes.get_by_id("AA 1").enabled
+    assert porch.node_def_id == "RelayLampSwitch_ADV"
+    assert porch.type == "2.57.69.0"
+    assert nodes.get_by_id("ZW002_1").zwave_props.category == "140"
+
+    # The group no longer follows the removed member.
+    porch.update_state(NodeProperty("ST", 255, 0, "100", "On", "BB 1"))
+    nodes.get_by_id("AA 1").update_state(NodeProperty("ST", 0, 0, "100", "Off", "AA 1"))
+    assert group.status == 0
+
+
+def test_parse_definitions_failure():
+    """Test a variable type whose definitions cannot be parsed is reported."""
+    variables = Variables(ISY())
+    defined = variables.parse_definitions(['<CList type="VAR_INT"><e id="3"', None])
+    assert defined == {1: None, 2: None}
+    defined = variables.parse_definitions(VARIABLE_DEFS)
+    assert defined == {1: {3, 4}, 2: {1}}
+
+
+def test_validate_keeps_variables_of_unparsed_type(tmp_path):
+    """Test variables are only removed if their definitions were read."""
+    path = str(tmp_path / "cache.json")
+
+    async def run():
+        isy = await create_isy(cache_path=path)
+        await isy.initialize()
+        await isy._cache_task
+
+        connection = FakeConnection(
+            get_variable_defs=[
+                '<CList type="VAR_INT"><e id="3" name="int_three"',
+                '<CList type="VAR_STATE"></CList>',
+            ]
+        )
+        isy = await create_isy(cache_path=path, connection=connection)
+        await isy.initialize()
+        assert isy.startup_report.source == "cache"
+        await isy._cache_task
+        return isy.variables.vids, read_cache(path, isy.configuration)
+
+    vids, cache = asyncio.run(run())
+    assert vids == {1: [3, 4], 2: []}
+    assert [value[:2] for value in cache["variables"]["values"]] == [[1, 3], [1, 4]]
@@ -0,0 +1,121 @@
+"""Tests for streaming the responses of the ISY."""
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from pyisy.connection import Connection, stream_response
+from pyisy.parsing import ElementStream
+from pyisy.startup import StartupPhase
+
+BODY = (
+    '<?xml version="1.0" encoding="UTF-8"?><nodes>'
+    '<node id="1"><property id="ST" formatted="70.5°F"/></node>'
+    '<node id="2"><property id="ST" formatted="Küche"/></node></nodes>'
+).encode()
+SPLIT = BODY.index("°".encode()) + 1  # Inside the two bytes of "°".
+
+
+class Recorder:
+    """Consumer recording what it is fed."""
+
+    def __init__(self):
+        """Initialize the recorder."""
+        self.calls = []
+
+    def reset(self):
+        """Record a reset."""
+        self.calls.append(None)
+
+    def feed(self, text):
+        """Record the text fed."""
+        self.calls.append(text)
+
+
+class Content:
+    """Stand-in for the content of a response, received in chunks."""
+
+    def __init__(self, chunks):
+        """Initialize the content."""
+        self._chunks = chunks
+
+    async def iter_any(self):
+        """Yield the chunks."""
+        for chunk in self._chunks:
+            yield chunk
+
+
+class Response:
+    """Stand-in for an aiohttp response."""
+
+    def __init__(self, chunks):
+        """Initialize the response."""
+        self.content = Content(chunks)
+
+
+def test_stream_response_split_character():
+    """Test a character split between two chunks is decoded whole."""
+    consumer = Recorder()
+    phase = StartupPhase("nodes", 0)
+    chunks = [BODY[:SPLIT], BODY[SPLIT:-4], BODY[-4:]]
+    asyncio.run(stream_response(Response(chunks), consumer, phase))
+
+    assert consumer.calls[0] is None
+    assert "".join(consumer.calls[1:]) == BODY.decode()
+    assert consumer.calls[1].endswith("70.5")
+    assert (phase.requests, phase.bytes) == (1, len(BODY))
+
+
+def test_stream_response_resets_consumer():
+    """Test the consumer starts a new document for each response."""
+    found = []
+    stream = ElementStream(("node",), found.append)
+    stream.feed("<nodes><node id='stale'>")
+    asyncio.run(stream_response(Response([BODY[:SPLIT], BODY[SPLIT:]]), stream))
+    stream.close()
+    assert [node.get("id") for node in found] == ["1", "2"]
+    assert found[0].find("property").get("formatted") == "70.5°F"
+
+
+def test_stream_to_across_retry():
+    """Test a response broken off mid-stream is parsed again on the retry."""
+    attempts = []
+
+    async def respond(request):
+        attempts.append(request.path)
+        response = web.StreamResponse()
+        response.content_length = len(BODY)
+        await response.prepare(request)
+        if len(attempts) == 1:
+            # Send part of the body, ending inside a character, then drop it.
+            await response.write(BODY[:SPLIT])
+            request.transport.close()
+            return response
+        await response.write(BODY[:SPLIT])
+        await response.write(BODY[SPLIT:])
+        await response.write_eof()
+        return response
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/rest/status", respond)
+        server = TestServer(app, host="127.0.0.1")
+        await server.start_server()
+        connection = Connection("127.0.0.1", server.port, "username", "password")
+        found = []
+        stream = ElementStream(("node",), found.append)
+        try:
+            assert await connection.get_status(stream_to=stream)
+            stream.close()
+        finally:
+            await connection.close()
+            await server.close()
+        return found
+
+    found = asyncio.run(run())
+    assert attempts == ["/rest/status", "/rest/status"]
+    assert [node.get("id") for node in found] == ["1", "2"]
+    assert [node.find("property").get("formatted") for node in found] == [
+        "70.5°F",
+        "Küche",
+    ]
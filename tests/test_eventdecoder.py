@@ -0,0 +1,113 @@
+"""Tests for decoding the event stream messages."""
+from xml.etree.ElementTree import ParseError
+
+import pytest
+
+from pyisy.constants import SUBSYSTEM_PROGRAMS
+from pyisy.events.eventdecoder import decode_event
+from pyisy.events.tcpsocket import EventStream
+from pyisy.helpers import EventEmitter
+
+
+def event(control, action="", node="<node/>", info="<eventInfo/>"):
+    """Return an event message."""
+    return (
+        f'<Event seqnum="7" sid="uuid:1"><control>{control}</control>'
+        f"<action>{action}</action>{node}{info}</Event>"
+    )
+
+
+def test_status_event():
+    """Test a status event keeps its value, unit, precision and format."""
+    record = decode_event(
+        '<Event seqnum="7" sid="uuid:1"><control>ST</control>'
+        '<action uom="17" prec="1">705</action><node>AA 1</node>'
+        "<eventInfo/><fmtAct>70.5°F</fmtAct></Event>"
+    )
+    assert (record.seqnum, record.sid) == (7, "uuid:1")
+    assert (record.control, record.action, record.node) == ("ST", "705", "AA 1")
+    assert (record.uom, record.prec, record.formatted) == ("17", "1", "70.5°F")
+    assert record.info_text is None
+    assert record.info("var") is None
+
+
+def test_control_event():
+    """Test a node control event without a unit or precision."""
+    record = decode_event(event("DON", "255", "<node>AA 1</node>"))
+    assert (record.control, record.action, record.node) == ("DON", "255", "AA 1")
+    assert (record.uom, record.prec, record.formatted) == (None, None, None)
+
+
+def test_heartbeat_event():
+    """Test a heartbeat has no node."""
+    record = decode_event(event("_0", "120"))
+    assert (record.control, record.action) == ("_0", "120")
+    assert record.node is None
+
+
+def test_variable_event():
+    """Test a variable event keeps the nested variable element."""
+    info = '<eventInfo><var type="2" id="5"><val>1</val></var></eventInfo>'
+    record = decode_event(event("_1", "6", info=info))
+    var = record.info("var")
+    assert (var.get("type"), var.get("id"), var.findtext("val")) == ("2", "5", "1")
+
+
+def test_program_event():
+    """Test a program event keeps the program id."""
+    record = decode_event(event("_1", "0", info="<eventInfo><id>1A</id></eventInfo>"))
+    assert record.info("id").text == "1A"
+    assert record.info("var") is None
+
+
+def test_node_changed_event():
+    """Test a node changed event keeps its node and action."""
+    record = decode_event(event("_3", "NN", "<node>AA 1</node>"))
+    assert (record.control, record.action, record.node) == ("_3", "NN", "AA 1")
+
+
+def test_empty_fields():
+    """Test empty tags and a missing sequence number decode to None."""
+    record = decode_event("<Event><control/><action/><node/><eventInfo/></Event>")
+    assert (record.seqnum, record.sid) == (None, None)
+    assert (record.control, record.action, record.node) == (None, None, None)
+    assert record.event_info is not None
+    assert record.info_text is None
+
+
+def test_malformed_event():
+    """Test a message which is not valid XML raises a ParseError."""
+    with pytest.raises(ParseError):
+        decode_event("<Event><control>ST</control>")
+
+
+class ISY:
+    """Stand-in for the ISY, counting the program reloads."""
+
+    def __init__(self):
+        """Initialize the fake ISY."""
+        self.loop = None
+        self.connection_events = EventEmitter()
+        self.loaded = {SUBSYSTEM_PROGRAMS}
+        self.programs = self
+        self.refreshes = 0
+
+    def refresh(self):
+        """Count a program reload."""
+        self.refreshes += 1
+
+
+def test_node_server_event_is_skipped():
+    """Test a Node Server update is not mistaken for a program change."""
+    msg = event("_1", "0", "<node>n001_1</node>", "<eventInfo>[  1] ST 1</eventInfo>")
+    record = decode_event(msg)
+    assert (record.node, record.info_text) == ("n001_1", "[  1] ST 1")
+    assert record.info("id") is None
+
+    isy = ISY()
+    stream = EventStream(isy, {})
+    stream.route_event(msg, record)
+    assert isy.refreshes == 0
+    msg = event("_1", "5")
+    stream.route_event(msg, decode_event(msg))
+    assert isy.refreshes == 1
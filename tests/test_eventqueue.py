@@ -0,0 +1,216 @@
+"""Tests for the bounded event queue."""
+import asyncio
+
+import pytest
+
+from pyisy.constants import (
+    EVENT_QUEUE_BLOCK,
+    EVENT_QUEUE_COALESCE,
+    EVENT_QUEUE_DROP_OLDEST,
+    EVENT_QUEUE_RESYNC,
+)
+from pyisy.events.eventdecoder import EventRecord
+from pyisy.events.eventqueue import EventQueue, coalesce_events, state_event_key
+
+
+async def drain(queue):
+    """Wait until the worker has processed every queued item."""
+    while len(queue):
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+
+def test_invalid_policy():
+    """Test an unknown overflow policy is refused."""
+    with pytest.raises(ValueError):
+        EventQueue(print, policy="newest")
+
+
+def test_processes_in_order():
+    """Test the worker hands the items to the handler in order."""
+
+    async def run():
+        handled = []
+
+        async def handler(item):
+            handled.append(item)
+
+        queue = EventQueue(handler, maxsize=10)
+        queue.start()
+        for item in range(5):
+            await queue.put(item)
+        await drain(queue)
+        queue.stop()
+        return handled, queue.metrics
+
+    handled, metrics = asyncio.run(run())
+    assert handled == [0, 1, 2, 3, 4]
+    assert metrics["processed"] == 5
+    assert metrics["high_water"] >= 1
+    assert metrics["depth"] == 0
+
+
+def test_handler_errors_are_logged(caplog):
+    """Test an error in the handler does not stop the worker."""
+
+    async def run():
+        handled = []
+
+        def handler(item):
+            if item == 1:
+                raise ValueError("bad event")
+            handled.append(item)
+
+        queue = EventQueue(handler)
+        queue.start()
+        for item in range(3):
+            queue.put_nowait(item)
+        await drain(queue)
+        queue.stop()
+        return handled, queue.processed
+
+    handled, processed = asyncio.run(run())
+    assert handled == [0, 2]
+    assert processed == 3
+    assert "error processing an event" in caplog.text
+
+
+def test_block_policy():
+    """Test a full blocking queue waits in put and rejects in put_nowait."""
+
+    async def run():
+        handled = []
+        queue = EventQueue(handled.append, maxsize=2, policy=EVENT_QUEUE_BLOCK)
+        assert queue.put_nowait(1)
+        assert queue.put_nowait(2)
+        assert not queue.put_nowait(3)
+        assert queue.rejected == 1
+
+        put = asyncio.ensure_future(queue.put(4))
+        await asyncio.sleep(0)
+        assert not put.done()
+        queue.start()
+        await put
+        await drain(queue)
+        queue.stop()
+        return handled
+
+    assert asyncio.run(run()) == [1, 2, 4]
+
+
+def test_drop_oldest_policy():
+    """Test a full queue discards its oldest item for a new one."""
+
+    async def run():
+        handled = []
+        queue = EventQueue(handled.append, maxsize=2, policy=EVENT_QUEUE_DROP_OLDEST)
+        for item in range(4):
+            assert queue.put_nowait(item)
+        assert queue.dropped == 2
+        queue.start()
+        await drain(queue)
+        queue.stop()
+        return handled
+
+    assert asyncio.run(run()) == [2, 3]
+
+
+def test_resync_policy():
+    """Test a full resync queue rejects a new item in put without waiting."""
+
+    async def run():
+        handled = []
+        queue = EventQueue(handled.append, maxsize=2, policy=EVENT_QUEUE_RESYNC)
+        assert await queue.put(1)
+        assert await queue.put(2)
+        assert not await queue.put(3)
+        assert queue.rejected == 1
+        queue.start()
+        await drain(queue)
+        assert await queue.put(4)
+        await drain(queue)
+        queue.stop()
+        return handled
+
+    assert asyncio.run(run()) == [1, 2, 4]
+
+
+def test_coalesce_policy():
+    """Test a full queue replaces the queued item with the same key."""
+
+    async def run():
+        handled = []
+        queue = EventQueue(handled.append, maxsize=2, policy=EVENT_QUEUE_COALESCE)
+        assert queue.put_nowait("a1", key="a")
+        assert queue.put_nowait("b1", key="b")
+        assert queue.put_nowait("a2", key="a")
+        assert not queue.put_nowait("c1", key="c")
+        assert queue.coalesced == 1
+        queue.start()
+        await drain(queue)
+        queue.stop()
+        return handled
+
+    assert asyncio.run(run()) == ["a2", "b1"]
+
+
+def test_clear():
+    """Test clearing the queue discards the items and wakes a waiting put."""
+
+    async def run():
+        handled = []
+        queue = EventQueue(handled.append, maxsize=1)
+        queue.put_nowait("old", key="a")
+        put = asyncio.ensure_future(queue.put("new", key="a"))
+        await asyncio.sleep(0)
+        queue.clear()
+        await put
+        queue.start()
+        await drain(queue)
+        queue.stop()
+        return handled
+
+    assert asyncio.run(run()) == ["new"]
+
+
+def test_state_event_key():
+    """Test only node state events have a coalescing key."""
+    assert state_event_key(EventRecord("ST", "255", "AA 1")) == ("AA 1", "ST")
+    assert state_event_key(EventRecord("OL", "200", "AA 1")) == ("AA 1", "OL")
+    assert state_event_key(EventRecord("DON", "255", "AA 1")) is None
+    assert state_event_key(EventRecord("_1", "6", "AA 1")) is None
+    assert state_event_key(EventRecord("_0", "120")) is None
+
+
+def test_coalesce_events():
+    """Test a batch keeps the latest state per node in the first position."""
+    events = [
+        ("1", EventRecord("ST", "0", "AA 1")),
+        ("2", EventRecord("DON", "255", "AA 2")),
+        ("3", EventRecord("ST", "255", "AA 2")),
+        ("4", EventRecord("ST", "128", "AA 1")),
+        ("5", EventRecord("DON", "255", "AA 2")),
+    ]
+    merged, count = coalesce_events(events)
+    assert [msg for msg, _ in merged] == ["4", "2", "3", "5"]
+    assert count == 1
+
+
+def test_coalesce_window():
+    """Test items with the same key queued within the window are merged."""
+
+    async def run():
+        handled = []
+        queue = EventQueue(handled.append, coalesce_window=0.01)
+        queue.start()
+        for item in range(5):
+            queue.put_nowait(("a", item), key="a")
+            queue.put_nowait(("b", item), key="b")
+        queue.put_nowait(("cmd", 0))
+        await asyncio.sleep(0.05)
+        queue.stop()
+        return handled, queue.coalesced
+
+    handled, coalesced = asyncio.run(run())
+    assert handled == [("a", 4), ("b", 4), ("cmd", 0)]
+    assert coalesced == 8
@@ -0,0 +1,77 @@
+"""Tests for framing the TCP event stream."""
+import pytest
+
+from pyisy.events.eventreader import ISYEventReader
+from pyisy.exceptions import ISYInvalidAuthError, ISYMaxConnections, ISYStreamDataError
+
+
+def event(body):
+    """Return a body framed as it is sent by the ISY."""
+    data = body.encode()
+    return (
+        b"POST reuse HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Type: text/xml\r\n"
+        b"CONTENT-LENGTH: %d\r\n\r\n%s" % (len(data), data)
+    )
+
+
+def test_feed_events():
+    """Test reading several events received together."""
+    reader = ISYEventReader()
+    assert reader.feed(event("<Event>1</Event>") + event("<Event>2</Event>")) == [
+        "<Event>1</Event>",
+        "<Event>2</Event>",
+    ]
+    assert reader.event_count == 2
+    assert reader._event_buffer == b""
+
+
+def test_feed_split_event():
+    """Test an event split across reads, in the headers and in the body."""
+    reader = ISYEventReader()
+    data = event("<Event>café</Event>") + event("<Event>2</Event>")
+    assert reader.feed(data[:20]) == []
+    assert reader.feed(data[20:70]) == []
+    assert reader.feed(data[70:-3]) == ["<Event>café</Event>"]
+    assert reader.feed(data[-3:]) == ["<Event>2</Event>"]
+    assert reader.event_count == 2
+
+
+def test_feed_byte_by_byte():
+    """Test the events are framed when the data arrives one byte at a time."""
+    reader = ISYEventReader(buffer_size=8)
+    bodies = []
+    for byte in event("<Event>1</Event>") * 3:
+        bodies.extend(reader.feed(bytes([byte])))
+    assert bodies == ["<Event>1</Event>"] * 3
+
+
+def test_feed_grows_buffer():
+    """Test an event larger than the buffer is read."""
+    reader = ISYEventReader(buffer_size=16)
+    body = "<Event>" + "x" * 1000 + "</Event>"
+    assert reader.feed(event(body)) == [body]
+
+
+def test_feed_compacts_buffer():
+    """Test the unread data is moved back instead of growing the buffer."""
+    data = event("<Event>1</Event>")
+    reader = ISYEventReader(buffer_size=len(data) + 10)
+    for _ in range(20):
+        assert reader.feed(data[:-5]) == []
+        assert reader.feed(data[-5:] + data[:5]) == ["<Event>1</Event>"]
+        assert reader.feed(data[5:]) == ["<Event>1</Event>"]
+    assert len(reader._buffer) == len(data) + 10
+
+
+@pytest.mark.parametrize(
+    "data, error",
+    [
+        (b"HTTP/1.1 817 Max Subscribers\r\n\r\n", ISYMaxConnections),
+        (b"HTTP/1.1 401 Unauthorized\r\n\r\n", ISYInvalidAuthError),
+        (b"POST reuse HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n", ISYStreamDataError),
+    ],
+)
+def test_feed_errors(data, error):
+    """Test the errors raised for the ISY's error responses."""
+    with pytest.raises(error):
+        ISYEventReader().feed(data)
@@ -0,0 +1,88 @@
+"""Tests for the groups (scenes) of the nodes."""
+from pyisy.constants import ISY_VALUE_UNKNOWN
+from pyisy.events.eventdecoder import decode_event
+from pyisy.nodes import Nodes
+
+GROUP_NODES_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?><nodes>'
+    + "".join(
+        f'<node flag="128"><address>{address}</address><name>{address}</name>'
+        f"<type>1.32.65.0</type><enabled>true</enabled><pnode>{address}</pnode>"
+        f'<property id="ST" value="{value}" formatted="" uom="100"/></node>'
+        for address, value in (("AA 1", 0), ("BB 1", 0), ("CC 1", " "))
+    )
+    + '<group flag="132"><address>12345</address><name>Scene</name>'
+    '<members><link type="16">AA 1</link><link type="32">BB 1</link>'
+    '<link type="32">CC 1</link></members></group>'
+    '<group flag="132"><address>23456</address><name>Other</name>'
+    '<members><link type="16">BB 1</link><link type="32">AA 1</link>'
+    "</members></group></nodes>"
+)
+
+
+class ISY:
+    """Stand-in for the ISY, the nodes are only parsed."""
+
+    nodes = None
+
+
+def status_event(address, value):
+    """Return the decoded status event of a node."""
+    return decode_event(
+        f'<Event seqnum="1" sid="uuid:1"><control>ST</control>'
+        f"<action>{value}</action><node>{address}</node><eventInfo/></Event>"
+    )
+
+
+def test_group_status_follows_members():
+    """Test the group status and all on state track the member events."""
+    nodes = Nodes(ISY(), xml=GROUP_NODES_XML)
+    group = nodes.get_by_id("12345")
+    changes = []
+    group.status_events.subscribe(changes.append)
+    assert nodes.get_by_id("CC 1").status == ISY_VALUE_UNKNOWN
+    assert (group.status, group.group_all_on) == (0, False)
+
+    nodes.update_received(status_event("AA 1", 255))
+    # The member with an unknown status is not counted against all on.
+    assert (group.status, group.group_all_on) == (255, False)
+    nodes.update_received(status_event("BB 1", 128))
+    assert (group.status, group.group_all_on) == (255, True)
+    nodes.update_received(status_event("CC 1", 0))
+    assert (group.status, group.group_all_on) == (255, False)
+    nodes.update_received(status_event("AA 1", 0))
+    nodes.update_received(status_event("BB 1", 0))
+    assert (group.status, group.group_all_on) == (0, False)
+    assert changes
+
+
+def test_remove_members():
+    """Test removing a member updates the counters and stops its events."""
+    nodes = Nodes(ISY(), xml=GROUP_NODES_XML)
+    group = nodes.get_by_id("12345")
+    nodes.update_received(status_event("AA 1", 255))
+    nodes.update_received(status_event("CC 1", 255))
+    assert (group.status, group.group_all_on) == (255, False)
+
+    group.remove_members({"BB 1"})
+    assert group.members == ["AA 1", "CC 1"]
+    assert group.controllers == ["AA 1"]
+    assert (group.status, group.group_all_on) == (255, True)
+
+    nodes.update_received(status_event("BB 1", 255))
+    nodes.update_received(status_event("AA 1", 0))
+    nodes.update_received(status_event("CC 1", 0))
+    assert (group.status, group.group_all_on) == (0, False)
+
+
+def test_get_groups():
+    """Test a node's groups are selected by its controller or responder links."""
+    nodes = Nodes(ISY(), xml=GROUP_NODES_XML)
+    node = nodes.get_by_id("AA 1")
+    assert node.get_groups() == ["12345", "23456"]
+    assert node.get_groups(responder=False) == ["12345"]
+    assert node.get_groups(controller=False) == ["12345", "23456"]
+    assert node.get_groups(controller=False, responder=False) == []
+    assert nodes.get_by_id("BB 1").get_groups(responder=False) == ["23456"]
+    assert nodes.get_by_id("CC 1").get_groups(responder=False) == []
+    assert nodes.get_by_id("CC 1").get_groups() == ["12345"]
@@ -0,0 +1,96 @@
+"""Tests for loading the subsystems on first use."""
+import asyncio
+
+import pytest
+
+from pyisy.constants import SUBSYSTEM_PROGRAMS
+from pyisy.events.eventdecoder import decode_event
+from pyisy.events.tcpsocket import EventStream
+from pyisy.events.websocket import WebSocketClient
+from pyisy.exceptions import ISYNotLoadedError
+from pyisy.lazy import LazySubsystem
+
+from tests.common import create_isy
+
+VARIABLE_EVENT = (
+    '<Event seqnum="1" sid="uuid:1"><control>_1</control><action>6</action>'
+    '<node/><eventInfo><var type="1" id="3"><val>7</val><prec>0</prec>'
+    "<ts>20210102 10:00:00</ts></var></eventInfo></Event>"
+)
+PROGRAM_EVENT = (
+    '<Event seqnum="2" sid="uuid:1"><control>_1</control><action>0</action>'
+    "<node/><eventInfo><id>1A</id><s>21</s><r>210101 10:00:00</r>"
+    "<f>210101 10:00:01</f></eventInfo></Event>"
+)
+
+
+async def create_nodes_only_isy():
+    """Return an initialized ISY with only its nodes loaded."""
+    isy = await create_isy()
+    await isy.initialize(load=[])
+    return isy
+
+
+def test_first_await_loads_subsystem():
+    """Test awaiting a placeholder loads the subsystem once and replaces it."""
+
+    async def run():
+        isy = await create_nodes_only_isy()
+        placeholder = isy.programs
+        assert isinstance(placeholder, LazySubsystem)
+        assert not placeholder.loaded
+        assert "get_programs" not in isy.conn.calls
+
+        programs = await isy.programs
+        assert isy.programs is programs
+        assert SUBSYSTEM_PROGRAMS in isy.loaded
+        assert await isy.load(SUBSYSTEM_PROGRAMS) is programs
+        assert await placeholder is programs
+        assert isy.conn.calls.count("get_programs") == 1
+
+    asyncio.run(run())
+
+
+def test_use_before_loading_raises():
+    """Test using a placeholder raises an AttributeError and starts loading."""
+
+    async def run():
+        isy = await create_nodes_only_isy()
+        placeholder = isy.variables
+        with pytest.raises(ISYNotLoadedError):
+            placeholder.vobjs
+        with pytest.raises(AttributeError):
+            placeholder[1]
+        assert not hasattr(placeholder, "vobjs")
+
+        # The first use started loading, which the placeholder then follows.
+        await placeholder
+        assert isy.conn.calls.count("get_variables") == 1
+        assert placeholder[1][3].status == 1
+        assert placeholder.vobjs is isy.variables.vobjs
+
+    asyncio.run(run())
+
+
+def test_routers_skip_unloaded_subsystems():
+    """Test the event streams do not route events to unloaded subsystems."""
+
+    async def run():
+        isy = await create_nodes_only_isy()
+        websocket = WebSocketClient(isy, "host", 80, "user", "pass")
+        stream = EventStream(isy, {})
+        try:
+            for msg in (VARIABLE_EVENT, PROGRAM_EVENT):
+                await websocket._route_event((msg, decode_event(msg)))
+                stream.route_event(msg, decode_event(msg))
+            # Routing did not use, and so did not start loading, either one.
+            assert isy.programs._task is None
+            assert isy.variables._task is None
+
+            await isy.variables
+            await websocket._route_event((VARIABLE_EVENT, decode_event(VARIABLE_EVENT)))
+            assert isy.variables[1][3].status == 7
+        finally:
+            await websocket.req_session.close()
+
+    asyncio.run(run())
@@ -0,0 +1,82 @@
+"""Tests for the incremental XML parsing of the REST responses."""
+from xml.etree.ElementTree import ParseError
+
+import pytest
+
+from pyisy.parsing import ElementStream, iterparse
+
+DOCUMENT = (
+    '<?xml version="1.0" encoding="UTF-8"?><nodes>'
+    '<node id="1"><property id="ST" value="1"/></node>'
+    '<group id="2"><members><link>1</link></members></group>'
+    '<node id="3"><property id="ST" value="3"/></node>'
+    "</nodes>"
+)
+
+
+def test_iterparse_chunks():
+    """Test the elements are found wherever the chunks split the document."""
+    expected = [("node", "1"), ("group", "2"), ("node", "3")]
+    for chunk_size in (1, 7, len(DOCUMENT)):
+        elements = iterparse(DOCUMENT, ("node", "group"), chunk_size)
+        assert [(item.tag, item.get("id")) for item in elements] == expected
+
+
+def test_feed_returns_completed_elements():
+    """Test each feed returns only the elements its data completed."""
+    stream = ElementStream(("node",))
+    assert stream.feed(DOCUMENT[:60]) == []
+    first = stream.feed(DOCUMENT[60:100])
+    assert [item.get("id") for item in first] == ["1"]
+    assert first[0].find("property").get("value") == "1"
+    assert [item.get("id") for item in stream.feed(DOCUMENT[100:])] == ["3"]
+    assert stream.close() == []
+
+
+def test_completed_elements_are_detached():
+    """Test emitted elements are removed from their parent."""
+    elements = list(iterparse(DOCUMENT, ("node", "nodes"), 16))
+    assert [item.tag for item in elements] == ["node", "node", "nodes"]
+    root = elements[-1]
+    # Only the element which was not requested is still in the tree.
+    assert [child.tag for child in root] == ["group"]
+    assert len(elements[0]) == 1
+
+
+def test_nested_requested_elements():
+    """Test a requested element inside another is emitted first and detached."""
+    elements = list(iterparse(DOCUMENT, ("group", "members")))
+    assert [item.tag for item in elements] == ["members", "group"]
+    assert len(elements[1]) == 0
+
+
+def test_callback():
+    """Test the elements are passed to the callback instead of returned."""
+    found = []
+    stream = ElementStream(("node",), found.append)
+    assert stream.feed(DOCUMENT) == []
+    stream.close()
+    assert [item.get("id") for item in found] == ["1", "3"]
+
+
+def test_reset():
+    """Test reset discards a partial document and starts a new one."""
+    stream = ElementStream(("node",))
+    stream.feed(DOCUMENT[:80])
+    stream.reset()
+    assert [item.get("id") for item in stream.feed(DOCUMENT)] == ["1", "3"]
+
+
+def test_parse_errors():
+    """Test invalid and incomplete documents raise a ParseError."""
+    stream = ElementStream(("node",))
+    with pytest.raises(ParseError):
+        stream.feed("<nodes><node></nodes>")
+
+    stream = ElementStream(("node",))
+    assert [item.get("id") for item in stream.feed(DOCUMENT[:-8])] == ["1", "3"]
+    with pytest.raises(ParseError):
+        stream.close()
+
+    with pytest.raises(ParseError):
+        list(iterparse("<nodes><node>", ("node",), 4))
@@ -0,0 +1,97 @@
+"""Tests for merging the node status refreshes."""
+import asyncio
+
+import pyisy.nodes
+from pyisy.helpers import Debouncer
+
+from tests.common import FakeConnection, create_isy
+
+
+def node_status(value):
+    """Return the status of a single node."""
+    return (
+        f'<properties><property id="ST" value="{value}" formatted="{value}" '
+        'uom="100"/></properties>'
+    )
+
+
+async def create_loaded_isy(**responses):
+    """Return an ISY with only its nodes loaded."""
+    isy = await create_isy(connection=FakeConnection(**responses))
+    await isy.initialize(load=[])
+    isy.conn.calls.clear()
+    return isy
+
+
+def test_debouncer_merges_requests():
+    """Test the requests made within the delay make a single call."""
+
+    async def run():
+        calls = []
+
+        async def callback(keys):
+            calls.append(keys)
+
+        debouncer = Debouncer(callback)
+        task = debouncer.request("a", 0.01)
+        assert debouncer.request("b", 0.01) is task
+        assert debouncer.request() is task
+        await task
+        assert debouncer.task is None
+
+        await debouncer.request("c")
+        debouncer.request("d", 10)
+        debouncer.cancel()
+        return calls
+
+    assert asyncio.run(run()) == [{"a", "b", None}, {"c"}]
+
+
+def test_refresh_merges_node_requests():
+    """Test refreshes within the window query each node once."""
+
+    async def run():
+        isy = await create_loaded_isy(
+            **{
+                "nodes/AA 1/get/ST": node_status(10),
+                "nodes/BB 1/get/ST": node_status(20),
+            }
+        )
+        task = isy.nodes.refresh("AA 1", 0.01)
+        assert isy.nodes.refresh("BB 1") is task
+        assert isy.nodes.refresh("AA 1") is task
+        await task
+        assert sorted(isy.conn.calls) == ["nodes/AA 1/get/ST", "nodes/BB 1/get/ST"]
+        assert isy.nodes["AA 1"].status == 10
+        assert isy.nodes["BB 1"].status == 20
+
+    asyncio.run(run())
+
+
+def test_refresh_bulk_status(monkeypatch):
+    """Test a refresh of enough nodes fetches the status of all at once."""
+    monkeypatch.setattr(pyisy.nodes, "REFRESH_BULK_THRESHOLD", 3)
+
+    async def run():
+        isy = await create_loaded_isy()
+        for address in ("AA 1", "BB 1", "ZW002_1"):
+            task = isy.nodes.refresh(address, 0)
+        await task
+        assert isy.conn.calls == ["get_status"]
+
+    asyncio.run(run())
+
+
+def test_refresh_failure_keeps_other_nodes(caplog):
+    """Test a node which fails to refresh does not stop the others."""
+
+    async def run():
+        isy = await create_loaded_isy(
+            **{"nodes/AA 1/get/ST": "<properties", "nodes/BB 1/get/ST": node_status(20)}
+        )
+        await asyncio.gather(isy.nodes.refresh("AA 1", 0), isy.nodes.refresh("BB 1"))
+        assert isy.nodes["AA 1"].status == 128
+        assert isy.nodes["BB 1"].status == 20
+
+    asyncio.run(run())
+    assert "ISY could not refresh a node" in caplog.text
@@ -0,0 +1,126 @@
+"""Tests for the indexed node registry."""
+from pyisy.constants import TAG_FOLDER, TAG_GROUP, TAG_NODE
+from pyisy.nodes.registry import NodeRegistry
+
+
+def build_registry():
+    """Return a registry with a folder, a subfolder, nodes and a group."""
+    registry = NodeRegistry()
+    registry.insert("1000", "Lights", None, None, TAG_FOLDER)
+    registry.insert("2000", "Sub", "1000", None, TAG_FOLDER)
+    registry.insert("AA 1", "Kitchen", "1000", "kitchen", TAG_NODE)
+    registry.insert("AA 2", "Porch", "2000", "porch", TAG_NODE)
+    registry.insert("AA 3", "Kitchen", None, "kitchen2", TAG_NODE)
+    registry.insert("12345", "Scene", None, "scene", TAG_GROUP)
+    registry.add_group_links("12345", ["AA 1", "AA 2", "AA 1"], ["AA 1"])
+    return registry
+
+
+def test_lookups():
+    """Test looking items up by address, name and parent."""
+    registry = build_registry()
+    assert len(registry) == 6
+    assert "AA 2" in registry
+    assert "AA 9" not in registry
+    assert registry.get("AA 2").obj == "porch"
+    assert registry.get("AA 9") is None
+    assert registry.get_by_name("Kitchen", any_parent=True).address == "AA 1"
+    assert registry.get_by_name("Kitchen").address == "AA 3"
+    assert registry.get_by_name("Kitchen", "1000").address == "AA 1"
+    assert registry.get_by_name("Porch", "1000") is None
+    assert registry.has_name("Scene")
+    assert [entry.address for entry in registry.children("1000")] == [
+        "2000",
+        "AA 1",
+    ]
+    assert registry.has_children("2000")
+    assert not registry.has_children("AA 1")
+
+
+def test_views():
+    """Test the read-only views of the registry columns."""
+    registry = build_registry()
+    assert list(registry.addresses) == ["1000", "2000", "AA 1", "AA 2", "AA 3", "12345"]
+    assert registry.names[2] == "Kitchen"
+    assert registry.parents[3] == "2000"
+    assert registry.types.index(TAG_GROUP) == 5
+    assert "porch" in registry.objects
+    assert registry.addresses == ["1000", "2000", "AA 1", "AA 2", "AA 3", "12345"]
+
+
+def test_paths_and_rename():
+    """Test the paths are kept up to date when items are renamed."""
+    registry = build_registry()
+    assert registry.get("AA 2").path == "/Lights/Sub/Porch"
+
+    registry.rename("1000", "Lamps")
+    assert registry.get("AA 2").path == "/Lamps/Sub/Porch"
+    assert registry.get_by_name("Lamps").address == "1000"
+    assert registry.get_by_name("Lights") is None
+
+    registry.rename("AA 3", "Den")
+    assert registry.get_by_name("Kitchen", any_parent=True).address == "AA 1"
+    assert registry.get_by_name("Kitchen") is None
+    assert registry.get_by_name("Den").address == "AA 3"
+    assert registry.rename("AA 9", "Missing") is None
+
+
+def test_child_inserted_before_parent():
+    """Test the path of a child inserted before its parent."""
+    registry = NodeRegistry()
+    registry.insert("AA 1", "Kitchen", "1000", None, TAG_NODE)
+    registry.insert("1000", "Lights", None, None, TAG_FOLDER)
+    assert registry.get("AA 1").path == "/Lights/Kitchen"
+
+
+def test_flatten():
+    """Test the flattened list of the items below a folder."""
+    registry = build_registry()
+    items, objects = registry.flatten(None, (TAG_NODE, TAG_GROUP))
+    assert items == [
+        (TAG_NODE, "/Lights/Sub/Porch", "AA 2"),
+        (TAG_NODE, "/Lights/Kitchen", "AA 1"),
+        (TAG_NODE, "/Kitchen", "AA 3"),
+        (TAG_GROUP, "/Scene", "12345"),
+    ]
+    assert objects == ["porch", "kitchen", "kitchen2", "scene"]
+
+    items, _ = registry.flatten("1000", (TAG_NODE,))
+    assert [path for _, path, _ in items] == ["Lights/Sub/Porch", "Lights/Kitchen"]
+
+    cached = registry.flatten(None, (TAG_NODE, TAG_GROUP))
+    assert registry.flatten(None, (TAG_NODE, TAG_GROUP)) is cached
+    registry.insert("AA 4", "Garage", None, "garage", TAG_NODE)
+    assert registry.flatten(None, (TAG_NODE, TAG_GROUP)) is not cached
+
+
+def test_groups_of():
+    """Test the groups a node is a member or controller of."""
+    registry = build_registry()
+    registry.insert("23456", "Scene B", None, "scene_b", TAG_GROUP)
+    registry.add_group_links("23456", ["AA 2"], ["AA 2"])
+    assert registry.groups_of("AA 1") == ["12345"]
+    assert registry.groups_of("AA 1", controller=False) == ["12345"]
+    assert registry.groups_of("AA 2", responder=False) == ["23456"]
+    assert registry.groups_of("AA 2") == ["12345", "23456"]
+    assert registry.groups_of("AA 3") == []
+    assert registry.groups_of("AA 1", controller=False, responder=False) == []
+
+
+def test_remove():
+    """Test removed items are dropped from every index."""
+    registry = build_registry()
+    removed = registry.remove({"AA 1", "2000", "AA 9"})
+    assert [entry.address for entry in removed] == ["2000", "AA 1"]
+    assert list(registry.addresses) == ["1000", "AA 2", "AA 3", "12345"]
+    assert [entry.index for entry in registry] == [0, 1, 2, 3]
+    assert "AA 1" not in registry
+    assert registry.get_by_name("Kitchen", any_parent=True).address == "AA 3"
+    assert registry.get_by_name("Kitchen", "1000") is None
+    assert registry.children("1000") == []
+    assert registry.groups_of("AA 1") == []
+    assert registry.groups_of("AA 2") == ["12345"]
+    assert registry.flatten(None, (TAG_NODE,))[0] == [
+        (TAG_NODE, "/Kitchen", "AA 3"),
+    ]
+    assert registry.remove({"AA 9"}) == []
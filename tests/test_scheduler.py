@@ -0,0 +1,139 @@
+"""Tests for the priority scheduling of requests."""
+import asyncio
+
+import pytest
+
+from pyisy.constants import PRIORITY_BACKGROUND, PRIORITY_COMMAND, PRIORITY_REFRESH
+from pyisy.scheduler import RequestScheduler
+
+
+async def request(scheduler, name, priority, order):
+    """Hold a connection for a request and record when it was granted."""
+    async with scheduler.slot(priority):
+        order.append(name)
+        await asyncio.sleep(0)
+
+
+def test_limit():
+    """Test no more than the limit of requests run at once."""
+
+    async def run():
+        scheduler = RequestScheduler(2)
+        peak = 0
+
+        async def hold():
+            nonlocal peak
+            async with scheduler.slot():
+                peak = max(peak, scheduler.in_flight)
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(hold() for _ in range(10)))
+        return peak, scheduler
+
+    peak, scheduler = asyncio.run(run())
+    assert peak == 2
+    assert scheduler.in_flight == 0
+    assert scheduler.metrics["priorities"][PRIORITY_COMMAND]["granted"] == 10
+
+
+def test_command_overtakes_background():
+    """Test a command is served ahead of a queue of background requests."""
+
+    async def run():
+        scheduler = RequestScheduler(1)
+        order = []
+        await scheduler.acquire(PRIORITY_REFRESH)
+        tasks = [
+            asyncio.ensure_future(
+                request(scheduler, f"bg{ind}", PRIORITY_BACKGROUND, order)
+            )
+            for ind in range(5)
+        ]
+        tasks.append(
+            asyncio.ensure_future(request(scheduler, "cmd", PRIORITY_COMMAND, order))
+        )
+        await asyncio.sleep(0)
+        assert scheduler.queued == 6
+        scheduler.release()
+        await asyncio.gather(*tasks)
+        return order
+
+    order = asyncio.run(run())
+    assert order.index("cmd") <= 1
+    assert [name for name in order if name != "cmd"] == [f"bg{i}" for i in range(5)]
+
+
+def test_invalid_priority():
+    """Test an unknown priority class is refused."""
+    with pytest.raises(ValueError):
+        asyncio.run(RequestScheduler(1).acquire("urgent"))
+
+
+def test_cancelled_waiter():
+    """Test a cancelled request gives up its place in the queue."""
+
+    async def run():
+        scheduler = RequestScheduler(1)
+        await scheduler.acquire()
+        waiter = asyncio.ensure_future(scheduler.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        queued = scheduler.queued
+        scheduler.release()
+        return queued, scheduler.in_flight
+
+    assert asyncio.run(run()) == (0, 0)
+
+
+def test_limit_bounds():
+    """Test the limit is kept within the minimum and maximum limits."""
+    scheduler = RequestScheduler(20, min_limit=2, max_limit=10)
+    assert scheduler.limit == 10
+    scheduler.limit = 0
+    assert scheduler.limit == 2
+    with pytest.raises(ValueError):
+        scheduler.min_limit = 11
+    with pytest.raises(ValueError):
+        scheduler.max_limit = 1
+    with pytest.raises(ValueError):
+        RequestScheduler(5, min_limit=6, max_limit=4)
+
+
+def test_additive_increase():
+    """Test the limit is raised by one after a full limit of successes."""
+    scheduler = RequestScheduler(2, max_limit=4)
+    for _ in range(2):
+        scheduler.record_success()
+    assert scheduler.limit == 3
+    for _ in range(3):
+        scheduler.record_success()
+    assert scheduler.limit == 4
+    for _ in range(10):
+        scheduler.record_success()
+    assert scheduler.limit == 4
+    assert scheduler.increases == 2
+
+
+def test_multiplicative_decrease():
+    """Test an overload halves the limit once for the requests in flight."""
+
+    async def run():
+        scheduler = RequestScheduler(8, min_limit=1)
+        for _ in range(3):
+            await scheduler.acquire()
+        scheduler.record_overload()
+        assert scheduler.limit == 4
+        # The other requests sent under the old limit do not lower it again.
+        scheduler.record_overload()
+        scheduler.record_overload()
+        scheduler.record_overload()
+        assert scheduler.limit == 4
+        scheduler.record_overload()
+        assert scheduler.limit == 2
+        for _ in range(3):
+            scheduler.release()
+        return scheduler.decreases
+
+    assert asyncio.run(run()) == 2
@@ -0,0 +1,81 @@
+"""Tests for tracking the event sequence numbers."""
+from pyisy.events.eventdecoder import EventRecord, decode_event
+from pyisy.events.sequence import SequenceTracker, resync_on_gap
+
+
+def event(seqnum, sid="uuid:1"):
+    """Return an event with the given sequence number."""
+    return EventRecord("ST", "0", "AA 1", seqnum=seqnum, sid=sid)
+
+
+def test_in_order():
+    """Test events received in order are not reported."""
+    gaps = []
+    tracker = SequenceTracker(lambda missed, evt: gaps.append(missed))
+    assert [tracker.track(event(seqnum)) for seqnum in range(5, 10)] == [0] * 5
+    assert gaps == []
+    assert tracker.metrics == {"last": 9, "gaps": 0, "missed": 0, "out_of_order": 0}
+
+
+def test_gap():
+    """Test a jump in the sequence is reported with the number missed."""
+    gaps = []
+    tracker = SequenceTracker(lambda missed, evt: gaps.append((missed, evt.seqnum)))
+    tracker.track(event(1))
+    assert tracker.track(event(5)) == 3
+    assert tracker.track(event(6)) == 0
+    assert tracker.track(event(8)) == 1
+    assert gaps == [(3, 5), (1, 8)]
+    assert tracker.gaps == 2
+    assert tracker.missed == 4
+
+
+def test_out_of_order():
+    """Test late and repeated events are counted, not reported as gaps."""
+    tracker = SequenceTracker()
+    tracker.track(event(10))
+    assert tracker.track(event(10)) == 0
+    assert tracker.track(event(7)) == 0
+    assert tracker.out_of_order == 2
+    assert tracker.last == 10
+    assert tracker.track(event(11)) == 0
+
+
+def test_new_subscription():
+    """Test a new subscription or a reset starts a new sequence."""
+    tracker = SequenceTracker()
+    tracker.track(event(100))
+    assert tracker.track(event(0, sid="uuid:2")) == 0
+    assert tracker.sid == "uuid:2"
+    tracker.reset()
+    assert tracker.track(event(50, sid=None)) == 0
+    assert tracker.track(event(51, sid=None)) == 0
+    assert tracker.gaps == 0
+
+
+def test_no_sequence_number():
+    """Test events without a sequence number are ignored."""
+    tracker = SequenceTracker()
+    tracker.track(event(1))
+    assert tracker.track(decode_event("<Event><control>_0</control></Event>")) == 0
+    assert tracker.last == 1
+
+
+def test_resync_on_gap():
+    """Test the gap callback schedules a resync of the ISY."""
+
+    class ISY:
+        """Stand-in recording the resync requests."""
+
+        resyncs = 0
+
+        def resync(self):
+            """Record a resync request."""
+            self.resyncs += 1
+
+    isy = ISY()
+    tracker = SequenceTracker(resync_on_gap(isy))
+    tracker.track(event(1))
+    tracker.track(event(2))
+    tracker.track(event(4))
+    assert isy.resyncs == 1
@@ -0,0 +1,176 @@
+"""Tests for sharing identical concurrent requests."""
+import asyncio
+
+import pytest
+
+from pyisy.singleflight import SingleFlight
+
+
+class Consumer:
+    """Stream consumer recording the text fed to it."""
+
+    def __init__(self, fail_on=None):
+        """Initialize a Consumer class."""
+        self.text = ""
+        self.resets = 0
+        self.fail_on = fail_on
+
+    def reset(self):
+        """Discard the text received so far."""
+        self.text = ""
+        self.resets += 1
+
+    def feed(self, text):
+        """Record a chunk of text."""
+        if text == self.fail_on:
+            raise ValueError(text)
+        self.text += text
+
+
+def test_concurrent_calls_share_a_request():
+    """Test concurrent calls for the same key send a single request."""
+
+    async def run():
+        flights = SingleFlight()
+        calls = []
+
+        async def fetch(stream):
+            calls.append(stream)
+            await asyncio.sleep(0)
+            return "result"
+
+        results = await asyncio.gather(
+            *(flights.run("/rest/status", fetch) for _ in range(3)),
+            flights.run("/rest/nodes", fetch),
+        )
+        later = await flights.run("/rest/status", fetch)
+        return results, later, calls, flights.metrics
+
+    results, later, calls, metrics = asyncio.run(run())
+    assert results == ["result"] * 4
+    assert later == "result"
+    assert calls == [None, None, None]
+    assert metrics == {"requests": 3, "hits": 2, "in_flight": 0}
+
+
+def test_errors_are_shared():
+    """Test every caller of a failed request gets its error."""
+
+    async def run():
+        flights = SingleFlight()
+
+        async def fetch(stream):
+            await asyncio.sleep(0)
+            raise OSError("unreachable")
+
+        return await asyncio.gather(
+            flights.run("/rest/status", fetch),
+            flights.run("/rest/status", fetch),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert [type(result) for result in results] == [OSError, OSError]
+
+
+def test_late_caller_starts_a_new_request():
+    """Test a call made after the request started is not given its result."""
+
+    async def run():
+        flights = SingleFlight()
+        status = ["off"]
+        started = asyncio.Event()
+
+        async def fetch(stream):
+            result = status[0]
+            started.set()
+            await asyncio.sleep(0)
+            return result
+
+        first = asyncio.ensure_future(flights.run("/rest/status", fetch))
+        await started.wait()
+        status[0] = "on"
+        second = await flights.run("/rest/status", fetch)
+        return await first, second, flights.metrics
+
+    first, second, metrics = asyncio.run(run())
+    assert (first, second) == ("off", "on")
+    assert metrics["requests"] == 2
+    assert metrics["hits"] == 0
+
+
+def test_streamed_response_is_not_buffered():
+    """Test a streamed response is passed on without keeping the text."""
+
+    async def run():
+        flights = SingleFlight()
+        first, second, late = Consumer(), Consumer(), Consumer()
+        started = asyncio.Event()
+        streams = []
+
+        async def fetch(stream):
+            streams.append(stream)
+            stream.feed("<nodes>")
+            started.set()
+            await asyncio.sleep(0)
+            stream.feed("</nodes>")
+            return True
+
+        tasks = [
+            asyncio.ensure_future(flights.run("/rest/nodes", fetch, consumer))
+            for consumer in (first, second)
+        ]
+        await started.wait()
+        assert await flights.run("/rest/nodes", fetch, late)
+        await asyncio.gather(*tasks)
+        return first, second, late, streams
+
+    first, second, late, streams = asyncio.run(run())
+    assert first.text == second.text == late.text == "<nodes></nodes>"
+    assert len(streams) == 2
+
+
+def test_consumer_error_is_kept_for_its_caller():
+    """Test a failing consumer does not interrupt the stream for the others."""
+
+    async def run():
+        flights = SingleFlight()
+        good, bad = Consumer(), Consumer(fail_on="b")
+
+        async def fetch(stream):
+            for text in "abc":
+                stream.feed(text)
+                await asyncio.sleep(0)
+            return True
+
+        return good, await asyncio.gather(
+            flights.run("/rest/status", fetch, good),
+            flights.run("/rest/status", fetch, bad),
+            return_exceptions=True,
+        )
+
+    good, results = asyncio.run(run())
+    assert good.text == "abc"
+    assert results[0] is True
+    assert isinstance(results[1], ValueError)
+
+
+def test_cancelled_caller_does_not_cancel_the_request():
+    """Test cancelling one caller leaves the request running for the others."""
+
+    async def run():
+        flights = SingleFlight()
+
+        async def fetch(stream):
+            await asyncio.sleep(0.01)
+            return "result"
+
+        first = asyncio.ensure_future(flights.run("/rest/status", fetch))
+        second = asyncio.ensure_future(flights.run("/rest/status", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "result"
@@ -0,0 +1,158 @@
+"""Tests for the startup report."""
+import asyncio
+import json
+import os
+import sys
+
+import pyisy
+from pyisy.isy import ISY
+from pyisy.startup import StartupReport, current_phase, parsing
+
+from tests.common import CONFIG_XML, NODES_XML, STATUS_XML, serve_isy
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(pyisy.__file__)))
+
+
+def test_phase_timing():
+    """Test a phase records when it started and how long it took."""
+
+    async def run():
+        report = StartupReport()
+        with report.phase("first") as first:
+            assert current_phase() is first
+            assert first.duration is None
+            await asyncio.sleep(0.02)
+        assert current_phase() is None
+        with report.phase("second") as second:
+            pass
+        report.finish("controller")
+        return report, first, second
+
+    report, first, second = asyncio.run(run())
+    assert list(report.phases) == ["first", "second"]
+    assert first.duration >= 0.02
+    assert second.start >= first.start + first.duration
+    assert report.duration >= second.start + second.duration
+    assert report.source == "controller"
+
+
+def test_counters_follow_tasks():
+    """Test the tasks created in a phase record their work in that phase."""
+
+    async def load(size):
+        with parsing():
+            await asyncio.sleep(0.01)
+        current_phase().add_response(size)
+
+    async def load_nodes():
+        await asyncio.gather(load(100), load(20))
+
+    async def run():
+        report = StartupReport()
+        await asyncio.gather(
+            report.run("nodes", load_nodes(), lambda: 7),
+            report.run("clock", load(5)),
+        )
+        assert current_phase() is None
+        return report
+
+    report = asyncio.run(run())
+    nodes = report.phases["nodes"]
+    assert (nodes.requests, nodes.bytes, nodes.count) == (2, 120, 7)
+    assert nodes.parse_time >= 0.02
+    clock = report.phases["clock"]
+    assert (clock.requests, clock.bytes, clock.count) == (1, 5, None)
+
+
+def test_initialize_report():
+    """Test the report of an initialize counts the bytes and objects loaded."""
+
+    async def run():
+        server = await serve_isy()
+        isy = ISY("127.0.0.1", server.port, "username", "password")
+        try:
+            await isy.initialize(load=[])
+        finally:
+            await isy.shutdown()
+            await server.close()
+        return isy.startup_report
+
+    report = asyncio.run(run())
+    phases = report.phases
+    assert list(phases) == ["configuration", "nodes", "status", "clock"]
+    assert phases["configuration"].bytes == len(CONFIG_XML)
+    assert (phases["nodes"].bytes, phases["nodes"].count) == (len(NODES_XML), 5)
+    assert (phases["status"].bytes, phases["status"].count) == (len(STATUS_XML), 3)
+    assert all(phase.requests == 1 for phase in phases.values())
+
+    data = report.as_dict()
+    assert data["source"] == "controller"
+    assert data["bytes"] == sum(phase.bytes for phase in phases.values())
+    assert [phase["name"] for phase in data["phases"]] == list(phases)
+    assert json.loads(json.dumps(data)) == data
+
+    lines = report.format().splitlines()
+    assert lines[0].split() == [
+        "phase",
+        "start",
+        "wall",
+        "parse",
+        "requests",
+        "bytes",
+        "count",
+    ]
+    assert lines[2].split()[0] == "nodes"
+    assert lines[2].split()[-2:] == [str(len(NODES_XML)), "5"]
+    assert lines[-1].startswith("total (controller): ")
+
+
+async def run_main(*args, ready):
+    """Run the command line until ready(stderr) is true, then stop it."""
+    server = await serve_isy()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "pyisy",
+        f"http://127.0.0.1:{server.port}",
+        "username",
+        "password",
+        *args,
+        cwd=ROOT,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    output = ""
+    try:
+        while not ready(output):
+            line = await asyncio.wait_for(process.stderr.readline(), 10)
+            assert line, output
+            output += line.decode()
+    finally:
+        process.terminate()
+        await process.wait()
+        await server.close()
+    return output
+
+
+def test_main_logs_report():
+    """Test the -r option logs the report as a table."""
+
+    def ready(output):
+        return "total (controller)" in output.partition("Startup report:")[2]
+
+    output = asyncio.run(run_main("-r", ready=ready))
+    assert "programs" in output.partition("Startup report:")[2]
+
+
+def test_main_writes_report(tmp_path):
+    """Test the --startup-report option writes the report to a JSON file."""
+    path = tmp_path / "report.json"
+    asyncio.run(
+        run_main(
+            "--startup-report",
+            str(path),
+            ready=lambda output: "Startup report written" in output,
+        )
+    )
+    data = json.loads(path.read_text())
+    assert data["source"] == "controller"
+    assert {phase["name"] for phase in data["phases"]} >= {"nodes", "variables"}
@@ -0,0 +1,121 @@
+"""Tests for the columnar store of the node states."""
+from datetime import datetime
+from math import inf, isnan
+
+from pyisy.constants import ISY_VALUE_UNKNOWN
+from pyisy.events.eventdecoder import decode_event
+from pyisy.nodes import Nodes
+from pyisy.nodes.statestore import StateStore
+
+from tests.common import NODES_XML
+
+
+class ISY:
+    """Stand-in for the ISY, the nodes are only parsed."""
+
+    nodes = None
+
+
+class Node:
+    """Stand-in for a node, with the state the store reads."""
+
+    def __init__(self, address, status, prec=0, uom="100"):
+        """Initialize the node."""
+        self.address = address
+        self.status = status
+        self.prec = prec
+        self.uom = uom
+        self.last_changed = datetime(2021, 1, 1, 12, 0, 0)
+
+
+def test_add_and_write():
+    """Test the state of each node is written to its slot."""
+    store = StateStore()
+    light = Node("AA 1", 255)
+    assert store.add(light) == 0
+    assert store.add(Node("BB 1", "on", 1, ["17", "4"])) == 1
+    assert store.add(Node("CC 1", ISY_VALUE_UNKNOWN)) == 2
+    assert store.add(light) == 0
+    assert len(store) == 3 and "BB 1" in store and store.slot("DD 1") is None
+
+    light.status = 128
+    store.write(light)
+    store.write(Node("DD 1", 1))
+    snapshot = store.snapshot()
+    assert snapshot["addresses"] == ["AA 1", "BB 1", "CC 1"]
+    assert snapshot["status"][0] == 128.0
+    assert isnan(snapshot["status"][1])
+    assert snapshot["status"][2] == -inf
+    assert list(snapshot["prec"]) == [0, 1, 0]
+    assert [snapshot["uoms"][code] for code in snapshot["uom"]] == [
+        "100",
+        "17/4",
+        "100",
+    ]
+    assert snapshot["last_changed"][0] == light.last_changed.timestamp()
+
+
+def test_remove():
+    """Test removing a node moves the last node into its slot."""
+    store = StateStore()
+    for address, status in (("AA 1", 1), ("BB 1", 2), ("CC 1", 3)):
+        store.add(Node(address, status))
+    store.remove("AA 1")
+    store.remove("DD 1")
+    assert store.slot("CC 1") == 0 and "AA 1" not in store
+    snapshot = store.snapshot()
+    assert snapshot["addresses"] == ["CC 1", "BB 1"]
+    assert list(snapshot["status"]) == [3.0, 2.0]
+
+    store.remove("BB 1")
+    assert store.snapshot()["addresses"] == ["CC 1"]
+    assert store.add(Node("BB 1", 4)) == 1
+
+
+def test_grow():
+    """Test the store grows past its capacity and keeps the states."""
+    store = StateStore(2)
+    for value in range(5):
+        store.add(Node(f"AA {value}", value))
+    snapshot = store.snapshot()
+    assert len(snapshot["addresses"]) == 5
+    assert list(snapshot["status"]) == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_snapshot_views_and_copies():
+    """Test a snapshot view follows the writes and a copy does not."""
+    store = StateStore(2)
+    node = Node("AA 1", 1)
+    store.add(node)
+    view = store.snapshot()
+    copied = store.snapshot(copy=True)
+
+    node.status = 2
+    store.write(node)
+    assert view["status"][0] == 2.0
+    assert copied["status"][0] == 1.0
+
+    # Growing keeps the earlier view readable, with the state it had.
+    store.add(Node("BB 1", 3))
+    store.add(Node("CC 1", 4))
+    node.status = 5
+    store.write(node)
+    assert list(view["status"]) == [2.0]
+    assert list(store.snapshot()["status"]) == [5.0, 3.0, 4.0]
+
+
+def test_nodes_write_through():
+    """Test the node states reach the store as they change."""
+    nodes = Nodes(ISY(), xml=NODES_XML)
+    snapshot = nodes.snapshot()
+    assert snapshot["addresses"] == ["AA 1", "BB 1", "ZW002_1"]
+    assert list(snapshot["status"]) == [255.0, 0.0, 70.0]
+
+    nodes.update_received(
+        decode_event(
+            '<Event seqnum="1" sid="uuid:1"><control>ST</control><action>128'
+            "</action><node>BB 1</node><eventInfo/></Event>"
+        )
+    )
+    assert snapshot["status"][1] == 128.0
+    assert nodes.snapshot(copy=True)["status"][1] == 128.0
@@ -0,0 +1,93 @@
+"""Tests for queueing the messages received by the websocket."""
+import asyncio
+
+from pyisy.constants import EVENT_QUEUE_BLOCK
+from pyisy.events.websocket import WebSocketClient
+from pyisy.helpers import EventEmitter
+
+
+class FakeISY:
+    """Stand-in for the ISY, counting the resyncs requested."""
+
+    def __init__(self):
+        """Initialize the fake ISY."""
+        self.connection_events = EventEmitter()
+        self.resyncs = 0
+
+    def resync(self, *args):
+        """Count a requested resync."""
+        self.resyncs += 1
+
+
+def status_event(seqnum):
+    """Return a status event message for a node."""
+    return (
+        f'<Event seqnum="{seqnum}" sid="uuid:1"><control>ST</control>'
+        f"<action>{seqnum}</action><node>AA BB CC 1</node><eventInfo/></Event>"
+    )
+
+
+def heartbeat(seqnum):
+    """Return a heartbeat message."""
+    return (
+        f'<Event seqnum="{seqnum}" sid="uuid:1"><control>_0</control>'
+        "<action>120</action><node/><eventInfo/></Event>"
+    )
+
+
+def test_overflow_resyncs_by_default(caplog):
+    """Test a full queue discards events with a warning and resyncs later."""
+
+    async def run():
+        isy = FakeISY()
+        client = WebSocketClient(isy, "host", 80, "user", "pass", event_queue_size=2)
+        try:
+            for seqnum in range(1, 5):
+                await client._queue_message(status_event(seqnum))
+            assert len(client.event_queue) == 2
+            assert client.event_queue.rejected == 2
+
+            # A heartbeat is handled even though the queue is full.
+            await client._queue_message(heartbeat(5))
+            assert client.last_heartbeat is not None
+            assert isy.resyncs == 0
+
+            client.event_queue.clear()
+            await client._queue_message(heartbeat(6))
+            assert isy.resyncs == 1
+        finally:
+            await client.req_session.close()
+
+    asyncio.run(run())
+    assert "discarding events" in caplog.text
+
+
+def test_block_policy_waits_for_room():
+    """Test the block policy holds up reading until the queue has room."""
+
+    async def run():
+        isy = FakeISY()
+        client = WebSocketClient(
+            isy,
+            "host",
+            80,
+            "user",
+            "pass",
+            event_queue_size=1,
+            event_queue_policy=EVENT_QUEUE_BLOCK,
+        )
+        try:
+            await client._queue_message(status_event(1))
+            queued = asyncio.ensure_future(client._queue_message(status_event(2)))
+            await asyncio.sleep(0)
+            assert not queued.done()
+
+            client.event_queue.clear()
+            await queued
+            assert len(client.event_queue) == 1
+            assert client.event_queue.rejected == 0
+            assert isy.resyncs == 0
+        finally:
+            await client.req_session.close()
+
+    asyncio.run(run())